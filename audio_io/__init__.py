@@ -0,0 +1,20 @@
+"""
+Audio I/O module for Voice AI Detector
+"""
+
+from .audio import DecodedAudio, audio_duration, content_hash, iter_audio_blocks, load_audio
+from .ingest import AudioPayload, payload_from_base64
+from .vad import speech_chunks, speech_regions, speech_samples
+
+__all__ = [
+    "AudioPayload",
+    "DecodedAudio",
+    "audio_duration",
+    "content_hash",
+    "iter_audio_blocks",
+    "load_audio",
+    "payload_from_base64",
+    "speech_chunks",
+    "speech_regions",
+    "speech_samples",
+]
@@ -0,0 +1,137 @@
+"""
+Decoded audio shared across pipeline stages
+An upload is decoded once to 16 kHz mono float32 and the same in-memory
+samples are handed to STT, language ID and feature extraction.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from . import decoders
+from .ingest import AudioPayload
+
+TARGET_SR = 16000
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class DecodedAudio:
+    """
+    Mono float32 PCM decoded once from an audio file.
+
+    Attributes:
+        samples (np.ndarray): 1-D float32 samples
+        sr (int): Sample rate of `samples`
+        source (str): Where the samples were decoded from (for logging)
+        speech (list): VAD speech regions as (start, end) sample ranges, set
+            on first use by audio_io.vad.speech_regions (None until then)
+    """
+
+    def __init__(self, samples: np.ndarray, sr: int = TARGET_SR, source: str = None):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sr = int(sr)
+        self.source = source
+        self.speech = None
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(self.sr)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def __repr__(self) -> str:
+        return f"DecodedAudio(source={self.source!r}, sr={self.sr}, duration={self.duration:.2f}s)"
+
+
+AudioSource = Union[str, Path, DecodedAudio, AudioPayload]
+
+
+def load_audio(source: AudioSource, sr: int = TARGET_SR) -> DecodedAudio:
+    """
+    Decode `source` to mono float32 at `sr`.
+
+    Already-decoded audio at the requested rate is returned as-is, so callers
+    can pass a `DecodedAudio` through every stage without re-decoding.
+    """
+    if isinstance(source, DecodedAudio):
+        if source.sr == sr:
+            return source
+        return DecodedAudio(decoders.resample(source.samples, source.sr, sr), sr, source=source.source)
+
+    if isinstance(source, AudioPayload):
+        return _load_payload(source, sr)
+
+    path = Path(source)
+    if not path.exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+
+    return DecodedAudio(decoders.decode(str(path), sr), sr, source=str(path))
+
+
+def _load_payload(payload: AudioPayload, sr: int) -> DecodedAudio:
+    if not payload.spilled:
+        try:
+            with payload.open() as f:
+                return DecodedAudio(decoders.decode(f, sr, suffix=payload.suffix), sr, source="<memory>")
+        except Exception:
+            # No backend could read this container from memory (e.g. MP4
+            # with a trailing index); fall back to a seekable file
+            pass
+
+    path = payload.spill()
+    return DecodedAudio(decoders.decode(str(path), sr), sr, source=str(path))
+
+
+def iter_audio_blocks(path, sr: int = TARGET_SR, block_seconds: float = 10.0):
+    """
+    Decode `path` to mono float32 at `sr` one block at a time.
+
+    Concatenating the blocks gives `load_audio(path, sr).samples`, but
+    only one block is held in memory (see decoders.iter_blocks).
+    Already-decoded audio is cut into blocks of the same size; payloads are
+    streamed from their spill file.
+    """
+    if isinstance(path, DecodedAudio):
+        return _slice_blocks(load_audio(path, sr=sr).samples, max(1, int(block_seconds * sr)))
+    if isinstance(path, AudioPayload):
+        path = path.spill()
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+    return decoders.iter_blocks(str(path), sr, block_seconds)
+
+
+def _slice_blocks(samples, block_size):
+    for start in range(0, len(samples), block_size):
+        yield samples[start:start + block_size]
+
+
+def audio_duration(path) -> float:
+    """Duration in seconds from the file header, or None if libsndfile cannot read it."""
+    try:
+        import soundfile as sf
+        info = sf.info(str(path))
+    except Exception:
+        return None
+    return info.frames / float(info.samplerate)
+
+
+def content_hash(source) -> str:
+    """
+    SHA-256 of the audio content: the encoded file bytes for a path (so a
+    cache hit skips decoding entirely), or the PCM samples for already-decoded
+    audio. Keys the feature and transcript caches.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, DecodedAudio):
+        digest.update(f"pcm:{source.sr}:".encode())
+        digest.update(source.samples.tobytes())
+        return digest.hexdigest()
+
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
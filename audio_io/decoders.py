@@ -0,0 +1,274 @@
+"""
+Interchangeable audio decoders
+Every backend returns mono float32 PCM at the requested rate, matching
+librosa.load(path, sr=sr, mono=True) (channel mean, soxr "HQ" resampling):
+
+  soundfile  libsndfile + soxr, in-process (WAV, FLAC, OGG/Opus, MP3)
+  ffmpeg     ffmpeg subprocess that decodes, downmixes and resamples in one
+             step and pipes raw f32le PCM (anything ffmpeg reads: M4A, AAC, ...)
+  librosa    librosa.load / audioread, last resort
+
+AUDIO_DECODER forces one backend; the default "auto" tries them in the
+per-format order of AUTO_ORDER (fastest first, see benchmarks/decoders.py).
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+import numpy as np
+
+
+DECODER = os.environ.get("AUDIO_DECODER", "auto")
+FFMPEG_BINARY = os.environ.get("FFMPEG_BINARY", "ffmpeg")
+
+# Formats libsndfile decodes natively; in-process beats spawning ffmpeg for these
+SOUNDFILE_FORMATS = {".wav", ".flac", ".ogg", ".oga", ".opus", ".mp3", ".aif", ".aiff"}
+
+AUTO_ORDER = {
+    "soundfile": ("soundfile", "ffmpeg", "librosa"),
+    "other": ("ffmpeg", "soundfile", "librosa"),
+}
+
+
+class SoundfileDecoder:
+    """libsndfile decode + soxr resample, bit-identical to librosa.load."""
+
+    name = "soundfile"
+    streams = True
+
+    def available(self) -> bool:
+        try:
+            import soundfile  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def decode(self, source, sr: int) -> np.ndarray:
+        import soundfile as sf
+
+        with sf.SoundFile(source) as f:
+            native_sr = f.samplerate
+            samples = f.read(dtype="float32", always_2d=True)
+
+        samples = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+        return resample(samples, native_sr, sr)
+
+    def iter_blocks(self, path, sr: int, block_seconds: float):
+        import soundfile as sf
+
+        with sf.SoundFile(str(path)) as f:
+            native_sr = f.samplerate
+            n_samples = int(np.ceil(f.frames * float(sr) / native_sr))
+            resampler = None
+            if native_sr != sr:
+                import soxr
+                # Streaming soxr output is identical to the one-shot call
+                resampler = soxr.ResampleStream(native_sr, sr, 1, dtype="float32", quality="soxr_hq")
+
+            emitted = 0
+            blocksize = max(1, int(block_seconds * native_sr))
+            for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+                block = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+                if resampler is not None:
+                    block = resampler.resample_chunk(block, last=False)
+                block = block[: n_samples - emitted]
+                emitted += len(block)
+                if len(block):
+                    yield block
+
+            tail = np.zeros(0, dtype=np.float32)
+            if resampler is not None:
+                tail = resampler.resample_chunk(tail, last=True)[: n_samples - emitted]
+            # Pad to the same length as resample()'s fix-up
+            tail = np.pad(tail, (0, n_samples - emitted - len(tail)))
+            if len(tail):
+                yield tail.astype(np.float32, copy=False)
+
+
+class FFmpegDecoder:
+    """
+    Decode with an ffmpeg subprocess writing 16 kHz mono f32le to a pipe.
+
+    Downmix (-rematrix_maxval 1 -> channel mean) and resampling (libsoxr at
+    soxr "HQ" precision) happen inside ffmpeg, so there is no separate
+    resample step and the samples match the soundfile backend to ~1e-6.
+    One process per input: the ffmpeg CLI cannot be reused across files.
+    """
+
+    name = "ffmpeg"
+    streams = True
+
+    _READ_BYTES = 1 << 20
+
+    def __init__(self, binary: str = FFMPEG_BINARY):
+        self.binary = binary
+
+    def available(self) -> bool:
+        return shutil.which(self.binary) is not None
+
+    def _command(self, input_arg: str, sr: int):
+        return [
+            self.binary, "-hide_banner", "-loglevel", "error",
+            "-i", input_arg,
+            "-map", "0:a:0", "-vn",
+            "-ac", "1", "-rematrix_maxval", "1.0",
+            "-ar", str(sr), "-resampler", "soxr", "-precision", "20",
+            "-f", "f32le", "-acodec", "pcm_f32le", "pipe:1",
+        ]
+
+    def decode(self, source, sr: int) -> np.ndarray:
+        return np.concatenate(list(self._stream(source, sr, self._READ_BYTES)) or [np.zeros(0, np.float32)])
+
+    def iter_blocks(self, path, sr: int, block_seconds: float):
+        block_bytes = max(4, int(block_seconds * sr) * 4)
+        return self._stream(str(path), sr, block_bytes)
+
+    def _stream(self, source, sr: int, block_bytes: int):
+        from_pipe = hasattr(source, "read")
+        proc = subprocess.Popen(
+            self._command("pipe:0" if from_pipe else str(source), sr),
+            stdin=subprocess.PIPE if from_pipe else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        feeder = None
+        if from_pipe:
+            # Feed stdin from a thread so a full stdout pipe cannot deadlock us
+            feeder = threading.Thread(target=_feed, args=(source, proc.stdin), daemon=True)
+            feeder.start()
+
+        try:
+            pending = b""
+            while True:
+                chunk = proc.stdout.read(block_bytes)
+                if not chunk:
+                    break
+                chunk = pending + chunk
+                usable = len(chunk) - len(chunk) % 4
+                pending = chunk[usable:]
+                if usable:
+                    yield np.frombuffer(chunk[:usable], dtype=np.float32).copy()
+            returncode = proc.wait()
+            if returncode != 0:
+                message = proc.stderr.read().decode(errors="replace").strip()
+                raise RuntimeError(f"ffmpeg failed ({returncode}): {message}")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+            if feeder is not None:
+                feeder.join()
+
+
+def _feed(source, stdin):
+    try:
+        for chunk in iter(lambda: source.read(1 << 16), b""):
+            stdin.write(chunk)
+    except (BrokenPipeError, OSError, ValueError):
+        pass  # ffmpeg exited early; its return code reports why
+    finally:
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+
+class LibrosaDecoder:
+    """librosa.load (soundfile, then audioread); paths only, no streaming."""
+
+    name = "librosa"
+    streams = False
+
+    def available(self) -> bool:
+        try:
+            import librosa  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def decode(self, source, sr: int) -> np.ndarray:
+        if hasattr(source, "read"):
+            raise TypeError("librosa/audioread decoder needs a file path")
+        import librosa
+        samples, _ = librosa.load(str(source), sr=sr, mono=True)
+        return samples
+
+
+DECODERS = {d.name: d for d in (SoundfileDecoder(), FFmpegDecoder(), LibrosaDecoder())}
+
+
+def decoder_order(suffix: str = None, decoder: str = None):
+    """
+    Backends to try, in order, for a file with extension `suffix`.
+
+    Args:
+        suffix (str): File extension, e.g. ".mp3" (None if unknown)
+        decoder (str): Backend name or "auto"; defaults to AUDIO_DECODER
+    """
+    decoder = decoder or DECODER
+    if decoder != "auto":
+        if decoder not in DECODERS:
+            raise ValueError(f"Unknown decoder {decoder!r}, expected 'auto' or one of {sorted(DECODERS)}")
+        return [DECODERS[decoder]]
+
+    names = AUTO_ORDER["soundfile" if (suffix or "").lower() in SOUNDFILE_FORMATS or not suffix else "other"]
+    return [DECODERS[name] for name in names if DECODERS[name].available()]
+
+
+def decode(source, sr: int, suffix: str = None, decoder: str = None) -> np.ndarray:
+    """
+    Decode a path or binary file object to mono float32 at `sr`, trying
+    each backend from decoder_order() until one succeeds.
+    """
+    if suffix is None and not hasattr(source, "read"):
+        suffix = Path(source).suffix
+
+    error = None
+    for backend in decoder_order(suffix, decoder):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        try:
+            return backend.decode(source, sr)
+        except Exception as exc:
+            error = exc
+    raise RuntimeError(f"Could not decode audio: {error}") from error
+
+
+def iter_blocks(path, sr: int, block_seconds: float, decoder: str = None):
+    """Decode `path` block by block with the first streaming-capable backend that opens it."""
+    error = None
+    for backend in decoder_order(Path(path).suffix, decoder):
+        if not backend.streams:
+            continue
+        stream = backend.iter_blocks(path, sr, block_seconds)
+        try:
+            first = next(stream, None)
+        except Exception as exc:
+            error = exc
+            continue
+        return _chain(first, stream)
+    raise RuntimeError(f"Could not stream audio: {error}") from error
+
+
+def _chain(first, stream):
+    if first is not None:
+        yield first
+    yield from stream
+
+
+def resample(samples: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    # soxr "HQ", as librosa.resample(res_type="soxr_hq")
+    if orig_sr == target_sr:
+        return samples
+    import soxr
+
+    n_samples = int(np.ceil(len(samples) * float(target_sr) / orig_sr))
+    resampled = soxr.resample(samples, orig_sr, target_sr, quality="soxr_hq")
+    if len(resampled) < n_samples:
+        resampled = np.pad(resampled, (0, n_samples - len(resampled)))
+    return np.asarray(resampled[:n_samples], dtype=samples.dtype)
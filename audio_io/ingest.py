@@ -0,0 +1,146 @@
+"""
+Request ingestion for encoded audio
+Uploads are held in memory and only spilled to a temp file above
+AUDIO_SPILL_BYTES; any spill file is removed when the payload is closed.
+"""
+
+import base64
+import io
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+
+SPILL_THRESHOLD_BYTES = int(os.environ.get("AUDIO_SPILL_BYTES", 8 * 1024 * 1024))
+SPILL_DIR = os.environ.get("AUDIO_SPILL_DIR") or None
+
+# Base64 is decoded in aligned slices so the decoded bytes can spill
+# without first materialising a second full copy in memory
+_B64_CHUNK_CHARS = 64 * 1024
+# b64decode drops these anyway, but in slice-wise decoding they would shift the
+# 4-character groups across slice boundaries
+_NON_ALPHABET = re.compile(r"[^A-Za-z0-9+/=]")
+
+
+class AudioPayload:
+    """
+    Encoded audio bytes (mp3, wav, ...) awaiting decode.
+
+    Bytes accumulate in memory until `spill_threshold` is exceeded, after
+    which they move to a temp file. Use as a context manager (or call
+    `close()`) so the spill file is always deleted.
+    """
+
+    def __init__(
+        self,
+        suffix: str = ".mp3",
+        spill_threshold: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ):
+        self.suffix = suffix
+        self.spill_threshold = SPILL_THRESHOLD_BYTES if spill_threshold is None else spill_threshold
+        self.spill_dir = spill_dir or SPILL_DIR
+        self.size = 0
+        self._buffer = io.BytesIO()
+        self._spill_file = None
+        self._spill_path = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_path is not None
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Spill file path, or None while the payload is in memory."""
+        return self._spill_path
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self._spill_file is None and self.size > self.spill_threshold:
+            self._spill()
+        if self._spill_file is not None:
+            self._spill_file.write(chunk)
+        else:
+            self._buffer.write(chunk)
+
+    def _spill(self) -> None:
+        spill_file = tempfile.NamedTemporaryFile(
+            prefix="audio_", suffix=self.suffix, dir=self.spill_dir, delete=False
+        )
+        self._spill_path = Path(spill_file.name)
+        self._spill_file = spill_file
+        spill_file.write(self._buffer.getbuffer())
+        self._buffer = io.BytesIO()
+
+    def spill(self) -> Path:
+        """Force the payload onto disk (for decoders that need a real path)."""
+        if self._spill_file is None:
+            self._spill()
+        self._spill_file.flush()
+        return self._spill_path
+
+    def open(self):
+        """Return a readable binary file object positioned at the start."""
+        if self._spill_file is not None:
+            self._spill_file.flush()
+            return open(self._spill_path, "rb")
+        return io.BytesIO(self._buffer.getvalue())
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if self._spill_path is not None:
+            try:
+                self._spill_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._spill_path = None
+        self._buffer = io.BytesIO()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __del__(self):
+        if getattr(self, "_spill_path", None) is not None:
+            self.close()
+
+
+def payload_from_base64(
+    audio_base64: str,
+    suffix: str = ".mp3",
+    spill_threshold: Optional[int] = None,
+    spill_dir: Optional[str] = None,
+) -> AudioPayload:
+    """
+    Decode a base64 string (data-URI prefix allowed) into an AudioPayload.
+    Raises ValueError / binascii.Error on malformed input.
+    """
+    if not isinstance(audio_base64, str):
+        raise ValueError("audioBase64 must be a string")
+
+    # Support data URI prefix if provided
+    if "base64," in audio_base64:
+        audio_base64 = audio_base64.split("base64,", 1)[1]
+    if _NON_ALPHABET.search(audio_base64):
+        audio_base64 = _NON_ALPHABET.sub("", audio_base64)
+
+    payload = AudioPayload(suffix=suffix, spill_threshold=spill_threshold, spill_dir=spill_dir)
+    try:
+        for start in range(0, len(audio_base64), _B64_CHUNK_CHARS):
+            payload.write(base64.b64decode(audio_base64[start:start + _B64_CHUNK_CHARS]))
+    except Exception:
+        payload.close()
+        raise
+    if payload.size == 0:
+        payload.close()
+        raise ValueError("empty audio payload")
+    return payload
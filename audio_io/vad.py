@@ -0,0 +1,68 @@
+"""
+Voice activity detection shared by every stage
+The Silero VAD bundled with faster-whisper runs once per clip; the speech
+regions are kept on the `DecodedAudio`, so STT (as Whisper clip timestamps),
+the batched STT worker and the voice features (speech frames only) all reuse
+the same regions instead of each running their own VAD or energy trim.
+"""
+
+import numpy as np
+
+from .audio import TARGET_SR, DecodedAudio, load_audio
+
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+# Longest pause kept inside a speech chunk (speech_chunks)
+MAX_GAP_SECONDS = 2.0
+
+
+def speech_regions(audio: DecodedAudio) -> list:
+    """
+    Speech as (start, end) sample ranges, computed on first use per clip.
+
+    Args:
+        audio (DecodedAudio): Decoded clip; the regions are cached on it
+
+    Returns:
+        list[tuple[int, int]]: Sample ranges at `audio.sr`, in order
+    """
+    if audio.speech is None:
+        # Silero VAD runs at 16 kHz; ranges are mapped back to the clip's rate
+        scale = audio.sr / TARGET_SR
+        timestamps = _speech_timestamps(load_audio(audio, sr=TARGET_SR).samples)
+        audio.speech = [(int(ts["start"] * scale), int(ts["end"] * scale)) for ts in timestamps]
+    return audio.speech
+
+
+def speech_chunks(audio: DecodedAudio, max_seconds: float = 30.0, max_gap_seconds: float = MAX_GAP_SECONDS) -> list:
+    """
+    Speech regions merged into (start, end) sample ranges of at most `max_seconds`.
+
+    Regions are only merged across pauses up to `max_gap_seconds`, so long
+    silences and hold music between them stay out of every chunk.
+    """
+    limit = int(max_seconds * audio.sr)
+    max_gap = int(max_gap_seconds * audio.sr)
+    chunks = []
+    for start, end in speech_regions(audio):
+        if chunks and end - chunks[-1][0] <= limit and start - chunks[-1][1] <= max_gap:
+            chunks[-1] = (chunks[-1][0], end)
+            continue
+        while end - start > limit:
+            chunks.append((start, start + limit))
+            start += limit
+        chunks.append((start, end))
+    return chunks
+
+
+def speech_samples(audio: DecodedAudio) -> np.ndarray:
+    """The clip's speech regions concatenated (empty if there is no speech)."""
+    regions = speech_regions(audio)
+    if not regions:
+        return audio.samples[:0]
+    return np.concatenate([audio.samples[start:end] for start, end in regions])
+
+
+def _speech_timestamps(samples):
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    return get_speech_timestamps(samples, VadOptions(**VAD_PARAMETERS))
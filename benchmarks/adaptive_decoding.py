@@ -0,0 +1,84 @@
+"""
+Adaptive vs beam decoding: speed and transcript difference
+Transcribes each recording with full beam search (STT_DECODING=beam) and
+with adaptive decoding (greedy, beam search only for weak segments), then
+reports the time saved, the share of segments that needed beam search, and
+the word error rate of the adaptive transcript against the beam one.
+Needs real speech and the WHISPER_MODEL weights (downloaded on first use).
+
+    python -m benchmarks.adaptive_decoding calls/*.wav
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("TRANSCRIPT_CACHE_ENTRIES", "0")  # time Whisper, not the cache
+
+from audio_io import load_audio
+from stt import transcribe as stt
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length."""
+    ref, hyp = reference.split(), hypothesis.split()
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / max(len(ref), 1)
+
+
+def _timed(clip, decoding):
+    start = time.perf_counter()
+    result = stt.transcribe_clip(clip, decoding=decoding)
+    result.text
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare adaptive and beam Whisper decoding")
+    parser.add_argument("audio", nargs="+", help="Speech recordings to transcribe")
+    args = parser.parse_args()
+
+    if stt.STT_BATCHING:
+        sys.exit("Unset STT_BATCHING: the batched worker always uses beam search")
+
+    clips = [(Path(path).name, load_audio(path)) for path in args.audio]
+    stt.transcribe_clip(clips[0][1], decoding="beam").text  # warm-up (model load)
+
+    print(f"{os.environ.get('WHISPER_MODEL', 'small')}, log-prob < {stt.ADAPTIVE_LOGPROB_THRESHOLD}, "
+          f"compression > {stt.ADAPTIVE_COMPRESSION_THRESHOLD}")
+    print(f"{'clip':<28} {'beam s':>8} {'adapt s':>8} {'speedup':>8} {'redec':>7} {'WER':>6}")
+    totals = {"beam": 0.0, "adaptive": 0.0, "segments": 0, "redecoded": 0}
+    errors = []
+    for name, clip in clips:
+        beam, beam_time = _timed(clip, "beam")
+        adaptive, adaptive_time = _timed(clip, "adaptive")
+        stats = adaptive.decode_stats
+        wer = word_error_rate(beam.text, adaptive.text)
+
+        totals["beam"] += beam_time
+        totals["adaptive"] += adaptive_time
+        totals["segments"] += stats.get("segments", 0)
+        totals["redecoded"] += stats.get("redecoded", 0)
+        errors.append(wer)
+        print(f"{name[:28]:<28} {beam_time:8.2f} {adaptive_time:8.2f} {beam_time / adaptive_time:7.2f}x "
+              f"{stats.get('redecoded', 0):>3}/{stats.get('segments', 0):<3} {wer:6.1%}")
+
+    print(f"{'total':<28} {totals['beam']:8.2f} {totals['adaptive']:8.2f} "
+          f"{totals['beam'] / totals['adaptive']:7.2f}x "
+          f"{totals['redecoded']:>3}/{totals['segments']:<3} {sum(errors) / len(errors):6.1%}")
+    print(f"time saved: {1 - totals['adaptive'] / totals['beam']:.0%}, "
+          f"clips with an identical transcript: {sum(e == 0 for e in errors)}/{len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
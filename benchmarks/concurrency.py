@@ -0,0 +1,109 @@
+"""
+Throughput / tail latency of the classification path under concurrent requests
+Runs the per-request work of /api/voice-detection (feature extraction +
+voice-model predict_proba, optionally whisper transcription) from N
+concurrent threads, once with the library defaults (forest n_jobs=-1,
+unbounded BLAS threads) and once with the serving/cpu_budget.py budget.
+
+    python -m benchmarks.concurrency --concurrency 8 --requests 64
+    python -m benchmarks.concurrency --whisper    # also run STT (downloads WHISPER_MODEL)
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import DecodedAudio
+from features.extract import N_FEATURES, extract_features_from_wav
+from serving.cpu_budget import configure_model_threads, cpu_budget
+
+
+def _clip(seconds, seed, sr=16000):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 140 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    y = sum(np.sin(2 * np.pi * k * np.cumsum(f0) / sr) / k for k in range(1, 8))
+    return DecodedAudio((0.1 * y + 0.005 * rng.standard_normal(len(t))).astype(np.float32), sr)
+
+
+def _load_model(path):
+    import joblib
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.ensemble import RandomForestClassifier
+
+    if path and os.path.exists(path):
+        return joblib.load(path)
+
+    # Same shape as training/train.py on synthetic data
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, N_FEATURES)).astype(np.float32)
+    y = (X[:, 0] + rng.normal(size=len(X)) > 0).astype(int)
+    base = RandomForestClassifier(n_estimators=300, class_weight="balanced", n_jobs=-1, random_state=42)
+    return CalibratedClassifierCV(base, method="sigmoid", cv=5).fit(X, y)
+
+
+def _run(model, clips, concurrency, n_requests, transcribe=None):
+    def request(i):
+        start = time.perf_counter()
+        audio = clips[i % len(clips)]
+        if transcribe is not None:
+            transcribe(audio)
+        features = extract_features_from_wav(audio, backend="numpy")
+        model.predict_proba(features.reshape(1, -1))
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(request, range(n_requests))))
+    elapsed = time.perf_counter() - start
+    return n_requests / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-request benchmark for the CPU budget")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=48)
+    parser.add_argument("--seconds", type=float, default=8.0, help="Clip length")
+    parser.add_argument("--model", default="artifacts/model.pkl", help="Model to load (synthetic forest if missing)")
+    parser.add_argument("--whisper", action="store_true", help="Include faster-whisper transcription")
+    args = parser.parse_args()
+
+    from threadpoolctl import threadpool_limits
+
+    model = _load_model(args.model)
+    clips = [_clip(args.seconds, seed) for seed in range(4)]
+    budget = cpu_budget()
+
+    configs = [
+        ("defaults", {"model_jobs": -1, "blas_threads": None, "whisper_threads": 0}),
+        ("cpu budget", budget),
+    ]
+
+    print(f"{os.cpu_count()} cores, concurrency {args.concurrency}, budget {budget}")
+    print(f"{'config':<12} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, config in configs:
+        configure_model_threads(model, config["model_jobs"])
+
+        transcribe = None
+        if args.whisper:
+            from faster_whisper import WhisperModel
+            whisper = WhisperModel(os.environ.get("WHISPER_MODEL", "small"), compute_type="int8",
+                                   cpu_threads=config["whisper_threads"])
+            transcribe = lambda audio: list(whisper.transcribe(audio.samples, beam_size=1)[0])  # noqa: E731
+
+        with threadpool_limits(limits=config["blas_threads"]):
+            _run(model, clips, args.concurrency, min(args.requests, 4), transcribe)  # warm-up
+            throughput, p50, p95 = _run(model, clips, args.concurrency, args.requests, transcribe)
+        print(f"{name:<12} {throughput:8.2f} {p50 * 1000:9.1f} {p95 * 1000:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Decode-time benchmark for the audio_io decoder backends
+Writes the same synthetic call in several containers/rates and times every
+backend that can read it, next to the old librosa.load path. Use it to
+check AUTO_ORDER in audio_io/decoders.py on the deployment image.
+
+    python -m benchmarks.decoders --seconds 60 --repeat 5
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io.decoders import DECODERS, decoder_order
+
+
+def _synthetic_call(seconds, sr=44100, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 140 + 25 * np.sin(2 * np.pi * 0.7 * t)
+    voice = sum(np.sin(2 * np.pi * k * np.cumsum(f0) / sr) / k for k in range(1, 8))
+    left = 0.1 * voice + 0.005 * rng.standard_normal(len(t))
+    right = 0.08 * voice + 0.005 * rng.standard_normal(len(t))
+    return np.stack([left, right], axis=1).astype(np.float32)
+
+
+def _write_inputs(folder, seconds):
+    import soundfile as sf
+
+    stereo = _synthetic_call(seconds)
+    inputs = {
+        "wav 16k mono": folder / "call_16k.wav",
+        "wav 44.1k stereo": folder / "call_44k.wav",
+        "mp3 44.1k stereo": folder / "call.mp3",
+    }
+    sf.write(inputs["wav 44.1k stereo"], stereo, 44100, subtype="PCM_16")
+    sf.write(inputs["wav 16k mono"], DECODERS["soundfile"].decode(str(inputs["wav 44.1k stereo"]), 16000), 16000, subtype="PCM_16")
+    sf.write(inputs["mp3 44.1k stereo"], stereo, 44100)
+
+    ffmpeg = DECODERS["ffmpeg"]
+    if ffmpeg.available():
+        m4a = folder / "call.m4a"
+        subprocess.run(
+            [ffmpeg.binary, "-hide_banner", "-loglevel", "error", "-i", str(inputs["wav 44.1k stereo"]), "-c:a", "aac", str(m4a)],
+            check=True,
+        )
+        inputs["m4a (aac) 44.1k stereo"] = m4a
+    return inputs
+
+
+def _time(fn, repeat):
+    fn()  # warm-up (imports, page cache)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audio decoder backends")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of the test call")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per backend (best is reported)")
+    parser.add_argument("--sr", type=int, default=16000, help="Target sample rate")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # librosa's audioread fallback warnings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = _write_inputs(Path(tmp), args.seconds)
+
+        print(f"{'input':<24} {'backend':<10} {'ms':>9} {'x realtime':>11}")
+        for label, path in inputs.items():
+            auto = [d.name for d in decoder_order(path.suffix)]
+            for name, backend in DECODERS.items():
+                if not backend.available():
+                    continue
+                try:
+                    seconds = _time(lambda: backend.decode(str(path), args.sr), args.repeat)
+                except Exception as exc:
+                    print(f"{label:<24} {name:<10} {'failed':>9}  ({type(exc).__name__})")
+                    continue
+                marker = " <- auto" if auto and auto[0] == name else ""
+                print(f"{label:<24} {name:<10} {seconds * 1000:9.1f} {args.seconds / seconds:10.0f}x{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+STT throughput under concurrent requests: shared model vs batched worker
+Transcribes the given recordings from N concurrent threads, once by calling
+the shared WhisperModel per request (transcribe_clip) and once through
+stt/worker.py for each batch size. Needs real speech (the VAD drops
+synthetic tones) and the WHISPER_MODEL weights (downloaded on first use).
+
+    python -m benchmarks.stt_batching calls/*.wav --concurrency 8 --requests 32
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import load_audio
+from stt.transcribe import _get_whisper_model, transcribe_clip
+from stt.worker import WhisperBatchWorker
+
+
+def _run(transcribe, clips, concurrency, n_requests):
+    def request(i):
+        start = time.perf_counter()
+        transcribe(clips[i % len(clips)]).text
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(request, range(n_requests))))
+    elapsed = time.perf_counter() - start
+    return n_requests / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent STT benchmark for the batched Whisper worker")
+    parser.add_argument("audio", nargs="+", help="Speech recordings to transcribe")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--max-wait-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    clips = [load_audio(path) for path in args.audio]
+    model = _get_whisper_model()
+
+    configs = [("shared model", transcribe_clip)]
+    workers = []
+    for batch_size in args.batch_sizes:
+        worker = WhisperBatchWorker(model, max_batch_size=batch_size, max_wait_ms=args.max_wait_ms)
+        workers.append(worker)
+        configs.append((f"batched x{batch_size}", worker.transcribe))
+
+    print(f"{os.environ.get('WHISPER_MODEL', 'small')}, {len(clips)} clips, concurrency {args.concurrency}")
+    print(f"{'config':<14} {'req/s':>8} {'p50 s':>8} {'p95 s':>8}")
+    for name, transcribe in configs:
+        _run(transcribe, clips, args.concurrency, min(args.requests, args.concurrency))  # warm-up
+        throughput, p50, p95 = _run(transcribe, clips, args.concurrency, args.requests)
+        print(f"{name:<14} {throughput:8.2f} {p50:8.2f} {p95:8.2f}")
+
+    for worker in workers:
+        worker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Shared test fixtures: a fake faster-whisper model in place of the real one"""
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+class FakeWhisper:
+    """
+    Mimics faster_whisper.WhisperModel: language info up front, segments decoded lazily.
+
+    Args:
+        segments: (start, end, text[, avg_logprob, compression_ratio]) tuples, or a
+            callable (audio, transcribe kwargs) -> such tuples
+        language (str): Detected language when the caller passes none
+        language_probability (float): Its probability
+        detected (list): (code, probability) pairs of the language-detection head
+
+    Attributes:
+        calls (list[dict]): kwargs of every transcribe() call
+        decoded_segments (int): Segments actually pulled from the generators
+        encoded (list): Shapes of the features passed to encode()
+    """
+
+    def __init__(self, segments=(), language="en", language_probability=0.99, detected=None):
+        from faster_whisper.feature_extractor import FeatureExtractor
+
+        self.segments = segments
+        self.language = language
+        self.language_probability = language_probability
+        self.calls = []
+        self.decoded_segments = 0
+        self.encoded = []
+        self.feature_extractor = FeatureExtractor()
+        detected = detected or [(language, language_probability)]
+        self.model = SimpleNamespace(
+            is_multilingual=True,
+            detect_language=lambda encoded: [[(f"<|{code}|>", p) for code, p in detected]],
+        )
+
+    def encode(self, features):
+        self.encoded.append(features.shape)
+        return features
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        specs = self.segments(audio, kwargs) if callable(self.segments) else self.segments
+        language = kwargs.get("language")
+        info = SimpleNamespace(
+            language=language or self.language,
+            language_probability=1.0 if language else self.language_probability,
+            duration=len(audio) / 16000,
+        )
+
+        def segments():
+            for start, end, text, *quality in specs:
+                self.decoded_segments += 1
+                avg_logprob, compression_ratio = quality or (-0.1, 1.2)
+                yield SimpleNamespace(
+                    start=start, end=end, text=text, avg_logprob=avg_logprob, compression_ratio=compression_ratio
+                )
+
+        return segments(), info
+
+
+def whole_clip(samples):
+    # VAD stand-in: synthetic tones are not speech to Silero
+    return [{"start": 0, "end": len(samples)}]
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    """
+    Factory installing a FakeWhisper(**kwargs) as the default Whisper model.
+
+    The transcript cache and model routing are off (tests enable them through
+    env) and VAD treats the whole clip as speech (tests patch
+    audio_io.vad._speech_timestamps for more).
+    """
+    import stt.transcribe as transcribe
+    from audio_io import vad
+
+    monkeypatch.setenv("TRANSCRIPT_CACHE_ENTRIES", "0")
+    monkeypatch.setenv("WHISPER_MODEL_ROUTES", "")  # every language on the fake
+    monkeypatch.delenv("TRANSCRIPT_CACHE_DIR", raising=False)
+    monkeypatch.setattr(vad, "_speech_timestamps", whole_clip)
+
+    def install(**kwargs):
+        fake = FakeWhisper(**kwargs)
+        monkeypatch.setattr(transcribe, "_WHISPER_MODEL", fake)
+        monkeypatch.setattr(transcribe, "_WHISPER_MODEL_NAME", os.environ.get("WHISPER_MODEL", "small"))
+        return fake
+
+    return install
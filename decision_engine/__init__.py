@@ -2,6 +2,6 @@
 Decision Engine module for Voice AI Detector
 """
 
-from .final_decision import get_final_verdict
+from .final_decision import get_final_verdict, is_conclusive_spam
 
-__all__ = ["get_final_verdict"]
+__all__ = ["get_final_verdict", "is_conclusive_spam"]
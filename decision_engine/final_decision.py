@@ -19,6 +19,41 @@ HIGH_RISK_INTENTS = {
     "DELIVERY_SCAM",
 }
 
+SPAM_THRESHOLD = 0.6
+SUSPICIOUS_THRESHOLD = 0.3
+SPAM_LABEL = "IT IS A SPAM CALL, AVOID IT"
+
+
+def _final_label(spam_score: float, matched_set: set) -> str:
+    # RULE 1: Any high-risk intent → never NORMAL
+    if matched_set & HIGH_RISK_INTENTS:
+        # Delivery scam should always be SPAM
+        if "DELIVERY_SCAM" in matched_set:
+            return SPAM_LABEL
+        return SPAM_LABEL if spam_score >= SPAM_THRESHOLD else "SUSPICIOUS CALL"
+
+    # RULE 2: High spam score alone is enough (voice_type never blocks)
+    if spam_score >= SPAM_THRESHOLD:
+        return SPAM_LABEL
+
+    # RULE 3: Medium spam = suspicious
+    if spam_score >= SUSPICIOUS_THRESHOLD:
+        return "SUSPICIOUS CALL"
+
+    # RULE 4: Truly safe
+    return "NORMAL CALL"
+
+
+def is_conclusive_spam(spam_score: float, matched_intents: List[str]) -> bool:
+    """
+    True once a high-risk intent has pushed the verdict to SPAM.
+
+    The streaming pipeline stops transcribing at this point: the rest of the
+    call can no longer turn a high-risk SPAM verdict into NORMAL.
+    """
+    matched_set = set(matched_intents)
+    return bool(matched_set & HIGH_RISK_INTENTS) and _final_label(spam_score, matched_set) == SPAM_LABEL
+
 
 def get_final_verdict(
     voice_type: str,
@@ -43,25 +78,7 @@ def get_final_verdict(
     print(f"  Matched Intents: {sorted(matched_intents)}")
     print(f"  Spam Score: {spam_score:.2f} ({spam_percentage}%)")
 
-    # RULE 1: Any high-risk intent → never NORMAL
-    if matched_set & HIGH_RISK_INTENTS:
-        # Delivery scam should always be SPAM
-        if "DELIVERY_SCAM" in matched_set:
-            final_label = "IT IS A SPAM CALL, AVOID IT"
-        else:
-            final_label = "IT IS A SPAM CALL, AVOID IT" if spam_score >= 0.6 else "SUSPICIOUS CALL"
-
-    # RULE 2: High spam score alone is enough (voice_type never blocks)
-    elif spam_score >= 0.6:
-        final_label = "IT IS A SPAM CALL, AVOID IT"
-
-    # RULE 3: Medium spam = suspicious
-    elif spam_score >= 0.3:
-        final_label = "SUSPICIOUS CALL"
-
-    # RULE 4: Truly safe
-    else:
-        final_label = "NORMAL CALL"
+    final_label = _final_label(spam_score, matched_set)
 
     return {
         "voice_type": voice_type,
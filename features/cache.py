@@ -0,0 +1,74 @@
+"""
+Content-addressed on-disk feature cache
+Entries are keyed by the audio content hash plus the feature config
+(sample rate, trim top_db, n_mfcc, pitch mode, extractor version) and
+stored as small .npy files. The least recently used entries are evicted
+once the cache grows past FEATURE_CACHE_MAX_BYTES.
+
+Disabled unless FEATURE_CACHE_DIR is set.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from serving.disk_cache import DiskLRU
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class FeatureCache:
+    """
+    Feature vectors on disk under `root/<ab>/<key>.npy`.
+
+    A cached "too short" result is stored as an empty array so it is
+    not re-extracted either.
+    """
+
+    def __init__(self, root, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._store = DiskLRU(root, ".npy", max_bytes)
+        self.root = self._store.root
+        self.max_bytes = self._store.max_bytes
+
+    @staticmethod
+    def key(audio_hash: str, config: dict) -> str:
+        config_blob = json.dumps(config, sort_keys=True)
+        return hashlib.sha256(f"{audio_hash}|{config_blob}".encode()).hexdigest()
+
+    def _path(self, key: str):
+        return self._store.path(key)
+
+    def get(self, key: str):
+        """Return (hit, features); features is None for a cached too-short clip."""
+        value = self._store.read(key, lambda path: np.load(path, allow_pickle=False))
+        if value is None:
+            return False, None
+        if value.size == 0:
+            return True, None
+        return True, value
+
+    def put(self, key: str, features) -> None:
+        value = np.empty(0, dtype=np.float32) if features is None else np.asarray(features, dtype=np.float32)
+        self._store.write(key, lambda f: np.save(f, value, allow_pickle=False))
+
+
+_CACHES = {}
+
+
+def get_feature_cache():
+    """
+    Cache configured by FEATURE_CACHE_DIR / FEATURE_CACHE_MAX_BYTES, or None.
+    Read on every call so worker processes and scripts that set the
+    environment after import pick it up.
+    """
+    root = os.environ.get("FEATURE_CACHE_DIR")
+    if not root:
+        return None
+    max_bytes = int(os.environ.get("FEATURE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    cache = _CACHES.get((root, max_bytes))
+    if cache is None:
+        cache = _CACHES[(root, max_bytes)] = FeatureCache(root, max_bytes)
+    return cache
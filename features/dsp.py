@@ -0,0 +1,240 @@
+"""
+NumPy implementations of the feature primitives
+Mirrors the librosa calls behind extract_features_from_wav (STFT, slaney
+mel filters, MFCC + deltas, spectral descriptors, piptrack, RMS, ZCR and
+silence trim) so the "numpy" backend never imports librosa/numba (or
+scipy.signal), which dominate worker cold start.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Analysis grid (librosa defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+
+
+def _frames(y, frame_length=N_FFT, hop_length=HOP_LENGTH, pad_mode="constant"):
+    # Centred frames, shape (n_frames, frame_length)
+    half = frame_length // 2
+    padded = np.pad(y, (half, half), mode=pad_mode)
+    return sliding_window_view(padded, frame_length)[::hop_length]
+
+
+@lru_cache(maxsize=4)
+def _hann(n_fft):
+    # Periodic Hann, as scipy.signal.get_window("hann", n_fft, fftbins=True)
+    return 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n_fft) / n_fft)
+
+
+def stft_magnitude(y, n_fft=N_FFT, hop_length=HOP_LENGTH):
+    """|STFT| with shape (1 + n_fft // 2, frames), as np.abs(librosa.stft(y))."""
+    return stft_frames(_frames(y, n_fft, hop_length))
+
+
+def stft_frames(frames):
+    """|STFT| of already-framed signal, shape (frame_length // 2 + 1, n_frames)."""
+    spectrum = np.fft.rfft(frames * _hann(frames.shape[-1]), axis=1)
+    return np.ascontiguousarray(np.abs(spectrum.astype(np.complex64)).T)
+
+
+def fft_frequencies(sr, n_fft=N_FFT):
+    return np.fft.rfftfreq(n=n_fft, d=1.0 / sr)
+
+
+def _hz_to_mel(frequencies):
+    # Slaney mel scale: linear below 1 kHz, logarithmic above
+    frequencies = np.asanyarray(frequencies, dtype=np.float64)
+    f_sp = 200.0 / 3
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = np.log(6.4) / 27.0
+    mels = frequencies / f_sp
+    log_region = frequencies >= min_log_hz
+    mels = np.where(log_region, min_log_mel + np.log(np.maximum(frequencies, min_log_hz) / min_log_hz) / logstep, mels)
+    return mels
+
+
+def _mel_to_hz(mels):
+    mels = np.asanyarray(mels, dtype=np.float64)
+    f_sp = 200.0 / 3
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = np.log(6.4) / 27.0
+    freqs = f_sp * mels
+    log_region = mels >= min_log_mel
+    return np.where(log_region, min_log_hz * np.exp(logstep * (mels - min_log_mel)), freqs)
+
+
+@lru_cache(maxsize=8)
+def mel_filters(sr, n_fft=N_FFT, n_mels=N_MELS):
+    """Slaney-normalised mel filterbank, as librosa.filters.mel(sr=sr, n_fft=n_fft)."""
+    fftfreqs = fft_frequencies(sr, n_fft)
+    mel_f = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(sr / 2.0), n_mels + 2))
+
+    fdiff = np.diff(mel_f)
+    ramps = np.subtract.outer(mel_f, fftfreqs)
+    lower = -ramps[:-2] / fdiff[:-1, None]
+    upper = ramps[2:] / fdiff[1:, None]
+    weights = np.maximum(0, np.minimum(lower, upper))
+    weights *= (2.0 / (mel_f[2:n_mels + 2] - mel_f[:n_mels]))[:, None]
+    return weights.astype(np.float32)
+
+
+def power_to_db(S, amin=1e-10, top_db=80.0):
+    log_spec = 10.0 * np.log10(np.maximum(amin, S))
+    if top_db is not None:
+        log_spec = np.maximum(log_spec, log_spec.max() - top_db)
+    return log_spec
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n_mfcc, n_mels):
+    # First n_mfcc rows of the orthonormal DCT-II (scipy.fft.dct(type=2, norm="ortho"))
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+
+def mfcc(power, sr, n_mfcc=20, mel_basis=None):
+    """MFCC from a power spectrogram, as librosa.feature.mfcc(S=power_to_db(mel))."""
+    if mel_basis is None:
+        mel_basis = mel_filters(sr, 2 * (power.shape[0] - 1))
+    mel = np.einsum("...ft,mf->...mt", power, mel_basis, optimize=True)
+    log_mel = power_to_db(mel)
+    return (_dct_matrix(n_mfcc, log_mel.shape[-2]) @ log_mel).astype(log_mel.dtype)
+
+
+def delta(data, order=1, width=9):
+    """
+    As librosa.feature.delta: Savitzky-Golay derivative along time with
+    mode='interp'. Implemented directly because importing scipy.signal
+    alone costs about a second of cold start.
+    """
+    half = width // 2
+    weights, edge = delta_weights(order, width)
+
+    out = np.empty(data.shape, dtype=np.result_type(data.dtype, np.float32))
+    out[..., half:-half] = sliding_window_view(data, width, axis=-1) @ weights
+    out[..., :half] = (data[..., :width] @ edge)[..., None]
+    out[..., -half:] = (data[..., -width:] @ edge)[..., None]
+    return out
+
+
+@lru_cache(maxsize=4)
+def delta_weights(order=1, width=9):
+    """(interior, edge) Savitzky-Golay derivative weights used by delta()."""
+    half = width // 2
+    scale = float(math.factorial(order))
+
+    # Interior: least-squares polynomial derivative at the window centre
+    centred = np.vander(np.arange(-half, half + 1), order + 1, increasing=True)
+    weights = np.linalg.pinv(centred)[order] * scale
+
+    # Edges: polyorder == order, so the fitted derivative is constant over the first/last window
+    edge = np.linalg.pinv(np.vander(np.arange(width), order + 1, increasing=True))[order] * scale
+    return weights, edge
+
+
+def spectral_flatness(S, amin=1e-10, power=2.0):
+    S_thresh = np.maximum(amin, S ** power)
+    gmean = np.exp(np.mean(np.log(S_thresh), axis=-2, keepdims=True))
+    amean = np.mean(S_thresh, axis=-2, keepdims=True)
+    return gmean / amean
+
+
+def spectral_shape(S, sr, n_fft=N_FFT, roll_percent=0.85):
+    """
+    Spectral centroid, bandwidth (p=2) and roll-off from one magnitude
+    spectrogram, sharing the per-frame normalisation that librosa
+    would otherwise recompute for each descriptor.
+    """
+    freq = fft_frequencies(sr, n_fft)
+    S64 = S.astype(np.float64)
+
+    total = S64.sum(axis=0)
+    safe_total = np.where(total > 0, total, 1.0)
+
+    centroid = freq @ S64 / safe_total
+    second_moment = (freq ** 2) @ S64 / safe_total
+    bandwidth = np.sqrt(np.maximum(second_moment - centroid ** 2, 0.0))
+
+    cumulative = np.cumsum(S, axis=0)
+    rolloff = freq[np.argmax(cumulative >= roll_percent * cumulative[-1], axis=0)]
+
+    return centroid, bandwidth, rolloff
+
+
+def piptrack(S, sr, n_fft=N_FFT, fmin=150.0, fmax=4000.0, threshold=0.1):
+    """As librosa.piptrack(S=S, sr=sr): parabolic-interpolated spectral peaks."""
+    fmax = min(fmax, float(sr) / 2)
+    fft_freqs = fft_frequencies(sr, n_fft)
+
+    avg = np.gradient(S, axis=-2)
+
+    # Per-bin parabolic shift (0 where the optimum would leave [n-1, n+1])
+    shift = np.zeros_like(S)
+    a = S[2:] + S[:-2] - 2 * S[1:-1]
+    b = (S[2:] - S[:-2]) / 2
+    inside = np.abs(b) < np.abs(a)
+    shift[1:-1] = np.where(inside, -b / np.where(inside, a, 1), 0)
+    dskew = 0.5 * avg * shift
+
+    # Column-wise local maxima after thresholding against the frame max
+    thresholded = S * (S > threshold * np.max(S, axis=-2, keepdims=True))
+    localmax = np.zeros(S.shape, dtype=bool)
+    localmax[1:-1] = (thresholded[1:-1] > thresholded[:-2]) & (thresholded[1:-1] >= thresholded[2:])
+    localmax[-1] = thresholded[-1] > thresholded[-2]
+
+    freq_mask = ((fmin <= fft_freqs) & (fft_freqs < fmax))[:, None]
+    idx = np.nonzero(freq_mask & localmax)
+
+    pitches = np.zeros_like(S)
+    mags = np.zeros_like(S)
+    pitches[idx] = (idx[-2] + shift[idx]) * float(sr) / n_fft
+    mags[idx] = S[idx] + dskew[idx]
+    return pitches, mags
+
+
+def rms(y, frame_length=N_FFT, hop_length=HOP_LENGTH):
+    """Frame RMS, as librosa.feature.rms(y=y)[0]."""
+    frames = _frames(y, frame_length, hop_length)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+
+def zero_crossing_rate(y, frame_length=N_FFT, hop_length=HOP_LENGTH):
+    """
+    Frame-wise zero-crossing rate, equivalent to
+    librosa.feature.zero_crossing_rate(y) but counted once over the
+    signal with a cumulative sum instead of per overlapping frame.
+    """
+    half = frame_length // 2
+    y = np.pad(y, (half, half), mode="edge")
+    negative = y < -1e-10  # librosa's default clip threshold, zero counts as positive
+    crossings = np.concatenate(([0], np.cumsum(negative[1:] != negative[:-1])))
+
+    n_frames = 1 + (len(y) - frame_length) // hop_length
+    starts = np.arange(n_frames) * hop_length
+    counts = crossings[starts + frame_length - 1] - crossings[starts]
+    return counts / frame_length
+
+
+def trim(y, top_db=60, frame_length=N_FFT, hop_length=HOP_LENGTH):
+    """Strip leading/trailing silence, as librosa.effects.trim(y, top_db=top_db)."""
+    energy = rms(y, frame_length, hop_length)
+    db = power_to_db(np.square(energy), top_db=None) - power_to_db(np.square(energy.max(initial=0.0)), top_db=None)
+    nonzero = np.flatnonzero(db > -top_db)
+
+    if nonzero.size == 0:
+        return y[0:0], np.asarray([0, 0])
+
+    start = int(nonzero[0] * hop_length)
+    end = min(len(y), int((nonzero[-1] + 1) * hop_length))
+    return y[start:end], np.asarray([start, end])
@@ -1,31 +1,223 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import numpy as np
-import librosa
+
+from audio_io import DecodedAudio, audio_duration, content_hash, load_audio, speech_samples
+from features import dsp
+from features.cache import get_feature_cache
+from features.dsp import HOP_LENGTH, N_FFT
+from features.pitch import fast_pitch
+
+
+# Shared analysis grid (librosa defaults the model was trained with)
+N_MFCC = 20
+N_FEATURES = 92
+TRIM_TOP_DB = 25
+
+# Bump whenever the feature values change, so cached vectors are not reused
+EXTRACTOR_VERSION = 2
+
+# "piptrack": original librosa.piptrack statistics (what artifacts/model.pkl was trained on)
+# "fast": YIN-style f0 from the shared spectrogram; needs a model trained with --pitch-mode fast
+PITCH_MODES = ("piptrack", "fast")
+PITCH_MODE = os.environ.get("FEATURE_PITCH_MODE", "piptrack")
+
+# "trim": strip leading/trailing silence by energy (what artifacts/model.pkl was trained on)
+# "vad": keep only the VAD speech regions (audio_io.vad, shared with STT), so
+#        mid-call silence and hold music are left out; needs a model trained with --speech-mode vad
+SPEECH_MODES = ("trim", "vad")
+SPEECH_MODE = os.environ.get("FEATURE_SPEECH_MODE", "trim")
+
+# "librosa": reference implementation
+# "numpy": NumPy/SciPy re-implementation (features/dsp.py), no librosa import -> fast cold start
+BACKENDS = ("librosa", "numpy")
+BACKEND = os.environ.get("FEATURE_BACKEND", "librosa")
+
+# Files longer than this (seconds) are processed block by block in bounded
+# memory (features/streaming.py) instead of being decoded whole; 0 disables
+STREAMING_MIN_SECONDS = float(os.environ.get("FEATURE_STREAMING_SECONDS", "600"))
 
 
-def extract_features_from_wav(filepath, sr=16000):
+def feature_config(sr=16000, pitch_mode=None, backend=None, speech_mode=None):
+    """Everything that changes the feature values (feature cache key)."""
+    return {
+        "version": EXTRACTOR_VERSION,
+        "sr": sr,
+        "top_db": TRIM_TOP_DB,
+        "n_mfcc": N_MFCC,
+        "n_fft": N_FFT,
+        "hop_length": HOP_LENGTH,
+        "pitch_mode": pitch_mode or PITCH_MODE,
+        "backend": backend or BACKEND,
+        "speech_mode": speech_mode or SPEECH_MODE,
+    }
+
+
+def _check_options(pitch_mode, backend, speech_mode):
+    if pitch_mode not in PITCH_MODES:
+        raise ValueError(f"Unknown pitch_mode {pitch_mode!r}, expected one of {PITCH_MODES}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if speech_mode not in SPEECH_MODES:
+        raise ValueError(f"Unknown speech_mode {speech_mode!r}, expected one of {SPEECH_MODES}")
+
+
+def extract_features_from_wav(filepath, sr=16000, pitch_mode=None, backend=None, speech_mode=None):
     """
     Extract robust, calibration-friendly features for
     AI-generated vs Human voice detection.
+
+    `filepath` may also be an already-decoded `DecodedAudio`,
+    in which case no decoding happens here. `pitch_mode` selects the
+    pitch estimator (see PITCH_MODES); defaults to FEATURE_PITCH_MODE.
+    `backend` selects librosa or the NumPy re-implementation; defaults
+    to FEATURE_BACKEND. `speech_mode` selects which frames are analysed
+    (see SPEECH_MODES); defaults to FEATURE_SPEECH_MODE.
+    Results are served from the feature cache when FEATURE_CACHE_DIR is set.
     """
+    pitch_mode = pitch_mode or PITCH_MODE
+    backend = backend or BACKEND
+    speech_mode = speech_mode or SPEECH_MODE
+    _check_options(pitch_mode, backend, speech_mode)
+
+    cache = get_feature_cache()
+    if cache is None or not isinstance(filepath, (str, os.PathLike, DecodedAudio)):
+        return _extract_uncached(filepath, sr, pitch_mode, backend, speech_mode)
 
     try:
-        y, sr = librosa.load(filepath, sr=sr, mono=True)
+        key = cache.key(content_hash(filepath), feature_config(sr, pitch_mode, backend, speech_mode))
+    except OSError:
+        return None
+
+    hit, features = cache.get(key)
+    if hit:
+        return features
+
+    try:
+        if _is_long_recording(filepath, speech_mode):
+            features = _extract_streaming(filepath, sr, pitch_mode)
+        else:
+            features = _extract_uncached(load_audio(filepath, sr=sr), sr, pitch_mode, backend, speech_mode)
     except Exception:
+        # Decode failures are not cached (may be environmental, e.g. missing ffmpeg)
         return None
 
+    cache.put(key, features)
+    return features
+
+
+def _is_long_recording(source, speech_mode="trim"):
+    # The streaming extractor only trims; VAD needs the whole clip decoded
+    if STREAMING_MIN_SECONDS <= 0 or speech_mode != "trim":
+        return False
+    if isinstance(source, DecodedAudio):
+        # Samples are in memory already, but the STFT / pitch matrices need not be
+        return source.duration > STREAMING_MIN_SECONDS
+    if not isinstance(source, (str, os.PathLike)):
+        return False
+    duration = audio_duration(source)
+    return duration is not None and duration > STREAMING_MIN_SECONDS
+
+
+def _extract_streaming(filepath, sr, pitch_mode):
+    # NumPy primitives whatever the backend; they match librosa to ~1e-4
+    from features.streaming import extract_features_streaming
+    return extract_features_streaming(filepath, sr=sr, pitch_mode=pitch_mode)
+
+
+def _extract_uncached(filepath, sr, pitch_mode, backend, speech_mode="trim"):
+    if _is_long_recording(filepath, speech_mode):
+        try:
+            return _extract_streaming(filepath, sr, pitch_mode)
+        except Exception:
+            return None
+
+    try:
+        audio = load_audio(filepath, sr=sr)
+    except Exception:
+        return None
+    ops = _LibrosaOps if backend == "librosa" else dsp
+
     # 🔒 Remove silence (VERY IMPORTANT)
-    y, _ = librosa.effects.trim(y, top_db=25)
+    if speech_mode == "vad":
+        # Speech regions found once per clip, reused from STT when it ran first
+        y = speech_samples(audio)
+    else:
+        y, _ = ops.trim(audio.samples, top_db=TRIM_TOP_DB)
 
     # Skip too-short audio AFTER trimming
     if len(y) < sr * 2:
         return None
 
+    return _compute_features(y, sr, pitch_mode, ops)
+
+
+class _LibrosaOps:
+    """Feature primitives backed by librosa (imported on first use)."""
+
+    @staticmethod
+    def trim(y, top_db):
+        import librosa
+        return librosa.effects.trim(y, top_db=top_db)
+
+    @staticmethod
+    def stft_magnitude(y):
+        import librosa
+        return np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+
+    @staticmethod
+    def mfcc(power, sr, n_mfcc):
+        import librosa
+        mel = np.einsum("...ft,mf->...mt", power, _librosa_mel_basis(sr), optimize=True)
+        return librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=n_mfcc)
+
+    @staticmethod
+    def delta(data, order=1):
+        import librosa
+        return librosa.feature.delta(data, order=order)
+
+    @staticmethod
+    def spectral_flatness(S):
+        import librosa
+        return librosa.feature.spectral_flatness(S=S)
+
+    @staticmethod
+    def piptrack(S, sr):
+        import librosa
+        return librosa.piptrack(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+
+    @staticmethod
+    def rms(y):
+        import librosa
+        return librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP_LENGTH)
+
+
+@lru_cache(maxsize=8)
+def _librosa_mel_basis(sr, n_fft=N_FFT):
+    import librosa
+    return librosa.filters.mel(sr=sr, n_fft=n_fft)
+
+
+def _compute_features(y, sr, pitch_mode="piptrack", ops=dsp):
+    """
+    92-dim feature vector from a trimmed signal.
+
+    One magnitude STFT is computed per clip and every spectral
+    descriptor is derived from it, instead of each librosa feature
+    re-running its own STFT of the same signal.
+    """
+
+    S = ops.stft_magnitude(y)
+    power = S ** 2
+
     features = []
 
     # 1️⃣ MFCC + deltas (vocoder smoothing detector)
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=20)
-    delta = librosa.feature.delta(mfcc)
-    delta2 = librosa.feature.delta(mfcc, order=2)
+    mfcc = ops.mfcc(power, sr, n_mfcc=N_MFCC)
+    delta = ops.delta(mfcc)
+    delta2 = ops.delta(mfcc, order=2)
 
     features.extend(np.mean(mfcc, axis=1))
     features.extend(np.std(mfcc, axis=1))
@@ -33,10 +225,8 @@ def extract_features_from_wav(filepath, sr=16000):
     features.extend(np.mean(delta2, axis=1))
 
     # 2️⃣ Spectral features (AI over-clean artifacts)
-    spec_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
-    spec_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)
-    spec_flatness = librosa.feature.spectral_flatness(y=y)
-    spec_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
+    spec_centroid, spec_bandwidth, spec_rolloff = dsp.spectral_shape(S, sr)
+    spec_flatness = ops.spectral_flatness(S)
 
     features.extend([
         np.mean(spec_centroid),
@@ -47,9 +237,12 @@ def extract_features_from_wav(filepath, sr=16000):
     ])
 
     # 3️⃣ Pitch instability (AI weakness)
-    pitches, mags = librosa.piptrack(y=y, sr=sr)
-    pitch_vals = pitches[mags > np.percentile(mags, 75)]
-    pitch_vals = pitch_vals[pitch_vals > 0]
+    if pitch_mode == "fast":
+        pitch_vals = fast_pitch(power, sr, N_FFT)
+    else:
+        pitches, mags = ops.piptrack(S, sr)
+        pitch_vals = pitches[mags > np.percentile(mags, 75)]
+        pitch_vals = pitch_vals[pitch_vals > 0]
 
     if len(pitch_vals) > 0:
         features.extend([
@@ -60,7 +253,7 @@ def extract_features_from_wav(filepath, sr=16000):
         features.extend([0.0, 0.0])
 
     # 4️⃣ Energy dynamics (calibration critical)
-    rms = librosa.feature.rms(y=y)
+    rms = ops.rms(y)
     features.extend([
         np.mean(rms),
         np.std(rms),
@@ -68,7 +261,7 @@ def extract_features_from_wav(filepath, sr=16000):
     ])
 
     # 5️⃣ Temporal jitter proxy
-    zcr = librosa.feature.zero_crossing_rate(y)
+    zcr = dsp.zero_crossing_rate(y)
     features.extend([
         np.mean(zcr),
         np.std(zcr),
@@ -77,6 +270,77 @@ def extract_features_from_wav(filepath, sr=16000):
     return np.array(features, dtype=np.float32)
 
 
+def _extract_one(job):
+    item, sr, pitch_mode, backend, speech_mode = job
+    if isinstance(item, np.ndarray):
+        item = DecodedAudio(item, sr)
+    try:
+        return extract_features_from_wav(item, sr=sr, pitch_mode=pitch_mode, backend=backend, speech_mode=speech_mode)
+    except Exception:
+        return None
+
+
+def _resolve_n_jobs(n_jobs, n_items):
+    cpus = os.cpu_count() or 1
+    if n_jobs is None:
+        n_jobs = 1
+    elif n_jobs < 0:
+        n_jobs = max(1, cpus + 1 + n_jobs)  # -1 = all cores, -2 = all but one, ...
+    return max(1, min(n_jobs, n_items))
+
+
+def extract_features_batch(
+    items, n_jobs=None, sr=16000, pitch_mode=None, backend=None, speech_mode=None, executor=None
+):
+    """
+    Extract features for many clips across a process pool.
+
+    Args:
+        items: Paths, `DecodedAudio` objects or 1-D sample arrays at `sr`
+        n_jobs (int): Worker processes; None/1 runs in-process, -1 uses all cores
+        sr (int): Sample rate
+        pitch_mode (str): See PITCH_MODES
+        backend (str): See BACKENDS
+        speech_mode (str): See SPEECH_MODES
+        executor: Thread or process pool to run on (reused across calls); when
+            given, `n_jobs` only sizes the chunks
+
+    Returns:
+        (np.ndarray, np.ndarray): float32 matrix of shape (len(items), N_FEATURES)
+        in input order, and a boolean mask that is False where the clip could not
+        be decoded or was too short (those rows are zero).
+    """
+    pitch_mode = pitch_mode or PITCH_MODE
+    backend = backend or BACKEND
+    speech_mode = speech_mode or SPEECH_MODE
+    _check_options(pitch_mode, backend, speech_mode)
+
+    items = list(items)
+    X = np.zeros((len(items), N_FEATURES), dtype=np.float32)
+    valid = np.zeros(len(items), dtype=bool)
+    if not items:
+        return X, valid
+
+    jobs = [(item, sr, pitch_mode, backend, speech_mode) for item in items]
+    n_jobs = _resolve_n_jobs(n_jobs, len(items))
+
+    chunksize = max(1, len(jobs) // (n_jobs * 4))
+    if executor is not None:
+        results = list(executor.map(_extract_one, jobs, chunksize=chunksize))
+    elif n_jobs == 1:
+        results = map(_extract_one, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_extract_one, jobs, chunksize=chunksize))
+
+    for i, feats in enumerate(results):
+        if feats is not None:
+            X[i] = feats
+            valid[i] = True
+
+    return X, valid
+
+
 # 🔁 BACKWARD COMPATIBILITY
-def extract_features(filepath, sr=16000):
-    return extract_features_from_wav(filepath, sr)
+def extract_features(filepath, sr=16000, pitch_mode=None, backend=None, speech_mode=None):
+    return extract_features_from_wav(filepath, sr, pitch_mode, backend, speech_mode)
@@ -0,0 +1,99 @@
+"""
+Fast pitch statistics for the feature extractor
+YIN-style f0 estimate computed from the shared power spectrogram:
+the per-frame autocorrelation is the inverse FFT of the power spectrum
+(Wiener-Khinchin), evaluated on voiced frames only. Avoids piptrack and
+the percentile over the full (1 + n_fft/2) x frames magnitude matrix.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+PITCH_FMIN = 70.0
+PITCH_FMAX = 400.0
+
+# Frames quieter than this (dB below the loudest frame) are not analysed
+VOICED_TOP_DB = 30.0
+
+# Cumulative-mean-normalised difference must dip below this to count as voiced
+TROUGH_THRESHOLD = 0.2
+
+# Only bins below sr / (2 * DECIMATION) feed the autocorrelation; voicing
+# lives there and the inverse FFT shrinks by the same factor
+DECIMATION = 2
+
+
+@lru_cache(maxsize=4)
+def _window_autocorrelation(n_fft):
+    # Periodic Hann, as used by librosa.stft
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)
+    acf = np.fft.irfft(np.abs(np.fft.rfft(window)) ** 2, n=n_fft)
+    return acf / acf[0]
+
+
+def fast_pitch(power, sr, n_fft, fmin=PITCH_FMIN, fmax=PITCH_FMAX, ref_energy=None):
+    """
+    f0 (Hz) of every voiced frame of a power spectrogram.
+
+    Args:
+        power (np.ndarray): |STFT|^2, shape (1 + n_fft // 2, frames), Hann window
+        sr (int): Sample rate
+        n_fft (int): FFT size used for `power`
+        ref_energy (float): Loudest frame energy the voicing threshold is
+            relative to; defaults to the loudest frame of `power` (pass the
+            whole-clip value when `power` is one block of a longer clip)
+
+    Returns:
+        np.ndarray: 1-D array of f0 estimates, empty if nothing is voiced
+    """
+    n_acf = n_fft // DECIMATION
+    sr_acf = sr / DECIMATION
+    tau_min = max(2, int(np.floor(sr_acf / fmax)))
+    tau_max = min(n_acf // 2 - 2, int(np.ceil(sr_acf / fmin)))
+
+    energy = power.sum(axis=0)
+    if energy.size == 0:
+        return np.empty(0)
+    if ref_energy is None:
+        ref_energy = energy.max()
+    if ref_energy <= 0:
+        return np.empty(0)
+    voiced = energy >= ref_energy * 10.0 ** (-VOICED_TOP_DB / 10.0)
+    if not np.any(voiced):
+        return np.empty(0)
+
+    # Autocorrelation of the windowed frames, corrected for the window's own taper
+    acf = np.fft.irfft(power[: n_acf // 2 + 1, voiced], n=n_acf, axis=0)[: tau_max + 2]
+    acf = acf / _window_autocorrelation(n_fft)[:: DECIMATION][: tau_max + 2, None]
+    acf = acf / np.maximum(acf[:1], np.finfo(np.float64).tiny)
+
+    # YIN cumulative mean normalised difference
+    diff = 1.0 - acf
+    diff[0] = 0.0
+    cumulative = np.cumsum(diff[1:], axis=0)
+    lags = np.arange(1, tau_max + 2)[:, None]
+    cmnd = np.ones_like(diff)
+    cmnd[1:] = diff[1:] * lags / np.maximum(cumulative, np.finfo(np.float64).tiny)
+
+    # First local minimum below threshold within [tau_min, tau_max]
+    centre = cmnd[tau_min:tau_max + 1]
+    is_trough = (centre < cmnd[tau_min - 1:tau_max]) & (centre <= cmnd[tau_min + 1:tau_max + 2])
+    candidates = is_trough & (centre < TROUGH_THRESHOLD)
+    has_pitch = candidates.any(axis=0)
+    if not np.any(has_pitch):
+        return np.empty(0)
+
+    frames = np.flatnonzero(has_pitch)
+    tau = tau_min + np.argmax(candidates[:, frames], axis=0)
+
+    # Parabolic interpolation for sub-sample lag
+    left = cmnd[tau - 1, frames]
+    mid = cmnd[tau, frames]
+    right = cmnd[tau + 1, frames]
+    denom = left - 2 * mid + right
+    shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / np.where(denom == 0, 1, denom), 0.0)
+    refined = tau + np.clip(shift, -1.0, 1.0)
+
+    return sr_acf / refined
@@ -0,0 +1,371 @@
+"""
+Bounded-memory feature extraction for long recordings
+Produces the same 92-dim vector as extract_features_from_wav (NumPy
+primitives from features/dsp.py) while reading the audio in blocks and
+keeping only running statistics, so memory is set by the block size
+instead of the call length. An already-decoded `DecodedAudio` (the serving
+path) is walked in the same blocks, so its STFT and pitch matrices stay
+bounded too.
+
+Three passes re-read the file block by block:
+  1. frame RMS of the whole signal -> silence-trim bounds
+  2. STFT of the trimmed signal -> the clip-wide values per-frame features
+     depend on (mel maximum for the 80 dB dB floor, loudest frame energy
+     for fast-pitch voicing, piptrack magnitude 75th percentile)
+  3. STFT of the trimmed signal -> running sums, moments and sketches
+
+Means and standard deviations are exact (up to float summation order).
+Percentiles come from log-spaced histogram sketches and are within
+about 0.1% of np.percentile.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from audio_io import iter_audio_blocks
+from features import dsp
+from features.dsp import HOP_LENGTH, N_FFT
+from features.extract import N_MFCC, TRIM_TOP_DB
+from features.pitch import fast_pitch
+
+
+BLOCK_SECONDS = 10.0
+
+DELTA_WIDTH = 9
+
+
+def extract_features_streaming(path, sr=16000, pitch_mode="piptrack", block_seconds=BLOCK_SECONDS):
+    """
+    92-dim feature vector of an audio file in constant memory.
+
+    Args:
+        path: Audio file libsndfile can read, or a `DecodedAudio` (cut into blocks)
+        sr (int): Analysis sample rate
+        pitch_mode (str): "piptrack" or "fast" (see features.extract.PITCH_MODES)
+        block_seconds (float): Audio decoded per block; bounds peak memory
+
+    Returns:
+        np.ndarray | None: float32 features, None if under 2 s after trimming
+    """
+
+    def blocks():
+        return iter_audio_blocks(path, sr=sr, block_seconds=block_seconds)
+
+    # Pass 1: trim bounds
+    start, end = _trim_bounds(blocks(), TRIM_TOP_DB)
+    if end - start < sr * 2:
+        return None
+
+    def trimmed():
+        return _slice_blocks(blocks(), start, end)
+
+    mel_basis = dsp.mel_filters(sr, N_FFT)
+
+    # Pass 2: clip-wide maxima / sketches
+    mel_max = 0.0
+    energy_max = 0.0
+    mag_sketch = _QuantileSketch() if pitch_mode != "fast" else None
+
+    for frames, _ in _frame_blocks(trimmed()):
+        S = dsp.stft_frames(frames)
+        power = S ** 2
+        mel = np.einsum("ft,mf->mt", power, mel_basis, optimize=True)
+        mel_max = max(mel_max, float(mel.max(initial=0.0)))
+        energy_max = max(energy_max, float(power.sum(axis=0).max(initial=0.0)))
+        if mag_sketch is not None:
+            mag_sketch.add(dsp.piptrack(S, sr)[1])
+
+    mel_floor = dsp.power_to_db(np.float32(mel_max), top_db=None) - 80.0
+    mag_threshold = mag_sketch.percentile(75) if mag_sketch is not None else None
+
+    # Pass 3: running statistics
+    dct = dsp._dct_matrix(N_MFCC, mel_basis.shape[0])
+    mfcc_stats = _Moments(N_MFCC)
+    mfcc_head = []
+    mfcc_tail = np.zeros((0, N_MFCC))
+    centroid, bandwidth, rolloff, flatness = _Moments(), _Moments(), _Moments(), _Moments()
+    pitch = _Moments()
+    rms, zcr = _Moments(), _Moments()
+    rms_sketch = _QuantileSketch()
+
+    for frames, edge_frames in _frame_blocks(trimmed()):
+        S = dsp.stft_frames(frames)
+        power = S ** 2
+
+        # MFCC, as dsp.mfcc with the clip-wide top_db floor
+        mel = np.einsum("ft,mf->mt", power, mel_basis, optimize=True)
+        log_mel = np.maximum(dsp.power_to_db(mel, top_db=None), mel_floor)
+        mfcc = (dct @ log_mel).astype(log_mel.dtype).T.astype(np.float64)
+        mfcc_stats.add(mfcc)
+        if sum(len(h) for h in mfcc_head) < DELTA_WIDTH:
+            mfcc_head.append(mfcc[:DELTA_WIDTH])
+        mfcc_tail = np.concatenate([mfcc_tail, mfcc[-DELTA_WIDTH:]])[-DELTA_WIDTH:]
+
+        spec_centroid, spec_bandwidth, spec_rolloff = dsp.spectral_shape(S, sr)
+        centroid.add(spec_centroid)
+        bandwidth.add(spec_bandwidth)
+        rolloff.add(spec_rolloff)
+        flatness.add(dsp.spectral_flatness(S)[0])
+
+        if pitch_mode == "fast":
+            pitch.add(fast_pitch(power, sr, N_FFT, ref_energy=energy_max))
+        else:
+            pitches, mags = dsp.piptrack(S, sr)
+            pitch_vals = pitches[mags > mag_threshold]
+            pitch.add(pitch_vals[pitch_vals > 0])
+
+        frame_rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        rms.add(frame_rms)
+        rms_sketch.add(frame_rms)
+
+        # librosa counts a sign change when crossing the -1e-10 clip threshold
+        negative = edge_frames < -1e-10
+        zcr.add(np.count_nonzero(negative[:, 1:] != negative[:, :-1], axis=1) / N_FFT)
+
+    mfcc_head = np.concatenate(mfcc_head)[:DELTA_WIDTH]
+
+    features = []
+
+    # 1️⃣ MFCC + deltas
+    features.extend(mfcc_stats.mean)
+    features.extend(mfcc_stats.std)
+    features.extend(_delta_mean(mfcc_stats, mfcc_head, mfcc_tail, order=1))
+    features.extend(_delta_mean(mfcc_stats, mfcc_head, mfcc_tail, order=2))
+
+    # 2️⃣ Spectral features
+    features.extend([centroid.mean, centroid.std, bandwidth.mean, flatness.mean, rolloff.mean])
+
+    # 3️⃣ Pitch instability
+    if pitch.count > 0:
+        features.extend([pitch.mean, pitch.std])
+    else:
+        features.extend([0.0, 0.0])
+
+    # 4️⃣ Energy dynamics
+    features.extend([rms.mean, rms.std, rms_sketch.percentile(90) - rms_sketch.percentile(10)])
+
+    # 5️⃣ Temporal jitter proxy
+    features.extend([zcr.mean, zcr.std])
+
+    return np.array(features, dtype=np.float32)
+
+
+def _trim_bounds(blocks, top_db, frame_length=N_FFT, hop_length=HOP_LENGTH):
+    """
+    [start, end) sample bounds dsp.trim() would keep, in one pass.
+
+    The first frame above the threshold is necessarily a strict running
+    maximum, and the last one is strictly louder than every later frame,
+    so only those candidates are kept until the clip maximum is known.
+    """
+    framer = _Framer(frame_length, hop_length, "constant")
+    leading = []   # (frame, rms) strict running maxima
+    trailing = []  # (frame, rms) frames louder than everything after them so far
+    peak = np.float32(-1.0)
+    n_frames = 0
+
+    def consume(frames):
+        nonlocal peak, n_frames
+        if not len(frames):
+            return
+        energy = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        index = np.arange(n_frames, n_frames + len(energy))
+        n_frames += len(energy)
+
+        running = np.maximum.accumulate(np.concatenate(([peak], energy)))
+        rising = np.flatnonzero(energy > running[:-1])
+        leading.extend(zip(index[rising], energy[rising]))
+        peak = running[-1]
+
+        block_max = energy.max()
+        while trailing and trailing[-1][1] <= block_max:
+            trailing.pop()
+        later_max = np.maximum.accumulate(energy[::-1])[::-1]
+        later_max = np.append(later_max[1:], -1.0)
+        falling = np.flatnonzero(energy > later_max)
+        trailing.extend(zip(index[falling], energy[falling]))
+
+    for block in blocks:
+        consume(framer.push(block))
+    consume(framer.finish())
+
+    if not leading:
+        return 0, 0
+
+    def loud(values):
+        values = np.asarray(values, dtype=np.float32)
+        db = dsp.power_to_db(np.square(values), top_db=None) - dsp.power_to_db(np.square(peak), top_db=None)
+        return db > -top_db
+
+    first = [frame for frame, is_loud in zip((f for f, _ in leading), loud([v for _, v in leading])) if is_loud]
+    last = [frame for frame, is_loud in zip((f for f, _ in trailing), loud([v for _, v in trailing])) if is_loud]
+    if not first:
+        return 0, 0
+
+    start = int(first[0] * hop_length)
+    end = min(framer.n_samples, int((last[-1] + 1) * hop_length))
+    return start, end
+
+
+def _slice_blocks(blocks, start, end):
+    # Samples [start, end) of a block stream
+    offset = 0
+    for block in blocks:
+        lo, hi = max(start - offset, 0), min(end - offset, len(block))
+        offset += len(block)
+        if lo < hi:
+            yield block[lo:hi]
+        if offset >= end:
+            return
+
+
+def _frame_blocks(blocks):
+    """
+    (frames, edge_frames) per block: centred N_FFT frames of the stream,
+    zero-padded (STFT, RMS) and edge-padded (ZCR) at the ends.
+    """
+    framer = _Framer(N_FFT, HOP_LENGTH, "constant")
+    edge_framer = _Framer(N_FFT, HOP_LENGTH, "edge")
+    for block in blocks:
+        frames, edge_frames = framer.push(block), edge_framer.push(block)
+        if len(frames):
+            yield frames, edge_frames
+    frames, edge_frames = framer.finish(), edge_framer.finish()
+    if len(frames):
+        yield frames, edge_frames
+
+
+class _Framer:
+    """Centred frames of a block stream, as dsp._frames on the concatenation."""
+
+    def __init__(self, frame_length, hop_length, pad_mode):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.pad_mode = pad_mode
+        self.n_samples = 0
+        self._buffer = None
+
+    def _pad(self, sample):
+        half = self.frame_length // 2
+        if self.pad_mode == "edge":
+            return np.full(half, sample, dtype=np.float32)
+        return np.zeros(half, dtype=np.float32)
+
+    def push(self, block):
+        if not len(block):
+            return np.zeros((0, self.frame_length), dtype=np.float32)
+        if self._buffer is None:
+            self._buffer = self._pad(block[0])
+        self.n_samples += len(block)
+        return self._take(np.concatenate([self._buffer, block]))
+
+    def finish(self):
+        if self._buffer is None:
+            return np.zeros((0, self.frame_length), dtype=np.float32)
+        return self._take(np.concatenate([self._buffer, self._pad(self._buffer[-1])]))
+
+    def _take(self, buffer):
+        if len(buffer) < self.frame_length:
+            # Short block (e.g. the last one, or a resampler tail): wait for more samples
+            self._buffer = buffer
+            return np.zeros((0, self.frame_length), dtype=np.float32)
+        n_frames = 1 + (len(buffer) - self.frame_length) // self.hop_length
+        frames = sliding_window_view(buffer, self.frame_length)[:: self.hop_length][:n_frames]
+        self._buffer = buffer[n_frames * self.hop_length:]
+        return frames
+
+
+class _Moments:
+    """Running count / mean / population std (Chan et al. parallel update)."""
+
+    def __init__(self, dim=None):
+        shape = () if dim is None else (dim,)
+        self.count = 0
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        mean = values.mean(axis=0)
+        m2 = np.square(values - mean).sum(axis=0)
+        total = self.count + n
+        delta = mean - self._mean
+        self._mean = self._mean + delta * (n / total)
+        self._m2 = self._m2 + m2 + np.square(delta) * (self.count * n / total)
+        self.count = total
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def std(self):
+        return np.sqrt(self._m2 / max(self.count, 1))
+
+
+class _QuantileSketch:
+    """
+    Log-spaced histogram of non-negative values, for np.percentile-style
+    quantiles in constant memory. Values below `low` (including zeros)
+    share one bucket and are reported as 0.
+    """
+
+    def __init__(self, low=1e-12, high=1e6, bins_per_decade=5000):
+        self.low = low
+        self.bins_per_decade = bins_per_decade
+        self.n_bins = int(np.ceil(np.log10(high / low) * bins_per_decade))
+        self.counts = np.zeros(self.n_bins + 1, dtype=np.int64)  # [0] = below `low`
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        small = values < self.low
+        bins = np.zeros(values.shape, dtype=np.int64)
+        bins[~small] = 1 + np.minimum(
+            (np.log10(values[~small] / self.low) * self.bins_per_decade).astype(np.int64), self.n_bins - 1
+        )
+        self.counts += np.bincount(bins, minlength=self.n_bins + 1)
+
+    def _value_at(self, rank, cumulative):
+        # Value of the rank-th smallest sample, spread log-uniformly within its bin
+        b = int(np.searchsorted(cumulative, rank, side="right"))
+        if b == 0:
+            return 0.0
+        before = cumulative[b - 1]
+        position = (rank - before + 0.5) / self.counts[b]
+        return self.low * 10.0 ** ((b - 1 + position) / self.bins_per_decade)
+
+    def percentile(self, q):
+        """Approximate np.percentile(values, q) (linear interpolation)."""
+        total = int(self.counts.sum())
+        if total == 0:
+            return 0.0
+        cumulative = np.cumsum(self.counts)
+        rank = q / 100.0 * (total - 1)
+        lower = int(np.floor(rank))
+        upper = min(lower + 1, total - 1)
+        lo_value = self._value_at(lower, cumulative)
+        hi_value = self._value_at(upper, cumulative)
+        return lo_value + (rank - lower) * (hi_value - lo_value)
+
+
+def _delta_mean(stats, head, tail, order, width=DELTA_WIDTH):
+    """
+    Mean over frames of dsp.delta(mfcc, order) from the running sum and
+    the first/last `width` frames: interior frames are a fixed linear
+    filter, so their sum only needs the total minus the edges.
+    """
+    n = stats.count
+    half = width // 2
+    weights, edge = dsp.delta_weights(order, width)
+    total = stats.mean * n
+
+    interior = np.zeros_like(total)
+    for k, w in enumerate(weights):
+        # Frames k .. n - width + k
+        interior += w * (total - head[:k].sum(axis=0) - tail[k + 1:].sum(axis=0))
+
+    edges = half * (edge @ head) + half * (edge @ tail)
+    return (interior + edges) / n
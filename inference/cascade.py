@@ -0,0 +1,129 @@
+"""
+Two-stage cascade voice classifier
+A small calibrated forest (few shallow trees) scores every clip first. Only
+clips whose fast AI probability falls inside the uncertainty band
+[low, high) - the region around AI_LIKELY_THRESHOLD / AI_THRESHOLD - are
+escalated to the full calibrated ensemble; clear HUMAN (< low) and clear
+AI (>= high) cases keep the fast model's probability.
+
+Enabled at inference with VOICE_CASCADE=1 once training/train.py --cascade
+has written the fast model. The band comes from CASCADE_BAND_LOW /
+CASCADE_BAND_HIGH; train.py --cascade prints the escalation rate and the
+accuracy delta for several bands to tune them.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+DEFAULT_BAND = (
+    float(os.environ.get("CASCADE_BAND_LOW", "0.30")),
+    float(os.environ.get("CASCADE_BAND_HIGH", "0.90")),
+)
+
+# Bands train.py --cascade reports on
+REPORT_BANDS = ((0.20, 0.95), (0.30, 0.90), (0.40, 0.85), (0.50, 0.80))
+
+
+class CascadeModel:
+    """
+    predict_proba-compatible wrapper: fast model first, full model for the band.
+
+    Attributes:
+        band (tuple): (low, high) fast AI probability range that is escalated
+        n_seen, n_escalated (int): Running counts for monitoring
+    """
+
+    def __init__(self, fast_model, full_model, band=DEFAULT_BAND):
+        low, high = band
+        if not 0.0 <= low <= high <= 1.0:
+            raise ValueError(f"Invalid cascade band {band!r}, expected 0 <= low <= high <= 1")
+
+        fast_pitch = getattr(fast_model, "feature_config_", {}).get("pitch_mode", "piptrack")
+        full_pitch = getattr(full_model, "feature_config_", {}).get("pitch_mode", "piptrack")
+        if fast_pitch != full_pitch:
+            raise ValueError(f"Fast model uses pitch mode {fast_pitch!r} but the full model uses {full_pitch!r}")
+
+        fast_speech = getattr(fast_model, "feature_config_", {}).get("speech_mode", "trim")
+        full_speech = getattr(full_model, "feature_config_", {}).get("speech_mode", "trim")
+        if fast_speech != full_speech:
+            raise ValueError(f"Fast model uses speech mode {fast_speech!r} but the full model uses {full_speech!r}")
+
+        self.fast_model = fast_model
+        self.full_model = full_model
+        self.band = (float(low), float(high))
+        self.classes_ = full_model.classes_
+        self.feature_config_ = getattr(full_model, "feature_config_", {})
+
+        self.n_seen = 0
+        self.n_escalated = 0
+        self._lock = threading.Lock()
+
+    def escalate_mask(self, fast_proba):
+        low, high = self.band
+        ai_proba = fast_proba[:, 1]
+        return (ai_proba >= low) & (ai_proba < high)
+
+    def predict_proba(self, X):
+        proba = self.fast_model.predict_proba(X)
+        escalate = self.escalate_mask(proba)
+        if escalate.any():
+            proba[escalate] = self.full_model.predict_proba(np.asarray(X)[escalate])
+
+        with self._lock:
+            self.n_seen += len(proba)
+            self.n_escalated += int(escalate.sum())
+        return proba
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.n_escalated / self.n_seen if self.n_seen else 0.0
+
+
+def train_fast_model(X, y, random_state=42):
+    """Few shallow trees, sigmoid-calibrated so its probabilities share the full model's scale."""
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.ensemble import RandomForestClassifier
+
+    base = RandomForestClassifier(
+        n_estimators=24,
+        max_depth=6,
+        class_weight="balanced",
+        n_jobs=1,
+        random_state=random_state,
+    )
+    return CalibratedClassifierCV(base, method="sigmoid", cv=3).fit(X, y)
+
+
+def cascade_report(fast_model, full_model, X, y, bands=REPORT_BANDS, ai_threshold=0.5):
+    """
+    Escalation rate and accuracy of the cascade vs the full model per band.
+
+    Args:
+        X, y: Held-out features and labels (1 = AI)
+        bands: (low, high) pairs to evaluate
+        ai_threshold (float): AI probability from which a clip counts as AI
+
+    Returns:
+        list[dict]: band, escalation_rate, full_accuracy, cascade_accuracy,
+        accuracy_delta (cascade - full), agreement (same AI/HUMAN call as full)
+    """
+    y = np.asarray(y)
+    full = full_model.predict_proba(X)[:, 1] >= ai_threshold
+    full_accuracy = float(np.mean(full == y))
+
+    rows = []
+    for band in bands:
+        cascade = CascadeModel(fast_model, full_model, band)
+        predicted = cascade.predict_proba(X)[:, 1] >= ai_threshold
+        accuracy = float(np.mean(predicted == y))
+        rows.append({
+            "band": tuple(band),
+            "escalation_rate": cascade.escalation_rate,
+            "full_accuracy": full_accuracy,
+            "cascade_accuracy": accuracy,
+            "accuracy_delta": accuracy - full_accuracy,
+            "agreement": float(np.mean(predicted == full)),
+        })
+    return rows
@@ -0,0 +1,187 @@
+"""
+Compiled evaluator for the calibrated RandomForest voice model
+Flattens CalibratedClassifierCV(RandomForestClassifier, method="sigmoid")
+- 5 folds x 300 trees plus 5 sigmoid calibrators - into a handful of
+contiguous NumPy arrays and evaluates every tree at once, one tree level
+per step. Probabilities match model.predict_proba to float rounding; the
+saved file is plain arrays, so loading it needs neither sklearn nor the
+model's object graph.
+
+    python -m inference.compiled_forest artifacts/model.pkl artifacts/model_compiled.joblib
+"""
+
+import sys
+
+import joblib
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# Rows evaluated per step; bounds the (rows x trees) index arrays
+_BATCH_ROWS = 1024
+
+
+class CompiledForest:
+    """
+    Binary calibrated forest as flat node arrays.
+
+    Every (sample, tree) pair descends one level per step, vectorised across
+    all trees; pairs drop out once they reach a leaf (threshold +inf, children
+    pointing to itself).
+
+    Attributes:
+        feature, threshold, left, right (np.ndarray): Per-node split, all trees concatenated
+        leaf_value (np.ndarray): Positive-class probability at each node (leaves only)
+        roots (np.ndarray): Root node of every tree
+        fold (np.ndarray): Calibration fold of every tree
+        sigmoid_a, sigmoid_b (np.ndarray): Per-fold Platt parameters (NaN = uncalibrated)
+        classes_ (np.ndarray): Class labels, predict_proba column order
+        feature_config_ (dict): Copied from the source model (pitch mode etc.)
+    """
+
+    _ARRAYS = ("feature", "threshold", "left", "right", "leaf_value", "roots", "fold", "sigmoid_a", "sigmoid_b", "classes_")
+
+    def __init__(self, arrays: dict, max_depth: int, feature_config: dict = None):
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        self.max_depth = int(max_depth)
+        self.n_folds = len(self.sigmoid_a)
+        self.feature_config_ = dict(feature_config or {})
+        # Trees are stored fold by fold
+        self._fold_starts = np.searchsorted(self.fold, np.arange(self.n_folds))
+        self._trees_per_fold = np.bincount(self.fold, minlength=self.n_folds)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Compile a fitted CalibratedClassifierCV(RandomForestClassifier) or bare RandomForestClassifier."""
+        if hasattr(model, "calibrated_classifiers_"):
+            folds = []
+            for calibrated in model.calibrated_classifiers_:
+                if calibrated.method != "sigmoid":
+                    raise ValueError(f"Only sigmoid calibration can be compiled, got {calibrated.method!r}")
+                calibrator = calibrated.calibrators[0]
+                folds.append((calibrated.estimator, float(calibrator.a_), float(calibrator.b_)))
+        else:
+            folds = [(model, np.nan, np.nan)]
+
+        if len(model.classes_) != 2:
+            raise ValueError("Only binary classifiers can be compiled")
+
+        feature, threshold, left, right, leaf_value, roots, fold = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for fold_index, (forest, _, _) in enumerate(folds):
+            for tree in forest.estimators_:
+                t = tree.tree_
+                is_leaf = t.children_left == -1
+                node_ids = np.arange(t.node_count)
+
+                values = t.value[:, 0, :]
+                totals = values.sum(axis=1)
+                positive = values[:, 1] / np.where(totals > 0, totals, 1.0)
+
+                feature.append(np.where(is_leaf, 0, t.feature))
+                threshold.append(np.where(is_leaf, np.inf, t.threshold))
+                left.append(offset + np.where(is_leaf, node_ids, t.children_left))
+                right.append(offset + np.where(is_leaf, node_ids, t.children_right))
+                leaf_value.append(np.where(is_leaf, positive, 0.0))
+                roots.append(offset)
+                fold.append(fold_index)
+
+                max_depth = max(max_depth, t.max_depth)
+                offset += t.node_count
+
+        arrays = {
+            "feature": np.concatenate(feature).astype(np.int32),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "left": np.concatenate(left).astype(np.int32),
+            "right": np.concatenate(right).astype(np.int32),
+            "leaf_value": np.concatenate(leaf_value).astype(np.float64),
+            "roots": np.asarray(roots, dtype=np.int32),
+            "fold": np.asarray(fold, dtype=np.int32),
+            "sigmoid_a": np.asarray([a for _, a, _ in folds], dtype=np.float64),
+            "sigmoid_b": np.asarray([b for _, _, b in folds], dtype=np.float64),
+            "classes_": np.asarray(model.classes_),
+        }
+        return cls(arrays, max_depth, getattr(model, "feature_config_", None))
+
+    def predict_proba(self, X):
+        """Same as the source model's predict_proba, shape (n_samples, 2)."""
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        positive = np.concatenate(
+            [self._positive_proba(X[i:i + _BATCH_ROWS]) for i in range(0, len(X), _BATCH_ROWS)]
+        ) if len(X) else np.zeros(0)
+
+        proba = np.empty((len(X), 2))
+        proba[:, 1] = positive
+        proba[:, 0] = 1.0 - positive
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def _positive_proba(self, X):
+        n_rows, n_trees = len(X), len(self.roots)
+        flat_X = X.ravel()
+        leaf = np.empty(n_rows * n_trees, dtype=self.roots.dtype)
+
+        # One entry per (row, tree) pair still above its leaf, descending a level per step
+        pair = np.arange(n_rows * n_trees)
+        current = np.tile(self.roots, n_rows)
+        offset = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        for _ in range(self.max_depth + 1):
+            threshold = self.threshold[current]
+            at_leaf = threshold == np.inf
+            if at_leaf.any():
+                leaf[pair[at_leaf]] = current[at_leaf]
+                inside = ~at_leaf
+                pair, current, offset, threshold = pair[inside], current[inside], offset[inside], threshold[inside]
+            if not pair.size:
+                break
+            go_left = flat_X[offset + self.feature[current]] <= threshold
+            current = np.where(go_left, self.left[current], self.right[current])
+        node = leaf.reshape(n_rows, n_trees)
+
+        # Mean tree vote per fold, then each fold's sigmoid, then the fold average
+        votes = np.add.reduceat(self.leaf_value[node], self._fold_starts, axis=1) / self._trees_per_fold
+
+        if np.isnan(self.sigmoid_a).any():
+            return votes.mean(axis=1)
+        calibrated = 1.0 / (1.0 + np.exp(self.sigmoid_a * votes + self.sigmoid_b))
+        return calibrated.mean(axis=1)
+
+    def save(self, path):
+        payload = {name: getattr(self, name) for name in self._ARRAYS}
+        payload.update(
+            format="compiled_forest",
+            format_version=FORMAT_VERSION,
+            max_depth=self.max_depth,
+            feature_config=self.feature_config_,
+        )
+        joblib.dump(payload, path)
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        payload = joblib.load(path, mmap_mode=mmap_mode)
+        if payload.get("format") != "compiled_forest" or payload.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a compiled forest (format v{FORMAT_VERSION})")
+        return cls(payload, payload["max_depth"], payload.get("feature_config"))
+
+
+def compile_model(model_path, output_path):
+    """Export a pickled sklearn model to the compiled array format."""
+    compiled = CompiledForest.from_sklearn(joblib.load(model_path))
+    compiled.save(output_path)
+    return compiled
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m inference.compiled_forest <model.pkl> <compiled.joblib>")
+        sys.exit(1)
+    compiled = compile_model(sys.argv[1], sys.argv[2])
+    print(f"✅ Compiled {len(compiled.roots)} trees ({len(compiled.feature)} nodes) to {sys.argv[2]}")
@@ -1,8 +1,32 @@
+import os
+from pathlib import Path
+
 import joblib
 import numpy as np
-from features.extract import extract_features_from_wav
-
-MODEL_PATH = "artifacts/model.pkl"
+from audio_io import DecodedAudio, audio_duration, load_audio
+from features.extract import EXTRACTOR_VERSION, N_FEATURES, extract_features_batch, extract_features_from_wav
+from inference import registry
+from inference.cascade import CascadeModel
+from inference.compiled_forest import CompiledForest
+from serving.cpu_budget import configure_model_threads
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Absolute, so the model is found whatever the working directory. Once a voice
+# model is published to the registry (inference/registry.py), CURRENT wins
+MODEL_PATH = str(Path(os.environ.get("MODEL_PATH", PROJECT_ROOT / "artifacts" / "model.pkl")).resolve())
+# Flat-array export of MODEL_PATH (python -m inference.compiled_forest); used when
+# present and not older than the pickle: far lower single-clip latency and RSS
+COMPILED_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + "_compiled.joblib"
+# Small first-stage model (train.py --cascade); used when VOICE_CASCADE=1
+FAST_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + "_fast_compiled.joblib"
+CASCADE = os.environ.get("VOICE_CASCADE", "0") == "1"
+# "global": one feature vector per clip; "segments": clips longer than two
+# windows are scored window by window (inference/segments.py)
+SCORING_MODE = os.environ.get("VOICE_SCORING_MODE", "global")
+# Compiled models are memory-mapped read-only, so every gunicorn worker shares
+# the same page-cache pages; empty string loads them into private memory
+MODEL_MMAP_MODE = os.environ.get("MODEL_MMAP_MODE", "r") or None
 _MODEL_CACHE = None
 
 # 🔒 CONFIDENCE THRESHOLDS
@@ -13,43 +37,185 @@ AI_LIKELY_THRESHOLD = 0.60
 
 
 def _get_model():
+    _WATCHER.ensure_running()
+    return _load_current()
+
+
+def _load_current():
     global _MODEL_CACHE
     if _MODEL_CACHE is None:
-        _MODEL_CACHE = joblib.load(MODEL_PATH)
+        # CURRENT if published and loadable, else an older version, else MODEL_PATH
+        _MODEL_CACHE = _WATCHER.load_initial(lambda: _load_model(MODEL_PATH))
     return _MODEL_CACHE
 
+
+def _load_model(model_path):
+    compiled_path = _export_path(model_path, "_compiled.joblib")
+    if _compiled_is_current(model_path, compiled_path):
+        model = CompiledForest.load(compiled_path, mmap_mode=MODEL_MMAP_MODE)
+    else:
+        # The pickled forest carries the training-time n_jobs=-1
+        model = configure_model_threads(joblib.load(model_path))
+
+    if CASCADE:
+        fast_model = CompiledForest.load(_export_path(model_path, "_fast_compiled.joblib"), mmap_mode=MODEL_MMAP_MODE)
+        model = CascadeModel(fast_model, model)
+        _check_cascade_band(model.band)
+    return model
+
+
+def _load_registry_version(model_version):
+    _check_feature_config(model_version.feature_config)
+    model = _load_model(str(model_version.entrypoint))
+    # Warm-up before going live: pages the arrays in and proves the model scores
+    model.predict_proba(np.zeros((1, N_FEATURES)))
+    return model
+
+
+def _swap_model(model_version, model):
+    # A single reference assignment: requests already holding the old model
+    # finish with it, the next _get_model() returns the new one
+    global _MODEL_CACHE
+    _MODEL_CACHE = model
+
+
+# Polls the registry's voice CURRENT and hot-swaps new versions (MODEL_RELOAD_SECONDS)
+_WATCHER = registry.ModelWatcher("voice", _load_registry_version, _swap_model)
+
+
+def _check_feature_config(config):
+    expected = {"extractor_version": EXTRACTOR_VERSION, "n_features": N_FEATURES}
+    published = {key: config.get(key) for key in expected}
+    if published != expected:
+        raise ValueError(f"Model was built for features {published}, this code extracts {expected}")
+
+
+def _check_cascade_band(band):
+    # The fast model may only settle clear HUMAN / clear AI clips
+    low, high = band
+    if low > AI_LIKELY_THRESHOLD or high < AI_THRESHOLD:
+        raise ValueError(
+            f"Cascade band {band!r} must cover [{AI_LIKELY_THRESHOLD}, {AI_THRESHOLD}) "
+            "so AI_LIKELY decisions always come from the full model"
+        )
+
+
+def preload_models():
+    """
+    Load the voice model(s) now instead of on the first request.
+
+    Call from the gunicorn master (main.py with --preload) so workers inherit
+    the loaded model through fork instead of each loading its own copy. The
+    registry watcher is not started here; each worker starts its own.
+    Returns the loaded model.
+    """
+    return _load_current()
+
+
+def _export_path(model_path, suffix):
+    return os.path.splitext(model_path)[0] + suffix
+
+
+def _compiled_is_current(model_path=MODEL_PATH, compiled_path=COMPILED_MODEL_PATH):
+    if not os.path.exists(compiled_path):
+        return False
+    return not os.path.exists(model_path) or os.path.getmtime(compiled_path) >= os.path.getmtime(model_path)
+
+
+def _pitch_mode(model):
+    # Models trained before --pitch-mode existed carry no config: piptrack
+    return getattr(model, "feature_config_", {}).get("pitch_mode", "piptrack")
+
+
+def _speech_mode(model):
+    # Models trained before --speech-mode existed carry no config: trim
+    return getattr(model, "feature_config_", {}).get("speech_mode", "trim")
+
 def predict_audio(filepath):
+    """
+    Classify a path or an already-decoded `DecodedAudio` as AI / HUMAN.
+    """
     model = _get_model()
 
-    features = extract_features_from_wav(filepath)
+    if SCORING_MODE == "segments":
+        from inference.segments import SEGMENT_JOBS, SEGMENT_SECONDS, predict_audio_segments
+        audio = load_audio(filepath)
+        if audio.duration >= 2 * SEGMENT_SECONDS:
+            return predict_audio_segments(audio, n_jobs=SEGMENT_JOBS)
+        filepath = audio
+
+    features = extract_features_from_wav(filepath, pitch_mode=_pitch_mode(model), speech_mode=_speech_mode(model))
     if features is None:
         return {"result": "INVALID_AUDIO", "confidence": 0.0}
 
     features = features.reshape(1, -1)
 
-    proba = model.predict_proba(features)[0]
+    proba = model.predict_proba(features)
 
-    ai_proba = float(proba[1])
-    human_proba = float(proba[0])
+    return _label_predictions(proba)[0]
 
-    # ✅ CORRECT DECISION LOGIC
-    if ai_proba >= AI_THRESHOLD:
-        label = "AI"
-        confidence = ai_proba
 
-    elif ai_proba >= AI_LIKELY_THRESHOLD:
-        label = "AI_LIKELY"
-        confidence = ai_proba
+def predict_audio_batch(items, n_jobs=-1):
+    """
+    Classify many clips with one vectorized predict_proba call.
 
-    else:
-        label = "HUMAN"
-        confidence = human_proba
+    With VOICE_SCORING_MODE=segments, clips of at least two windows are scored
+    window by window, as predict_audio does; the rest share the batched call.
 
-    return {
-        "result": label,
-        "confidence": round(confidence, 3)
-    }
+    Args:
+        items: Paths, `DecodedAudio` objects or 1-D 16 kHz sample arrays
+        n_jobs (int): Feature-extraction worker processes (-1 = all cores)
 
+    Returns:
+        list[dict]: One result per item, in input order, identical to calling
+        predict_audio on each item.
+    """
+    model = _get_model()
+    items = [DecodedAudio(item) if isinstance(item, np.ndarray) else item for item in items]
+    results = [None] * len(items)
+
+    if SCORING_MODE == "segments":
+        from inference.segments import SEGMENT_JOBS, SEGMENT_SECONDS, predict_audio_segments
+        for i, item in enumerate(items):
+            duration = item.duration if isinstance(item, DecodedAudio) else audio_duration(item)
+            if duration is None:
+                # No header duration (e.g. MP3): decode once, reused below
+                try:
+                    items[i] = item = load_audio(item)
+                except Exception:
+                    continue
+                duration = item.duration
+            if duration >= 2 * SEGMENT_SECONDS:
+                results[i] = predict_audio_segments(item, n_jobs=SEGMENT_JOBS)
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    X, valid = extract_features_batch(
+        [items[i] for i in pending], n_jobs=n_jobs, pitch_mode=_pitch_mode(model), speech_mode=_speech_mode(model)
+    )
+    for i in pending:
+        results[i] = {"result": "INVALID_AUDIO", "confidence": 0.0}
+    if valid.any():
+        labelled = _label_predictions(model.predict_proba(X[valid]))
+        for j, result in zip(np.flatnonzero(valid), labelled):
+            results[pending[j]] = result
+    return results
+
+
+def _label_predictions(proba):
+    # ✅ CORRECT DECISION LOGIC, applied to every row of predict_proba at once
+    ai_proba = proba[:, 1]
+    human_proba = proba[:, 0]
+
+    labels = np.where(
+        ai_proba >= AI_THRESHOLD, "AI",
+        np.where(ai_proba >= AI_LIKELY_THRESHOLD, "AI_LIKELY", "HUMAN"),
+    )
+    confidence = np.where(ai_proba >= AI_LIKELY_THRESHOLD, ai_proba, human_proba)
+
+    return [
+        {"result": str(label), "confidence": round(float(conf), 3)}
+        for label, conf in zip(labels, confidence)
+    ]
 
 if __name__ == "__main__":
     audio_path = "audio/test.wav"
@@ -0,0 +1,334 @@
+"""
+Local model registry with hot reload
+Every model name ("voice", "spam") has immutable version directories and a
+CURRENT pointer naming the version to serve:
+
+  <MODEL_REGISTRY_DIR>/voice/CURRENT              "20261017-142501"
+  <MODEL_REGISTRY_DIR>/voice/20261017-142501/
+      manifest.json    name, version, created, entrypoint, feature_config,
+                       sha256 of every file
+      model.pkl, model_compiled.joblib, ...
+
+publish() copies the artifacts into a temporary directory that is renamed
+into place, so a half-written version is never visible, then rewrites
+CURRENT atomically; rolling back is activate() with an older version.
+Serving processes run a ModelWatcher that polls CURRENT, loads a new
+version in the background and hands it over between requests.
+
+    python -m inference.registry publish voice artifacts/model.pkl artifacts/model_compiled.joblib
+    python -m inference.registry activate voice 20261017-142501
+    python -m inference.registry list voice
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+REGISTRY_DIR = Path(os.environ.get("MODEL_REGISTRY_DIR", PROJECT_ROOT / "artifacts" / "registry")).resolve()
+# Seconds between CURRENT checks in every serving process; 0 disables hot reload
+RELOAD_SECONDS = float(os.environ.get("MODEL_RELOAD_SECONDS", "30"))
+
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+
+
+class ModelVersion:
+    """
+    One published version.
+
+    Attributes:
+        name, version (str): Registry coordinates
+        path (Path): Version directory
+        manifest (dict): Parsed manifest.json
+    """
+
+    def __init__(self, name: str, version: str, path: Path, manifest: dict):
+        self.name = name
+        self.version = version
+        self.path = path
+        self.manifest = manifest
+
+    @property
+    def entrypoint(self) -> Path:
+        return self.path / self.manifest["entrypoint"]
+
+    @property
+    def feature_config(self) -> dict:
+        return self.manifest.get("feature_config", {})
+
+    def verify(self):
+        """Raise ValueError if a file is missing or its checksum differs from the manifest."""
+        for filename, expected in self.manifest["files"].items():
+            file = self.path / filename
+            if not file.is_file():
+                raise ValueError(f"{self.name} {self.version}: {filename} is missing")
+            if _sha256(file) != expected:
+                raise ValueError(f"{self.name} {self.version}: checksum mismatch for {filename}")
+
+
+def _sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _root(registry_dir) -> Path:
+    return Path(registry_dir) if registry_dir else REGISTRY_DIR
+
+
+def publish(name, files, feature_config=None, version=None, activate_version=True, registry_dir=None) -> ModelVersion:
+    """
+    Copy `files` into a new version of `name`.
+
+    Args:
+        files: Artifact paths; the first one is the entrypoint that loaders open
+        feature_config (dict): Feature settings the model was trained with,
+            checked by the loader before it serves the version
+        version (str): Version id; defaults to a UTC timestamp
+        activate_version (bool): Point CURRENT at the new version
+    """
+    files = [Path(f) for f in files]
+    if not files:
+        raise ValueError("Nothing to publish")
+    version = version or time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+    model_dir = _root(registry_dir) / name
+    target = model_dir / version
+    if target.exists():
+        raise FileExistsError(f"{name} version {version} already exists")
+
+    model_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=model_dir))
+    try:
+        checksums = {}
+        for file in files:
+            # copy2 keeps mtimes, so a compiled export stays newer than its pickle
+            shutil.copy2(file, staging / file.name)
+            checksums[file.name] = _sha256(staging / file.name)
+
+        manifest = {
+            "name": name,
+            "version": version,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "entrypoint": files[0].name,
+            "feature_config": dict(feature_config or {}),
+            "files": checksums,
+        }
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        staging.rename(target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if activate_version:
+        activate(name, version, registry_dir)
+    return ModelVersion(name, version, target, manifest)
+
+
+def activate(name, version, registry_dir=None):
+    """Point CURRENT at an existing version (also how to roll back)."""
+    model_dir = _root(registry_dir) / name
+    if not (model_dir / version / MANIFEST).is_file():
+        raise FileNotFoundError(f"{name} version {version} is not in {model_dir}")
+
+    pointer = model_dir / f".{CURRENT}.{os.getpid()}"
+    pointer.write_text(version + "\n", encoding="utf-8")
+    os.replace(pointer, model_dir / CURRENT)
+
+
+def current_version(name, registry_dir=None):
+    """Version CURRENT points at, or None if `name` has never been published."""
+    try:
+        return (_root(registry_dir) / name / CURRENT).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve(name, version=None, registry_dir=None, verify=True) -> ModelVersion:
+    """
+    Look up `version` (default: CURRENT) and check its files against the manifest.
+
+    Raises:
+        FileNotFoundError: No such version / nothing published
+        ValueError: Missing files or checksum mismatch
+    """
+    version = version or current_version(name, registry_dir)
+    if version is None:
+        raise FileNotFoundError(f"No {name} model published in {_root(registry_dir)}")
+
+    path = _root(registry_dir) / name / version
+    try:
+        manifest = json.loads((path / MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{name} version {version} is not in {path.parent}") from None
+
+    model_version = ModelVersion(name, version, path, manifest)
+    if verify:
+        model_version.verify()
+    return model_version
+
+
+def list_versions(name, registry_dir=None):
+    model_dir = _root(registry_dir) / name
+    if not model_dir.is_dir():
+        return []
+    # Dot-prefixed entries are publishes still being staged
+    return sorted(p.name for p in model_dir.iterdir() if not p.name.startswith(".") and (p / MANIFEST).is_file())
+
+
+class ModelWatcher:
+    """
+    Follows CURRENT for one model name and hot-swaps new versions.
+
+    poll() resolves and loads a changed version off the request path, then
+    calls swap(model_version, model); callers keep serving whatever model
+    reference they already hold, so in-flight requests finish on the old
+    model and the next request picks up the new one. A version that fails
+    to load or verify is skipped (the old model stays) until CURRENT moves.
+
+    Args:
+        name (str): Registry model name
+        load (callable): ModelVersion -> model; may raise to reject the version
+        swap (callable): (ModelVersion, model) -> None, installs the model
+        interval (float): Seconds between polls (<= 0 disables the thread)
+    """
+
+    def __init__(self, name, load, swap, interval=RELOAD_SECONDS, registry_dir=None):
+        self.name = name
+        self.load = load
+        self.swap = swap
+        self.interval = interval
+        self.registry_dir = registry_dir
+        self.version = None  # version currently served
+        self._rejected = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def poll(self) -> bool:
+        """Load and swap in CURRENT if it changed; True if a new version went live."""
+        version = current_version(self.name, self.registry_dir)
+        if version is None or version in (self.version, self._rejected):
+            return False
+
+        try:
+            model_version = resolve(self.name, version, self.registry_dir)
+            model = self.load(model_version)
+        except Exception as e:
+            self._rejected = version
+            print(f"⚠️ {self.name} model {version} rejected, still serving {self.version or 'the previous model'}: {e}")
+            return False
+
+        self.swap(model_version, model)
+        self.version = version
+        print(f"✅ {self.name} model {version} is live")
+        return True
+
+    def load_initial(self, fallback):
+        """
+        Load CURRENT on first use. If it fails to resolve or load, the newest
+        other version that does, then fallback(): a bad publish must not leave
+        a freshly started process without a model. The rejected CURRENT is
+        skipped until it moves, as poll() does for a bad hot reload.
+
+        Args:
+            fallback (callable): () -> model, e.g. loading the unversioned path
+        """
+        current = current_version(self.name, self.registry_dir)
+        if current is None:
+            return fallback()
+
+        others = [v for v in reversed(list_versions(self.name, self.registry_dir)) if v != current]
+        for version in [current] + others:
+            try:
+                model = self.load(resolve(self.name, version, self.registry_dir))
+            except Exception as e:
+                print(f"⚠️ {self.name} model {version} rejected: {e}")
+                if version == current:
+                    self._rejected = version
+                continue
+            if version != current:
+                print(f"⚠️ {self.name} model {current} unusable, serving {version}")
+            self.version = version
+            return model
+
+        print(f"⚠️ No published {self.name} model loads, serving the unversioned model")
+        return fallback()
+
+    def ensure_running(self):
+        """
+        Start the polling thread in this process if it is not running yet.
+
+        Threads do not survive fork, so this is called lazily from the
+        request path: every gunicorn worker starts its own watcher, the
+        preloading master none.
+        """
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, name=f"{self.name}-model-watcher", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._pid = None
+
+    def _run(self):
+        stop = self._stop
+        while not stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️ {self.name} model watcher: {e}")
+
+
+def default_feature_config(name):
+    """Feature settings recorded in the manifest of models trained by this tree."""
+    if name != "voice":
+        return {}
+    from features.extract import EXTRACTOR_VERSION, N_FEATURES
+    return {"extractor_version": EXTRACTOR_VERSION, "n_features": N_FEATURES}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish, activate and list registry model versions")
+    parser.add_argument("--registry-dir", default=None, help="Registry root (default: MODEL_REGISTRY_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish_cmd = commands.add_parser("publish", help="Copy artifacts into a new version and activate it")
+    publish_cmd.add_argument("name")
+    publish_cmd.add_argument("files", nargs="+", help="Artifacts; the first one is the entrypoint")
+    publish_cmd.add_argument("--version", default=None)
+    publish_cmd.add_argument("--no-activate", action="store_true", help="Publish without moving CURRENT")
+
+    activate_cmd = commands.add_parser("activate", help="Point CURRENT at a version (roll forward or back)")
+    activate_cmd.add_argument("name")
+    activate_cmd.add_argument("version")
+
+    list_cmd = commands.add_parser("list", help="List versions, marking CURRENT")
+    list_cmd.add_argument("name")
+
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        published = publish(
+            args.name, args.files, default_feature_config(args.name),
+            version=args.version, activate_version=not args.no_activate, registry_dir=args.registry_dir,
+        )
+        state = "published" if args.no_activate else "published and activated"
+        print(f"✅ {args.name} {published.version} {state} ({published.path})")
+    elif args.command == "activate":
+        activate(args.name, args.version, args.registry_dir)
+        print(f"✅ {args.name} CURRENT -> {args.version}")
+    else:
+        current = current_version(args.name, args.registry_dir)
+        for version in list_versions(args.name, args.registry_dir):
+            print(f"{'*' if version == current else ' '} {version}")
@@ -0,0 +1,159 @@
+"""
+Windowed segment scoring for long clips
+The voice model was trained on fixed-length segments cut from calls (the
+"<call>_call<n>" files grouped in training/train.py), so a long call is
+split into SEGMENT_SECONDS windows, each window is scored like one training
+segment, and the per-window AI probabilities are aggregated:
+
+  mean  average AI probability (default)
+  max   most AI-like window
+  vote  share of windows at or above AI_LIKELY_THRESHOLD, labelled with the
+        usual thresholds (e.g. "AI" once 80% of windows vote AI)
+
+Windows are scored in waves; one thread pool of VOICE_SEGMENT_JOBS threads
+(default: the worker's CPU budget) extracts the features of every wave, which
+the NumPy/SciPy primitives run largely outside the GIL. With early stopping
+the remaining windows are skipped once enough of them agree.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from audio_io import load_audio
+from features.extract import _resolve_n_jobs, extract_features_batch
+from inference.predict import (
+    AI_LIKELY_THRESHOLD,
+    _get_model,
+    _label_predictions,
+    _pitch_mode,
+    _speech_mode,
+)
+from serving.cpu_budget import cpu_budget
+
+# Must match the length of the training segments
+SEGMENT_SECONDS = float(os.environ.get("VOICE_SEGMENT_SECONDS", "5"))
+AGGREGATES = ("mean", "max", "vote")
+AGGREGATE = os.environ.get("VOICE_SEGMENT_AGGREGATE", "mean")
+# Feature-extraction threads per call (-1 = all cores)
+SEGMENT_JOBS = int(os.environ.get("VOICE_SEGMENT_JOBS", cpu_budget()["worker_threads"]))
+
+# Early stop once at least EARLY_STOP_MIN_SEGMENTS windows were scored and
+# this share of them falls on the same side of AI_LIKELY_THRESHOLD
+EARLY_STOP_MIN_SEGMENTS = 4
+EARLY_STOP_AGREEMENT = 0.9
+
+
+def split_segments(audio, segment_seconds=None):
+    """
+    Non-overlapping windows of a decoded clip.
+
+    Returns:
+        list[tuple[float, float, np.ndarray]]: (start_sec, end_sec, samples);
+        a trailing window shorter than half a segment is merged into the previous one
+    """
+    segment_seconds = segment_seconds or SEGMENT_SECONDS
+    size = int(round(segment_seconds * audio.sr))
+    samples = audio.samples
+
+    bounds = list(range(0, len(samples), size)) + [len(samples)]
+    if len(bounds) > 2 and bounds[-1] - bounds[-2] < size // 2:
+        del bounds[-2]
+
+    return [(start / audio.sr, end / audio.sr, samples[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def predict_audio_segments(filepath, segment_seconds=None, aggregate=None, n_jobs=None, early_stop=True):
+    """
+    Classify a path or `DecodedAudio` window by window.
+
+    Args:
+        segment_seconds (float): Window length; defaults to VOICE_SEGMENT_SECONDS
+        aggregate (str): One of AGGREGATES; defaults to VOICE_SEGMENT_AGGREGATE
+        n_jobs (int): Feature-extraction threads (None = VOICE_SEGMENT_JOBS, 1 = in-process, -1 = all cores)
+        early_stop (bool): Skip the remaining windows once enough agree
+
+    Returns:
+        dict: "result"/"confidence" as predict_audio, plus "segments" (per-window
+        start, end, ai_probability, result, confidence; INVALID_AUDIO windows
+        included), "segments_scored" and "early_stopped"
+    """
+    aggregate = aggregate or AGGREGATE
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate {aggregate!r}, expected one of {AGGREGATES}")
+
+    model = _get_model()
+    audio = load_audio(filepath)
+    windows = split_segments(audio, segment_seconds)
+
+    n_jobs = _resolve_n_jobs(SEGMENT_JOBS if n_jobs is None else n_jobs, len(windows))
+    wave = max(EARLY_STOP_MIN_SEGMENTS, n_jobs)
+
+    # One pool for every wave: no per-wave startup
+    executor = ThreadPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    try:
+        segments, ai_proba, early_stopped = _score_waves(model, audio, windows, wave, n_jobs, executor, early_stop)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if not ai_proba:
+        result = {"result": "INVALID_AUDIO", "confidence": 0.0}
+    else:
+        score = _aggregate(ai_proba, aggregate)
+        result = _label_predictions(np.array([[1.0 - score, score]]))[0]
+
+    result.update(segments=segments, segments_scored=len(segments), early_stopped=early_stopped)
+    return result
+
+
+def _score_waves(model, audio, windows, wave, n_jobs, executor, early_stop):
+    segments = []
+    ai_proba = []
+    early_stopped = False
+    for first in range(0, len(windows), wave):
+        batch = windows[first:first + wave]
+        X, valid = extract_features_batch(
+            [samples for _, _, samples in batch],
+            n_jobs=n_jobs,
+            sr=audio.sr,
+            pitch_mode=_pitch_mode(model),
+            speech_mode=_speech_mode(model),
+            executor=executor,
+        )
+
+        proba = np.zeros((len(batch), 2))
+        if valid.any():
+            proba[valid] = model.predict_proba(X[valid])
+        labels = _label_predictions(proba)
+
+        for (start, end, _), ok, p, label in zip(batch, valid, proba, labels):
+            segment = {"start": round(start, 2), "end": round(end, 2)}
+            if ok:
+                segment.update(ai_probability=round(float(p[1]), 3), **label)
+                ai_proba.append(float(p[1]))
+            else:
+                segment.update(ai_probability=None, result="INVALID_AUDIO", confidence=0.0)
+            segments.append(segment)
+
+        if early_stop and len(segments) < len(windows) and _windows_agree(ai_proba):
+            early_stopped = True
+            break
+    return segments, ai_proba, early_stopped
+
+
+def _windows_agree(ai_proba):
+    if len(ai_proba) < EARLY_STOP_MIN_SEGMENTS:
+        return False
+    ai_share = np.mean(np.asarray(ai_proba) >= AI_LIKELY_THRESHOLD)
+    return max(ai_share, 1.0 - ai_share) >= EARLY_STOP_AGREEMENT
+
+
+def _aggregate(ai_proba, aggregate):
+    ai_proba = np.asarray(ai_proba)
+    if aggregate == "max":
+        return float(ai_proba.max())
+    if aggregate == "vote":
+        return float(np.mean(ai_proba >= AI_LIKELY_THRESHOLD))
+    return float(ai_proba.mean())
@@ -1,3 +1,22 @@
-﻿from ui.app import app
+﻿# Cap BLAS/OpenMP threads before NumPy & co. are imported (see serving/cpu_budget.py)
+from serving.cpu_budget import apply_thread_limits
+
+apply_thread_limits()
+
+import gc
+import os
+
+from ui.app import app
+from inference.predict import preload_models
+
+# Load the voice model in the gunicorn master (--preload) so forked workers
+# share it copy-on-write instead of each loading a copy on its first request
+if os.environ.get("PRELOAD_MODELS", "1") == "1":
+    try:
+        preload_models()
+    except FileNotFoundError as e:
+        print(f"⚠️ Voice model not preloaded: {e}")
+    # Keep the GC from touching (and so copying) the preloaded objects in every worker
+    gc.freeze()
 
 # Entry point for Gunicorn/Cloud Run
@@ -3,6 +3,7 @@ End-to-End Pipeline Runner
 Audio -> STT -> Spam Intent -> AI/Human Detection -> Final Verdict
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -10,29 +11,78 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from stt.transcribe import transcribe_audio
+from audio_io import load_audio
+from stt.transcribe import transcribe_clip
+from spam_intent.incremental import IncrementalSpamScorer
 from spam_intent.spam_engine import SpamIntentEngine
 from inference.predict import predict_audio
-from decision_engine.final_decision import get_final_verdict
+from decision_engine.final_decision import get_final_verdict, is_conclusive_spam
 
+# "1": score spam segment by segment while Whisper decodes and stop decoding
+# once a high-risk intent makes the call SPAM (see transcribe_and_score)
+PIPELINE_STREAMING = os.environ.get("PIPELINE_STREAMING", "0") == "1"
 
-def run_pipeline(audio_path: str, verbose: bool = True) -> dict:
+
+def transcribe_and_score(audio, spam_engine, stop_early: bool = True, language: str = None):
     """
-    Run complete pipeline on audio file.
+    Transcribe while scoring spam incrementally.
+
+    Each segment is scored as soon as Whisper yields it; with `stop_early`,
+    decoding stops once a high-risk intent pushes the verdict to SPAM, so a
+    scam that shows its hand in the first seconds skips the rest of the call.
+    `language` is the caller-supplied language, if any (see transcribe_clip).
+
+    Returns:
+        tuple: (TranscriptionResult holding the segments decoded so far,
+        spam result for that transcript)
     """
+    transcription = transcribe_clip(audio, language=language)
+    scorer = IncrementalSpamScorer(spam_engine)
+    for segment in transcription.iter_segments():
+        spam_result = scorer.add(segment["text"])
+        if stop_early and is_conclusive_spam(spam_result["spam_score"], spam_result["matched_intents"]):
+            transcription.stop()
+            break
+    return transcription, scorer.result
 
-    audio_path = Path(audio_path)
+
+def run_pipeline(audio_path, verbose: bool = True, streaming: bool = None, language: str = None) -> dict:
+    """
+    Run complete pipeline on audio file.
+    The audio is decoded once and the samples are shared by every stage.
+    With `streaming` (default: PIPELINE_STREAMING) spam is scored while the
+    audio is transcribed and STT stops early on a conclusive scam; the
+    result then carries the partial transcript and "stt_stopped_early".
+    A known `language` (code or name, e.g. "Tamil") skips language detection
+    and selects that language's Whisper model.
+    """
+    if streaming is None:
+        streaming = PIPELINE_STREAMING
 
     if verbose:
         print("\n" + "=" * 60)
         print("VOICE AI DETECTOR - FULL PIPELINE")
         print("=" * 60)
 
+    # Step 0: Decode once (16 kHz mono float32)
+    try:
+        audio = load_audio(audio_path)
+    except Exception as e:
+        if verbose:
+            print(f"ERROR Decode: {e}")
+        return {"error": str(e), "stage": "DECODE"}
+
     # Step 1: Speech-to-Text
     if verbose:
         print("\n[STEP 1] TRANSCRIBING AUDIO...")
     try:
-        transcript = transcribe_audio(str(audio_path))
+        if streaming:
+            spam_engine = SpamIntentEngine()
+            transcription, spam_result = transcribe_and_score(audio, spam_engine, language=language)
+        else:
+            # One Whisper pass gives both the transcript and the spoken language
+            transcription = transcribe_clip(audio, language=language)
+        transcript = transcription.text
         if not transcript:
             transcript = "[No speech detected]"
             if verbose:
@@ -44,6 +94,9 @@ def run_pipeline(audio_path: str, verbose: bool = True) -> dict:
                     if len(transcript) > 100
                     else f"OK Transcript: {transcript}"
                 )
+        if verbose and transcription.stopped_early:
+            decoded_until = transcription.segments[-1]["end"]
+            print(f"OK Conclusive scam after {decoded_until:.1f}s of {transcription.duration:.1f}s, rest not transcribed")
     except Exception as e:
         if verbose:
             print(f"ERROR STT: {e}")
@@ -53,7 +106,7 @@ def run_pipeline(audio_path: str, verbose: bool = True) -> dict:
     if verbose:
         print("\n[STEP 2] DETECTING AI vs HUMAN VOICE...")
     try:
-        voice_result = predict_audio(str(audio_path))
+        voice_result = predict_audio(audio)
         voice_type = voice_result["result"]
         voice_confidence = voice_result["confidence"]
 
@@ -69,8 +122,9 @@ def run_pipeline(audio_path: str, verbose: bool = True) -> dict:
     if verbose:
         print("\n[STEP 3] ANALYZING SPAM INTENT...")
     try:
-        spam_engine = SpamIntentEngine()  # no args
-        spam_result = spam_engine.score(transcript)
+        if not streaming:
+            spam_engine = SpamIntentEngine()  # no args
+            spam_result = spam_engine.score(transcript)
 
         spam_score = spam_result["spam_score"]
         matched_intents = spam_result["matched_intents"]
@@ -125,6 +179,9 @@ def run_pipeline(audio_path: str, verbose: bool = True) -> dict:
         print("=" * 60 + "\n")
 
     final_verdict["transcript"] = transcript
+    final_verdict["language"] = transcription.language_name
+    if streaming:
+        final_verdict["stt_stopped_early"] = transcription.stopped_early
     return final_verdict
 
 
@@ -0,0 +1,8 @@
+"""
+Serving runtime configuration for Voice AI Detector
+"""
+
+from .cpu_budget import apply_thread_limits, configure_model_threads, cpu_budget
+from .disk_cache import DiskLRU
+
+__all__ = ["DiskLRU", "apply_thread_limits", "configure_model_threads", "cpu_budget"]
@@ -0,0 +1,92 @@
+"""
+Per-worker CPU budget
+One serving worker runs faster-whisper (CTranslate2 threads), the voice
+forest (joblib threads) and NumPy/SciPy (BLAS/OpenMP threads) in the same
+process. Left at their defaults each of them sizes itself to every core on
+the host, and N gunicorn workers multiply that again. This module derives
+one thread count per worker and hands each runtime its share:
+
+  WORKER_CPU_THREADS   threads one worker may keep busy
+                       (default: cores // WEB_CONCURRENCY, at least 1)
+  WHISPER_CPU_THREADS  CTranslate2 intra-op threads (default: WORKER_CPU_THREADS)
+  MODEL_N_JOBS         forest predict_proba n_jobs (default: 1; one 92-feature
+                       row never amortises a thread pool)
+  BLAS_THREADS         OpenMP / OpenBLAS / MKL threads (default: 1)
+
+STT and classification run one after the other within a request, so
+whisper gets the whole worker budget while the forest and BLAS stay serial.
+
+Imports nothing heavy: apply_thread_limits() must run before NumPy is
+first imported for the environment variables to take effect.
+"""
+
+import os
+
+# Read by OpenMP, OpenBLAS, MKL, Accelerate and numexpr at library load time
+_BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+def cpu_budget() -> dict:
+    """
+    Thread counts for this worker.
+
+    Returns:
+        dict: worker_threads, whisper_threads, model_jobs, blas_threads
+    """
+    workers = max(1, _env_int("WEB_CONCURRENCY", 1))
+    worker_threads = max(1, _env_int("WORKER_CPU_THREADS", (os.cpu_count() or 1) // workers))
+    return {
+        "worker_threads": worker_threads,
+        "whisper_threads": max(1, _env_int("WHISPER_CPU_THREADS", worker_threads)),
+        "model_jobs": _env_int("MODEL_N_JOBS", 1),
+        "blas_threads": max(1, _env_int("BLAS_THREADS", 1)),
+    }
+
+
+def apply_thread_limits():
+    """
+    Cap BLAS/OpenMP threads for this process.
+
+    Sets the environment variables (effective for libraries not loaded yet,
+    inherited by child processes) unless the operator already set them, and
+    limits already-loaded pools through threadpoolctl when it is installed.
+    Returns the budget that was applied.
+    """
+    budget = cpu_budget()
+    for name in _BLAS_ENV_VARS:
+        os.environ.setdefault(name, str(budget["blas_threads"]))
+
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return budget
+    threadpool_limits(limits=budget["blas_threads"])
+    return budget
+
+
+def configure_model_threads(model, n_jobs=None):
+    """
+    Set n_jobs on a loaded voice model in place (the pickled forest carries the
+    training-time n_jobs=-1). Handles CalibratedClassifierCV, bare estimators
+    and the compiled forest (which has no thread pool). Returns the model.
+    """
+    n_jobs = cpu_budget()["model_jobs"] if n_jobs is None else n_jobs
+
+    estimators = [model]
+    for calibrated in getattr(model, "calibrated_classifiers_", []):
+        estimators.append(calibrated.estimator)
+    for estimator in estimators:
+        if hasattr(estimator, "n_jobs"):
+            estimator.n_jobs = n_jobs
+    return model
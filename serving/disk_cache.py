@@ -0,0 +1,100 @@
+"""
+Size-bounded on-disk LRU shared by the feature and transcript caches
+Entries are files under `root/<ab>/<key><suffix>`, written then renamed so
+concurrent workers never read a partial file. A read refreshes the file's
+mtime; once the directory grows past `max_bytes` the least recently used
+files are removed down to 90% of it.
+"""
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+class DiskLRU:
+    """
+    Args:
+        root (str): Cache directory
+        suffix (str): File extension of the entries, e.g. ".npy"
+        max_bytes (int): Size bound of the directory
+    """
+
+    def __init__(self, root, suffix: str, max_bytes: int):
+        self.root = Path(root)
+        self.suffix = suffix
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._size = None
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def read(self, key: str, load):
+        """`load(path)` of the entry, or None if it is missing or unreadable."""
+        path = self.path(key)
+        try:
+            value = load(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        try:
+            os.utime(path)  # LRU bookkeeping
+        except OSError:
+            pass
+        return value
+
+    def write(self, key: str, dump, mode: str = "wb") -> None:
+        """Store an entry written by `dump(file)`, then evict past the budget."""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+                dump(f)
+            try:
+                replaced = path.stat().st_size  # overwriting a key frees the old file
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self._entries())
+            else:
+                self._size += path.stat().st_size - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        return [p for p in self.root.glob(f"*/*{self.suffix}") if p.is_file()]
+
+    def _evict(self) -> None:
+        # Drop least recently used entries down to 90% of the budget
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+
+        total = sum(size for _mtime, size, _p in entries)
+        target = int(self.max_bytes * 0.9)
+        for _mtime, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
@@ -0,0 +1,38 @@
+"""
+Incremental spam scoring for a transcript that arrives segment by segment
+"""
+
+from typing import Dict, List
+
+
+class IncrementalSpamScorer:
+    """
+    Spam score of the transcript so far, updated per transcribed segment.
+
+    SpamIntentEngine.score has patterns that span segments (e.g.
+    "account ... locked") and a rebate for harmless phrases, so every add()
+    scores the accumulated text: the result always equals score() on the
+    same transcript, and costs milliseconds next to the seconds Whisper
+    spends decoding a segment.
+
+    Args:
+        engine: Object with score(text) -> {"spam_score", "label", "matched_intents"},
+            normally a SpamIntentEngine
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.parts: List[str] = []
+        self.result: Dict = engine.score("")
+
+    @property
+    def text(self) -> str:
+        """Transcript so far, formatted like TranscriptionResult.text."""
+        return " ".join(self.parts).lower().strip()
+
+    def add(self, text: str) -> Dict:
+        """Append one segment's text and return the updated score."""
+        self.parts.append(text)
+        if text.strip():
+            self.result = self.engine.score(self.text)
+        return self.result
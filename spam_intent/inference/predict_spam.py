@@ -1,13 +1,41 @@
 import joblib
 from pathlib import Path
 
-MODEL_PATH = Path("spam_intent/artifacts/spam_model.pkl")
+from inference import registry
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Used until a spam model is published to the registry (inference/registry.py)
+MODEL_PATH = PROJECT_ROOT / "spam_intent" / "artifacts" / "spam_model.pkl"
+
+_BUNDLE = None
+
+
+def _load_bundle(model_version):
+    return joblib.load(model_version.entrypoint)
+
+
+def _swap_bundle(model_version, bundle):
+    global _BUNDLE
+    _BUNDLE = bundle
+
+
+_WATCHER = registry.ModelWatcher("spam", _load_bundle, _swap_bundle)
+
+
+def _get_bundle():
+    global _BUNDLE
+    _WATCHER.ensure_running()
+    if _BUNDLE is None:
+        # CURRENT if published and loadable, else an older version, else MODEL_PATH
+        _BUNDLE = _WATCHER.load_initial(lambda: joblib.load(MODEL_PATH))
+    return _BUNDLE
 
-bundle = joblib.load(MODEL_PATH)
-model = bundle["model"]
-vectorizer = bundle["vectorizer"]
 
 def predict_spam(text: str):
+    bundle = _get_bundle()
+    model = bundle["model"]
+    vectorizer = bundle["vectorizer"]
+
     text = text.lower()
     X = vectorizer.transform([text])
     prob = model.predict_proba(X)[0]
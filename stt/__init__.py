@@ -2,6 +2,6 @@
 Speech-to-Text module for Voice AI Detector
 """
 
-from .transcribe import transcribe_audio
+from .transcribe import TranscriptionResult, detect_language, identify_language, transcribe_audio, transcribe_clip
 
-__all__ = ["transcribe_audio"]
+__all__ = ["TranscriptionResult", "detect_language", "identify_language", "transcribe_audio", "transcribe_clip"]
@@ -0,0 +1,109 @@
+"""
+Transcript cache
+Mass-dialed scam campaigns submit the same recording over and over. Whisper
+results are cached under the audio content hash plus everything that
+changes the transcript (model name, decode options, batched or sequential
+decoding), in two tiers:
+
+  memory  LRU of the last TRANSCRIPT_CACHE_ENTRIES results in this process
+          (default: 256; 0 disables it)
+  disk    JSON files under TRANSCRIPT_CACHE_DIR shared by all workers; the
+          least recently used are evicted once the directory grows past
+          TRANSCRIPT_CACHE_MAX_BYTES (default: 64 MiB). Off unless the
+          directory is set.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from serving.disk_cache import DiskLRU
+
+DEFAULT_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class TranscriptCache:
+    """
+    Two-tier cache of TranscriptionResult.to_dict() values.
+
+    Args:
+        max_entries (int): Memory tier size (0 = no memory tier)
+        root (str): Disk tier directory (None = no disk tier)
+        max_bytes (int): Disk tier size bound
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_ENTRIES, root=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self._disk = DiskLRU(root, ".json", max_bytes) if root else None
+        self.root = self._disk.root if self._disk else None
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(audio_hash: str, config: dict) -> str:
+        config_blob = json.dumps(config, sort_keys=True)
+        return hashlib.sha256(f"{audio_hash}|{config_blob}".encode()).hexdigest()
+
+    def get(self, key: str):
+        """Cached value or None; disk hits are promoted to the memory tier."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._remember(key, value)
+        if self._disk is not None:
+            self._disk.write(key, lambda f: json.dump(value, f, ensure_ascii=False), mode="w")
+
+    def _remember(self, key, value):
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str):
+        if self._disk is None:
+            return None
+        return self._disk.read(key, lambda path: json.loads(path.read_text(encoding="utf-8")))
+
+
+_CACHES = {}
+
+
+def get_transcript_cache():
+    """
+    Cache configured by TRANSCRIPT_CACHE_ENTRIES / TRANSCRIPT_CACHE_DIR /
+    TRANSCRIPT_CACHE_MAX_BYTES, or None when both tiers are disabled.
+    """
+    max_entries = int(os.environ.get("TRANSCRIPT_CACHE_ENTRIES", DEFAULT_ENTRIES))
+    root = os.environ.get("TRANSCRIPT_CACHE_DIR") or None
+    if max_entries <= 0 and root is None:
+        return None
+    max_bytes = int(os.environ.get("TRANSCRIPT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+    settings = (max_entries, root, max_bytes)
+    cache = _CACHES.get(settings)
+    if cache is None:
+        cache = _CACHES[settings] = TranscriptCache(*settings)
+    return cache
@@ -0,0 +1,186 @@
+"""
+Per-language Whisper model routing
+When the caller already knows the spoken language, the call can run on a
+model sized for that language: English is handled well by a small model,
+while Telugu or Malayalam need a bigger one. Routed models are loaded on
+first use and kept in an LRU bounded by an estimated memory budget; the
+default WHISPER_MODEL (auto-detect and unrouted languages) always stays
+loaded in stt.transcribe and is not part of the budget.
+
+  WHISPER_MODEL_ROUTES       comma-separated "<code>=<model>[:<compute type>]",
+                             e.g. "en=base.en,te=medium,ml=medium:int8_float16"
+                             (default: none, every language uses WHISPER_MODEL)
+  WHISPER_MEMORY_BUDGET_MB   estimated memory routed models may use together
+                             (default: 2048); a route to a model larger than
+                             the whole budget is ignored
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from serving.cpu_budget import cpu_budget
+
+DEFAULT_COMPUTE_TYPE = "int8"
+DEFAULT_MEMORY_BUDGET_MB = 2048
+
+# Approximate resident size of int8 weights (MB), by model family
+MODEL_SIZES_MB = {
+    "tiny": 75,
+    "base": 145,
+    "small": 480,
+    "medium": 1500,
+    "large": 3100,
+}
+# Bytes per weight relative to int8
+_COMPUTE_TYPE_SCALE = {"int8": 1, "int8_float16": 1, "int8_float32": 1, "int8_bfloat16": 1, "float16": 2, "bfloat16": 2, "float32": 4}
+
+
+def parse_routes(spec: str) -> dict:
+    """
+    "en=base.en,te=medium:int8_float16" -> {"en": ("base.en", "int8"), "te": ("medium", "int8_float16")}
+    """
+    routes = {}
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        code, sep, model = entry.partition("=")
+        if not sep or not code.strip() or not model.strip():
+            raise ValueError(f"Invalid Whisper route {entry!r}, expected <code>=<model>[:<compute type>]")
+        name, _, compute_type = model.strip().partition(":")
+        routes[code.strip().lower()] = (name, compute_type or DEFAULT_COMPUTE_TYPE)
+    return routes
+
+
+def default_route() -> tuple:
+    return os.environ.get("WHISPER_MODEL", "small"), DEFAULT_COMPUTE_TYPE
+
+
+def memory_budget_mb() -> float:
+    return float(os.environ.get("WHISPER_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET_MB))
+
+
+_OVER_BUDGET_WARNED = set()
+
+
+def model_route(language: str = None) -> tuple:
+    """
+    (model name, compute type) for a Whisper language code; the default model
+    when None, unrouted, or routed to a model the memory budget cannot hold.
+    """
+    if language:
+        route = parse_routes(os.environ.get("WHISPER_MODEL_ROUTES", "")).get(language)
+        if route is not None:
+            size, budget_mb = estimate_mb(*route), memory_budget_mb()
+            if size <= budget_mb:
+                return route
+            if route not in _OVER_BUDGET_WARNED:
+                _OVER_BUDGET_WARNED.add(route)
+                print(
+                    f"⚠️ Whisper route {language}={route[0]} (~{size:.0f} MB) exceeds the {budget_mb:.0f} MB "
+                    f"budget, using WHISPER_MODEL"
+                )
+    return default_route()
+
+
+def estimate_mb(name: str, compute_type: str = DEFAULT_COMPUTE_TYPE) -> float:
+    """Estimated resident size of a model: its weights on disk for a local path, the family size otherwise."""
+    path = Path(name)
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.glob("*.bin")) / 2 ** 20
+
+    family = name.split("/")[-1].lower()
+    for prefix in ("distil-", "faster-whisper-", "faster-distil-whisper-"):
+        family = family.replace(prefix, "")
+    family = family.split(".")[0].split("-")[0]
+    return MODEL_SIZES_MB.get(family, MODEL_SIZES_MB["medium"]) * _COMPUTE_TYPE_SCALE.get(compute_type, 1)
+
+
+def load_whisper_model(name: str, compute_type: str = DEFAULT_COMPUTE_TYPE):
+    from faster_whisper import WhisperModel
+    return WhisperModel(name, compute_type=compute_type, cpu_threads=cpu_budget()["whisper_threads"])
+
+
+class WhisperModelPool:
+    """
+    Lazily loaded models, least recently used evicted past the memory budget.
+
+    Requests that already hold an evicted model finish with it; the memory is
+    released when the last of them drops the reference.
+
+    Args:
+        budget_mb (float): Estimated memory all pooled models may use together
+        loader: (name, compute_type) -> model
+    """
+
+    def __init__(self, budget_mb: float = DEFAULT_MEMORY_BUDGET_MB, loader=load_whisper_model):
+        self.budget_mb = float(budget_mb)
+        self.loader = loader
+        self._models = OrderedDict()  # (name, compute_type) -> (model, estimated MB)
+        self._loading = {}  # (name, compute_type) -> (threading.Event, estimated MB), while loading
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> list:
+        with self._lock:
+            return list(self._models)
+
+    @property
+    def used_mb(self) -> float:
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def get(self, name: str, compute_type: str = DEFAULT_COMPUTE_TYPE):
+        key = (name, compute_type)
+        while True:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    return entry[0]
+
+                loading = self._loading.get(key)
+                if loading is None:
+                    size = estimate_mb(name, compute_type)
+                    self._reserve(name, compute_type, size)
+                    done = threading.Event()
+                    self._loading[key] = (done, size)
+                    break
+            # Another request is loading this model: wait for it, then look again
+            loading[0].wait()
+
+        # Load outside the lock, so requests for other models are not held up
+        try:
+            model = self.loader(name, compute_type)
+            with self._lock:
+                self._models[key] = (model, size)
+        finally:
+            with self._lock:
+                del self._loading[key]
+            done.set()
+        return model
+
+    def _reserve(self, name, compute_type, size):
+        # Caller holds the lock. Models still loading count against the budget too.
+        if size > self.budget_mb:
+            raise ValueError(
+                f"Whisper model {name} ({compute_type}, ~{size:.0f} MB) exceeds the {self.budget_mb:.0f} MB budget"
+            )
+        loading_mb = sum(s for _, s in self._loading.values())
+        while self._models and sum(s for _, s in self._models.values()) + loading_mb + size > self.budget_mb:
+            evicted, _ = self._models.popitem(last=False)
+            print(f"✅ Unloaded Whisper model {evicted[0]} ({evicted[1]}) to stay within {self.budget_mb:.0f} MB")
+
+
+_POOLS = {}
+
+
+def get_model_pool() -> WhisperModelPool:
+    """Process-wide pool sized by WHISPER_MEMORY_BUDGET_MB."""
+    budget_mb = memory_budget_mb()
+    pool = _POOLS.get(budget_mb)
+    if pool is None:
+        pool = _POOLS[budget_mb] = WhisperModelPool(budget_mb)
+    return pool
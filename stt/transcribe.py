@@ -4,26 +4,79 @@ High-accuracy multilingual transcription via faster-whisper
 Supports: English, Hindi, Tamil, Telugu, Malayalam (and more)
 """
 
+from contextlib import closing
 from pathlib import Path
+from types import SimpleNamespace
 from typing import List, Optional
 
 import os
 
+import numpy as np
+
+from audio_io import DecodedAudio, content_hash, iter_audio_blocks, load_audio
+from audio_io import vad
+from audio_io.vad import VAD_PARAMETERS, speech_chunks
+from stt.cache import get_transcript_cache
+from stt.models import DEFAULT_COMPUTE_TYPE, default_route, get_model_pool, load_whisper_model, model_route
 
 _WHISPER_MODEL = None
 _WHISPER_MODEL_NAME = None
 
+# Language ID listens to this many seconds of speech (post-VAD) from the start
+# of the clip, looking no further than LANGUAGE_ID_MAX_SCAN_SECONDS into it
+LANGUAGE_ID_SECONDS = float(os.environ.get("LANGUAGE_ID_SECONDS", "10"))
+LANGUAGE_ID_MAX_SCAN_SECONDS = float(os.environ.get("LANGUAGE_ID_MAX_SCAN_SECONDS", "120"))
+
+# Decode options of transcribe_clip(); also part of the transcript cache key.
+# VAD is not Whisper's own: speech regions come from audio_io.vad (shared with
+# the voice features) and are passed as clip_timestamps
+DECODE_OPTIONS = {
+    "language": None,  # auto-detect
+    "initial_prompt": None,
+    "condition_on_previous_text": True,
+    "word_timestamps": False,
+    "beam_size": 5,
+    "temperature": 0.0,
+    "prompt_reset_on_temperature": True,
+    "no_speech_threshold": 0.6,
+    "log_prob_threshold": -1.0,
+    "compression_ratio_threshold": 2.4,
+}
+
+# "beam": every segment with beam search (DECODE_OPTIONS)
+# "adaptive": greedy first, then only segments below ADAPTIVE_LOGPROB_THRESHOLD
+# avg log-prob or above ADAPTIVE_COMPRESSION_THRESHOLD are re-decoded with beam search
+DECODING_MODES = ("beam", "adaptive")
+DECODING = os.environ.get("STT_DECODING", "beam")
+ADAPTIVE_LOGPROB_THRESHOLD = float(os.environ.get("STT_ADAPTIVE_LOGPROB", "-0.5"))
+ADAPTIVE_COMPRESSION_THRESHOLD = float(os.environ.get("STT_ADAPTIVE_COMPRESSION", "2.0"))
+
+# Bump whenever transcripts for the same settings change, so cached ones are not reused
+TRANSCRIPT_VERSION = 2
+
+# "1": transcribe_clip() goes through the batched worker (stt/worker.py), so
+# concurrent requests in one process share Whisper batches
+STT_BATCHING = os.environ.get("STT_BATCHING", "0") == "1"
+
 
 
-def _get_whisper_model():
+def _get_whisper_model(language: str = None):
+    """
+    Model for a Whisper language code, as routed by WHISPER_MODEL_ROUTES
+    (stt/models.py); the default WHISPER_MODEL, always kept loaded, otherwise.
+    """
     global _WHISPER_MODEL, _WHISPER_MODEL_NAME
-    model_name = os.environ.get("WHISPER_MODEL", "small")
+    route = model_route(language)
+    if route != default_route():
+        return get_model_pool().get(*route)
+
+    model_name = route[0]
     if _WHISPER_MODEL is None or _WHISPER_MODEL_NAME != model_name:
-        from faster_whisper import WhisperModel
-        _WHISPER_MODEL = WhisperModel(model_name, compute_type="int8")
+        _WHISPER_MODEL = load_whisper_model(model_name, DEFAULT_COMPUTE_TYPE)
         _WHISPER_MODEL_NAME = model_name
     return _WHISPER_MODEL
 
+
 def _select_best_text(texts: List[str]) -> str:
     # Pick the longest non-empty transcript as a simple quality heuristic
     texts = [t.strip() for t in texts if t and t.strip()]
@@ -32,21 +85,193 @@ def _select_best_text(texts: List[str]) -> str:
     return max(texts, key=len)
 
 
-def transcribe_audio(wav_path: str, chunk_sec: int = 30) -> str:
+def _whisper_audio(audio) -> DecodedAudio:
     """
-    Transcribes a WAV file to text using faster-whisper.
+    16 kHz `DecodedAudio` for faster-whisper. Paths go through the shared
+    decoder layer (audio_io.decoders) instead of faster-whisper's own PyAV
+    decode + resample; already-decoded audio is passed straight through, with
+    any speech regions other stages already found.
+    """
+    if isinstance(audio, DecodedAudio):
+        return load_audio(audio)
+
+    audio_path = Path(audio)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    return load_audio(audio_path)
+
+
+# Whisper language code -> name returned by detect_language
+LANGUAGE_NAMES = {
+    "ta": "Tamil",
+    "en": "English",
+    "hi": "Hindi",
+    "ml": "Malayalam",
+    "te": "Telugu",
+}
+
+
+def _language_code(language: str = None):
+    """Whisper code for a code or name from LANGUAGE_NAMES ("ta", "Tamil", "tamil"); None stays None."""
+    if not language:
+        return None
+    language = str(language).strip().lower()
+    if language in LANGUAGE_NAMES:
+        return language
+    for code, name in LANGUAGE_NAMES.items():
+        if name.lower() == language:
+            return code
+    raise ValueError(f"Unsupported language {language!r}, expected one of {sorted(LANGUAGE_NAMES.values())}")
+
+
+class TranscriptionResult:
+    """
+    Everything one Whisper pass produces for a clip.
+
+    faster-whisper detects the language before decoding and decodes segments
+    lazily, so `language` / `language_probability` are ready as soon as the
+    result exists, while `text` / `segments` run the decode on first access,
+    once; a caller that only needs the language never pays for decoding.
+
+    Attributes:
+        language (str): Detected Whisper language code, e.g. "ta" ("" if unknown)
+        language_probability (float): Confidence of the language detection
+        duration (float): Clip length in seconds
+        stopped_early (bool): stop() ended decoding before the end of the clip
+        decode_stats (dict): Adaptive decoding counters ("segments", "redecoded")
+    """
+
+    def __init__(self, segments, info, on_complete=None, decode_stats=None):
+        self._pending = segments
+        self._on_complete = on_complete
+        # Filled while decoding in adaptive mode: segments, redecoded
+        self.decode_stats = decode_stats if decode_stats is not None else {}
+        self._segments = None
+        self._decoded = []
+        self.stopped_early = False
+        self.language = (info.language or "").lower()
+        self.language_probability = float(info.language_probability or 0.0)
+        self.duration = float(info.duration or 0.0)
+
+    @classmethod
+    def from_segments(cls, segments, language, language_probability=0.0, duration=0.0):
+        """Result from segments decoded elsewhere (e.g. stt/worker.py), as {"start", "end", "text"} dicts."""
+        info = SimpleNamespace(language=language, language_probability=language_probability, duration=duration)
+        result = cls((), info)
+        result._segments = list(segments)
+        return result
+
+    @classmethod
+    def from_dict(cls, value: dict):
+        segments = [dict(segment) for segment in value["segments"]]
+        return cls.from_segments(segments, value["language"], value["language_probability"], value["duration"])
+
+    def to_dict(self) -> dict:
+        """JSON-serialisable copy (decodes the whole clip if not done yet)."""
+        return {
+            "language": self.language,
+            "language_probability": self.language_probability,
+            "duration": self.duration,
+            "segments": [dict(segment) for segment in self.segments],
+        }
+
+    @property
+    def segments(self) -> List[dict]:
+        """Decoded segments as {"start", "end", "text"} (seconds, rounded to 0.01)."""
+        if self._segments is None:
+            for _ in self.iter_segments():
+                pass
+        return self._segments
+
+    def iter_segments(self):
+        """
+        Yield segments as Whisper decodes them, so a caller can act on the
+        transcript so far and stop() the rest; decoded segments are kept for
+        `segments` / `text`.
+        """
+        if self._segments is not None:
+            yield from self._segments
+            return
+
+        yield from self._decoded
+        for seg in self._pending:
+            segment = {"start": round(seg.start, 2), "end": round(seg.end, 2), "text": seg.text}
+            self._decoded.append(segment)
+            yield segment
+        self._segments = self._decoded
+        self._pending = None
+        if self._on_complete is not None:
+            self._on_complete(self)
+
+    def stop(self):
+        """Skip decoding the rest of the clip; `segments` / `text` keep what was decoded so far."""
+        if self._segments is not None:
+            return
+        if hasattr(self._pending, "close"):
+            self._pending.close()
+        self._segments = self._decoded
+        self._pending = None
+        self.stopped_early = True
+
+    @property
+    def text(self) -> str:
+        """Full lowercase transcript."""
+        return " ".join(seg["text"] for seg in self.segments).lower().strip()
+
+    @property
+    def language_name(self) -> str:
+        """One of LANGUAGE_NAMES' values, "English" as fallback."""
+        return LANGUAGE_NAMES.get(self.language, "English")
+
+
+def transcribe_clip(audio, chunk_sec: int = 30, decoding: str = None, language: str = None) -> TranscriptionResult:
+    """
+    Run Whisper once over a path or `DecodedAudio`.
 
     Args:
-        wav_path (str): Path to WAV file
+        audio (str | DecodedAudio): Path to an audio file or already-decoded audio
         chunk_sec (int): Length of each audio chunk in seconds
+        decoding (str): One of DECODING_MODES; defaults to STT_DECODING
+        language (str): Spoken language if the caller knows it (code or
+            LANGUAGE_NAMES name): detection is skipped and the call runs on
+            that language's routed model; auto-detected if None
 
     Returns:
-        str: Full lowercase transcript
+        TranscriptionResult: Language, text and segment timings of that single pass
     """
+    decoding = decoding or DECODING
+    if decoding not in DECODING_MODES:
+        raise ValueError(f"Unknown decoding {decoding!r}, expected one of {DECODING_MODES}")
+    language = _language_code(language)
+
+    cache = get_transcript_cache()
+    key = None
+    if cache is not None:
+        key = cache.key(_audio_hash(audio), _transcript_config(chunk_sec, decoding, language))
+        cached = cache.get(key)
+        if cached is not None:
+            return TranscriptionResult.from_dict(cached)
+
+    if STT_BATCHING:
+        # Batched beam search over all pending requests; `decoding` does not apply
+        from stt.worker import get_stt_worker
+        result = get_stt_worker(language).transcribe(audio, language=language)
+        if key is not None:
+            cache.put(key, result.to_dict())
+        return result
 
-    wav_path = Path(wav_path)
-    if not wav_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {wav_path}")
+    decoded = _whisper_audio(audio)
+    audio_input = decoded.samples
+
+    # VAD once per clip (shared with the voice features); Whisper decodes only
+    # these <= 30 s speech chunks and keeps timestamps on the original timeline
+    chunks = speech_chunks(decoded)
+    if not chunks:
+        result = TranscriptionResult.from_segments([], language or "", 1.0 if language else 0.0, decoded.duration)
+        if key is not None:
+            cache.put(key, result.to_dict())
+        return result
+    clip_timestamps = [sample / decoded.sr for chunk in chunks for sample in chunk]
 
     try:
         from faster_whisper import WhisperModel
@@ -56,73 +281,201 @@ def transcribe_audio(wav_path: str, chunk_sec: int = 30) -> str:
         )
 
     # Small model is faster; medium/large is more accurate (choose based on hardware)
-    model = _get_whisper_model()
+    model = _get_whisper_model(language)
+    options = {**DECODE_OPTIONS, "language": language}
+
+    decode_stats = {}
+    if decoding == "adaptive":
+        greedy, info = model.transcribe(
+            audio_input,
+            chunk_length=chunk_sec,
+            clip_timestamps=clip_timestamps,
+            **{**options, "beam_size": 1},
+        )
+        segments = _adaptive_segments(model, audio_input, greedy, info.language, decode_stats)
+    else:
+        segments, info = model.transcribe(
+            audio_input, chunk_length=chunk_sec, clip_timestamps=clip_timestamps, **options
+        )
+
+    # Cached once fully decoded; a transcript cut short by stop() is not
+    on_complete = None
+    if key is not None:
+        on_complete = lambda result: cache.put(key, result.to_dict())  # noqa: E731
+    return TranscriptionResult(segments, info, on_complete, decode_stats)
 
-    segments, _info = model.transcribe(
-        str(wav_path),
-        language=None,  # auto-detect
-        vad_filter=True,
-        vad_parameters={"min_silence_duration_ms": 500},
-        initial_prompt=None,
-        condition_on_previous_text=True,
-        word_timestamps=False,
-        beam_size=5,
-        temperature=0.0,
-        prompt_reset_on_temperature=True,
-        no_speech_threshold=0.6,
-        log_prob_threshold=-1.0,
-        compression_ratio_threshold=2.4,
-        chunk_length=chunk_sec,
-    )
-
-    texts = [seg.text for seg in segments]
-    return " ".join(texts).lower().strip()
-
-
-def detect_language(audio_path: str) -> str:
-    """
-    Detect language from audio using faster-whisper.
+
+def _adaptive_segments(model, samples, greedy_segments, language, stats, sr=16000):
+    """
+    Pass confident greedy segments through; re-decode weak ones with beam search.
+
+    A weak segment's own time span is re-transcribed alone (features for that
+    slice only), in the already detected language, with the preceding text as
+    prompt in place of condition_on_previous_text.
+    """
+    stats.update(segments=0, redecoded=0)
+    previous = ""
+    for seg in greedy_segments:
+        stats["segments"] += 1
+        weak = seg.avg_logprob < ADAPTIVE_LOGPROB_THRESHOLD or seg.compression_ratio > ADAPTIVE_COMPRESSION_THRESHOLD
+        if weak:
+            stats["redecoded"] += 1
+            clip = samples[int(seg.start * sr):int(np.ceil(seg.end * sr))]
+            beam, _info = model.transcribe(
+                clip,
+                **{
+                    **DECODE_OPTIONS,
+                    "language": language,
+                    "initial_prompt": previous[-200:] or None,
+                    "without_timestamps": True,
+                },
+            )
+            text = "".join(s.text for s in beam)
+            if text.strip():
+                seg = SimpleNamespace(start=seg.start, end=seg.end, text=text)
+        previous = seg.text
+        yield seg
+
+
+def _audio_hash(audio) -> str:
+    # Paths are hashed from the file bytes, so a cache hit skips decoding too
+    if not isinstance(audio, DecodedAudio) and not Path(audio).exists():
+        raise FileNotFoundError(f"Audio file not found: {audio}")
+    return content_hash(audio)
+
+
+def _transcript_config(chunk_sec, decoding=None, language=None) -> dict:
+    """Everything that changes the transcript (transcript cache key)."""
+    model_name, compute_type = model_route(language)
+    config = {
+        "version": TRANSCRIPT_VERSION,
+        "model": model_name,
+        "compute_type": compute_type,
+        "decoder": "batched" if STT_BATCHING else "sequential",
+        "chunk_length": chunk_sec,
+        "vad": VAD_PARAMETERS,
+        **DECODE_OPTIONS,
+        "language": language,
+    }
+    if not STT_BATCHING and (decoding or DECODING) == "adaptive":
+        config["adaptive"] = [ADAPTIVE_LOGPROB_THRESHOLD, ADAPTIVE_COMPRESSION_THRESHOLD]
+    return config
+
+
+def transcribe_audio(wav_path, chunk_sec: int = 30, language: str = None) -> str:
+    """
+    Transcribes a WAV file to text using faster-whisper.
+
+    Args:
+        wav_path (str | DecodedAudio): Path to WAV file or already-decoded audio
+        chunk_sec (int): Length of each audio chunk in seconds
+        language (str): Known spoken language, see transcribe_clip()
+
+    Returns:
+        str: Full lowercase transcript
+    """
+    return transcribe_clip(wav_path, chunk_sec, language=language).text
+
+
+def detect_language(audio_path) -> str:
+    """
+    Detect language from audio (path or DecodedAudio) using faster-whisper.
     Returns one of: Tamil, English, Hindi, Malayalam, Telugu (or "English" as fallback).
+    Cheap: only the opening seconds of speech are looked at (see identify_language).
     """
-    audio_path = Path(audio_path)
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    return identify_language(audio_path)["language"]
 
-    try:
-        from faster_whisper import WhisperModel
-    except ImportError:
-        raise ImportError(
-            "faster-whisper not installed. Install via: pip install faster-whisper"
-        )
 
+def identify_language(audio, speech_seconds: float = None) -> dict:
+    """
+    Whisper language ID on the first `speech_seconds` of speech only.
+
+    Speech regions another stage already found for the clip are reused;
+    otherwise VAD runs block by block over the opening of the clip until
+    enough speech is collected. Files and payloads are decoded only that far,
+    never past LANGUAGE_ID_MAX_SCAN_SECONDS. Then a single encoder pass over
+    that window feeds Whisper's language-detection head; nothing is decoded
+    and the rest of the clip is never touched. Use transcribe_clip() when the
+    text is needed as well.
+
+    Args:
+        audio (str | AudioPayload | DecodedAudio): Audio file, upload or already-decoded audio
+        speech_seconds (float): Speech to listen to; defaults to LANGUAGE_ID_SECONDS (max 30)
+
+    Returns:
+        dict: "language" (LANGUAGE_NAMES value, "English" as fallback),
+        "code" (Whisper language code, "" if no audio) and "probability"
+    """
     model = _get_whisper_model()
+    if not model.model.is_multilingual:
+        return {"language": "English", "code": "en", "probability": 1.0}
+
+    extractor = model.feature_extractor
+    sr = extractor.sampling_rate
+    # Whisper's encoder window is 30 s
+    speech_seconds = min(speech_seconds or LANGUAGE_ID_SECONDS, extractor.chunk_length)
+    n_samples = int(speech_seconds * sr)
+    if isinstance(audio, DecodedAudio):
+        audio = load_audio(audio, sr=sr)
+    if isinstance(audio, DecodedAudio) and audio.speech is not None:
+        window = _region_prefix(audio.samples, audio.speech, n_samples)
+    else:
+        with closing(iter_audio_blocks(audio, sr=sr, block_seconds=2 * speech_seconds)) as blocks:
+            window = _speech_prefix(blocks, n_samples, int(LANGUAGE_ID_MAX_SCAN_SECONDS * sr))
+    if not len(window):
+        return {"language": "English", "code": "", "probability": 0.0}
 
-    _segments, info = model.transcribe(
-        str(audio_path),
-        language=None,
-        vad_filter=True,
-        vad_parameters={"min_silence_duration_ms": 500},
-        initial_prompt=None,
-        condition_on_previous_text=False,
-        word_timestamps=False,
-        beam_size=1,
-        temperature=0.0,
-        prompt_reset_on_temperature=True,
-        no_speech_threshold=0.6,
-        log_prob_threshold=-1.0,
-        compression_ratio_threshold=2.4,
-        chunk_length=30,
-    )
-
-    code = (info.language or "").lower()
-    mapping = {
-        "ta": "Tamil",
-        "en": "English",
-        "hi": "Hindi",
-        "ml": "Malayalam",
-        "te": "Telugu",
+    # The extractor pads with 30 s of silence, so the first window is always full length
+    features = extractor(window)[:, :extractor.nb_max_frames]
+    token, probability = model.model.detect_language(model.encode(features))[0][0]
+    code = token[2:-2]  # "<|ta|>" -> "ta"
+    return {
+        "language": LANGUAGE_NAMES.get(code, "English"),
+        "code": code,
+        "probability": round(float(probability), 3),
     }
-    return mapping.get(code, "English")
+
+
+def _speech_timestamps(samples):
+    return vad._speech_timestamps(samples)
+
+
+def _region_prefix(samples, regions, n_samples):
+    """The first `n_samples` of the clip's known speech `regions`; the raw opening if there are none."""
+    if not regions:
+        return samples[:n_samples]
+    speech = []
+    collected = 0
+    for start, end in regions:
+        speech.append(samples[start:end])
+        collected += end - start
+        if collected >= n_samples:
+            break
+    return np.concatenate(speech)[:n_samples]
+
+
+def _speech_prefix(blocks, n_samples, limit):
+    """
+    The first `n_samples` of VAD speech in `blocks`, reading at most `limit`
+    samples of audio; the raw opening if no speech is found.
+    """
+    speech = []
+    opening = []
+    collected = scanned = 0
+    for block in blocks:
+        block = block[:limit - scanned]
+        if scanned < n_samples:
+            opening.append(block[:n_samples - scanned])
+        scanned += len(block)
+        for ts in _speech_timestamps(block):
+            speech.append(block[ts["start"]:ts["end"]])
+            collected += ts["end"] - ts["start"]
+        if collected >= n_samples or scanned >= limit:
+            break
+
+    if not collected:
+        return np.concatenate(opening) if opening else np.zeros(0, dtype=np.float32)
+    return np.concatenate(speech)[:n_samples]
 
 
 if __name__ == "__main__":
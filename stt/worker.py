@@ -0,0 +1,248 @@
+"""
+Batched Whisper worker
+faster-whisper's transcribe() decodes one clip at a time, so concurrent
+requests in one process either queue on the shared model or fight over
+its threads with tiny matrix products. This worker owns the model instead:
+callers submit audio and get a Future, a single background thread drains
+the queue and runs the encoder and the beam search on batches of 30 s speech
+chunks pooled across all pending requests, which CTranslate2 executes as
+one larger (much better utilised) computation.
+
+  STT_MAX_BATCH_SIZE  speech chunks per encoder / generate call (default: 8)
+  STT_MAX_WAIT_MS     how long the first queued chunk waits for company
+                      before a partial batch runs (default: 50)
+
+Each clip is cut into the same VAD speech chunks of at most 30 s as
+transcribe_clip() (audio_io.vad, computed once per clip), which are decoded
+without timestamps, as in faster-whisper's batched pipeline: segments are
+the VAD chunks, and there is no temperature fallback or conditioning on
+previous text.
+Enabled for transcribe_clip() / transcribe_audio() with STT_BATCHING=1.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from audio_io.vad import speech_chunks
+from stt.models import model_route
+from stt.transcribe import TranscriptionResult, _get_whisper_model, _whisper_audio
+
+STT_MAX_BATCH_SIZE = int(os.environ.get("STT_MAX_BATCH_SIZE", "8"))
+STT_MAX_WAIT_MS = float(os.environ.get("STT_MAX_WAIT_MS", "50"))
+
+# Same thresholds as transcribe_clip(): drop chunks Whisper considers silence
+NO_SPEECH_THRESHOLD = 0.6
+LOG_PROB_THRESHOLD = -1.0
+
+
+class _Job:
+    """One submitted clip: its speech chunks and the decoded text per chunk."""
+
+    def __init__(self, samples, chunks, sr, language):
+        self.samples = samples
+        self.chunks = chunks
+        self.sr = sr
+        self.language = language
+        self.language_probability = 1.0 if language else 0.0
+        self.texts = [None] * len(chunks)
+        self.remaining = len(chunks)
+        self.future = Future()
+
+    def finish_chunk(self, index, text):
+        self.texts[index] = text
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.future.set_result(self.result())
+
+    def result(self):
+        segments = [
+            {"start": round(start / self.sr, 2), "end": round(end / self.sr, 2), "text": text}
+            for (start, end), text in zip(self.chunks, self.texts)
+            if text
+        ]
+        return TranscriptionResult.from_segments(
+            segments, self.language or "", self.language_probability, len(self.samples) / self.sr
+        )
+
+
+class WhisperBatchWorker:
+    """
+    Queue + background thread that transcribes submitted clips in batches.
+
+    Args:
+        model: faster_whisper.WhisperModel; defaults to the shared stt.transcribe model
+        max_batch_size (int): Speech chunks per batch
+        max_wait_ms (float): Longest a partial batch waits for more chunks
+        beam_size (int): Beam width, as transcribe_clip()
+        route (str): Language code whose routed model (WHISPER_MODEL_ROUTES) runs
+            when `model` is None; None for the default model
+    """
+
+    def __init__(
+        self, model=None, max_batch_size=STT_MAX_BATCH_SIZE, max_wait_ms=STT_MAX_WAIT_MS, beam_size=5, route=None
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.beam_size = beam_size
+        self.route = route
+
+        self.batch_sizes = []  # chunks per executed batch, for monitoring
+        self._queue = queue.Queue()
+        self._tokenizers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, audio, language: str = None) -> Future:
+        """
+        Queue a path or `DecodedAudio` for transcription.
+
+        Decoding and VAD run in the calling thread; only Whisper itself is batched.
+
+        Args:
+            language (str): Whisper language code (e.g. "ta"); detected per clip if None
+
+        Returns:
+            Future: resolves to a TranscriptionResult
+        """
+        audio = _whisper_audio(audio)
+        job = _Job(audio.samples, speech_chunks(audio), audio.sr, language)
+        if not job.chunks:
+            job.future.set_result(job.result())
+            return job.future
+
+        self._ensure_running()
+        self._queue.put(job)
+        return job.future
+
+    def transcribe(self, audio, language: str = None, timeout: float = None) -> TranscriptionResult:
+        return self.submit(audio, language).result(timeout)
+
+    def close(self):
+        """Stop the thread after the queued work is done."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                self._queue.put(None)
+                self._thread.join()
+            self._thread = None
+            self._pid = None
+
+    def _ensure_running(self):
+        # Threads do not survive fork: each process starts its own
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="whisper-batch-worker", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        pending = deque()  # (job, chunk index), in submission order
+        stopping = False
+        while not (stopping and not pending):
+            if not pending:
+                job = self._queue.get()
+                if job is None:
+                    break
+                pending.extend((job, i) for i in range(len(job.chunks)))
+
+            # Give concurrent requests up to max_wait to join this batch
+            deadline = time.monotonic() + self.max_wait
+            while not stopping and len(pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                else:
+                    pending.extend((job, i) for i in range(len(job.chunks)))
+
+            batch = [pending.popleft() for _ in range(min(self.max_batch_size, len(pending)))]
+            try:
+                self._process(batch)
+            except Exception as e:
+                failed = {id(job): job for job, _ in batch}
+                for job in failed.values():
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                pending = deque((job, i) for job, i in pending if id(job) not in failed)
+
+    def _process(self, batch):
+        model = self.model or _get_whisper_model(self.route)
+        extractor = model.feature_extractor
+
+        # The extractor pads with 30 s of silence: every chunk gives a full encoder window
+        features = np.stack([
+            extractor(job.samples[slice(*job.chunks[index])])[:, :extractor.nb_max_frames]
+            for job, index in batch
+        ])
+        encoder_output = self._encode(model, features)
+
+        # A clip's language comes from its first chunk, which is always in its first batch
+        if any(job.language is None for job, _ in batch):
+            if model.model.is_multilingual:
+                detected = model.model.detect_language(encoder_output)
+                for (job, index), languages in zip(batch, detected):
+                    if job.language is None:
+                        token, probability = languages[0]
+                        job.language, job.language_probability = token[2:-2], float(probability)
+            else:
+                for job, _ in batch:
+                    job.language, job.language_probability = "en", 1.0
+
+        tokenizers = [self._tokenizer(model, job.language) for job, _ in batch]
+        results = model.model.generate(
+            encoder_output,
+            [model.get_prompt(tokenizer, [], without_timestamps=True) for tokenizer in tokenizers],
+            beam_size=self.beam_size,
+            max_length=model.max_length,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=True,
+            suppress_tokens=[-1],
+        )
+        self.batch_sizes.append(len(batch))
+
+        for (job, index), tokenizer, result in zip(batch, tokenizers, results):
+            tokens = result.sequences_ids[0]
+            # Same silence rule as faster-whisper's transcribe()
+            avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+            silent = result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD
+            job.finish_chunk(index, "" if silent else tokenizer.decode(tokens))
+
+    @staticmethod
+    def _encode(model, features):
+        from faster_whisper.transcribe import get_ctranslate2_storage
+        return model.model.encode(get_ctranslate2_storage(features), to_cpu=False)
+
+    def _tokenizer(self, model, language):
+        if language not in self._tokenizers:
+            from faster_whisper.tokenizer import Tokenizer
+            multilingual = model.model.is_multilingual
+            self._tokenizers[language] = Tokenizer(
+                model.hf_tokenizer, multilingual, task="transcribe", language=language if multilingual else None
+            )
+        return self._tokenizers[language]
+
+
+_WORKERS = {}
+_WORKERS_LOCK = threading.Lock()
+
+
+def get_stt_worker(language: str = None) -> WhisperBatchWorker:
+    """Process-wide worker around the Whisper model `language` is routed to (stt/models.py)."""
+    route = model_route(language)
+    with _WORKERS_LOCK:
+        if route not in _WORKERS:
+            _WORKERS[route] = WhisperBatchWorker(route=language)
+        return _WORKERS[route]
@@ -0,0 +1,66 @@
+"""Test adaptive decoding: greedy pass, beam search only for weak segments"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import stt.transcribe as transcribe
+from audio_io import DecodedAudio
+from test_audio_io import _synthetic_voice
+
+# (start, end, greedy text, avg_logprob, compression_ratio)
+GREEDY = [
+    (0.0, 2.0, " Your account", -0.2, 1.4),
+    (2.0, 4.5, " is blokd", -0.9, 1.3),          # low confidence
+    (4.5, 6.0, " today today today", -0.3, 2.8),  # repetitive
+    (6.0, 8.0, " press one", -0.1, 1.2),
+]
+
+
+def test_only_weak_segments_redecoded(fake_whisper):
+    spans = []
+
+    def decode(audio, kwargs):
+        # Greedy (beam_size=1) decode of the clip; beam decode of single spans
+        spans.append(len(audio))
+        if kwargs["beam_size"] == 1:
+            return GREEDY
+        return [(0.0, len(audio) / 16000, f" beam{len(spans) - 1}")]
+
+    fake = fake_whisper(segments=decode, language="ta", language_probability=0.9)
+    result = transcribe.transcribe_clip(DecodedAudio(_synthetic_voice(seconds=8.0)), decoding="adaptive")
+    assert result.segments == [
+        {"start": 0.0, "end": 2.0, "text": " Your account"},
+        {"start": 2.0, "end": 4.5, "text": " beam1"},
+        {"start": 4.5, "end": 6.0, "text": " beam2"},
+        {"start": 6.0, "end": 8.0, "text": " press one"},
+    ]
+    assert result.decode_stats == {"segments": 4, "redecoded": 2}
+
+    greedy, beam1, beam2 = fake.calls
+    assert greedy["beam_size"] == 1 and greedy["clip_timestamps"] == [0.0, 8.0]
+    assert spans[1:] == [int(2.5 * 16000), int(1.5 * 16000)]
+    for beam in (beam1, beam2):
+        assert beam["beam_size"] == 5 and beam["language"] == "ta"
+        assert "clip_timestamps" not in beam and beam["without_timestamps"] is True
+    assert beam1["initial_prompt"] == " Your account" and beam2["initial_prompt"] == " beam1"
+
+    with pytest.raises(ValueError):
+        transcribe.transcribe_clip(DecodedAudio(np.zeros(16000, dtype=np.float32)), decoding="greedy")
+    print("[OK] Adaptive decoding re-decodes only low log-prob / repetitive segments")
+
+
+def test_cache_key_includes_decoding():
+    beam = transcribe._transcript_config(30, "beam")
+    adaptive = transcribe._transcript_config(30, "adaptive")
+    if not transcribe.STT_BATCHING:
+        assert beam != adaptive
+    print("[OK] Adaptive and beam transcripts are cached separately")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
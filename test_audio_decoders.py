@@ -0,0 +1,90 @@
+"""Test the pluggable audio decoder backends"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import soxr
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import AudioPayload, iter_audio_blocks, load_audio
+from audio_io.decoders import DECODERS, decode, decoder_order
+from test_audio_io import _synthetic_voice
+
+
+def _stereo_44k(seconds=3.0):
+    y = _synthetic_voice(seconds=seconds, seed=5)
+    return soxr.resample(np.stack([y, 0.5 * y[::-1]], axis=1), 16000, 44100)
+
+
+def test_auto_order():
+    order = [d.name for d in decoder_order(".wav", decoder="auto")]
+    assert order[0] == "soundfile"
+    if DECODERS["ffmpeg"].available():
+        assert decoder_order(".m4a", decoder="auto")[0].name == "ffmpeg"
+    assert [d.name for d in decoder_order(".mp3", decoder="ffmpeg")] == ["ffmpeg"]
+    try:
+        decoder_order(".wav", decoder="gstreamer")
+        raise AssertionError("unknown decoder accepted")
+    except ValueError:
+        pass
+    print("[OK] Per-format backend order")
+
+
+def test_ffmpeg_matches_soundfile():
+    ffmpeg = DECODERS["ffmpeg"]
+    if not ffmpeg.available():
+        print("[SKIP] ffmpeg not installed")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in (".wav", ".mp3"):
+            path = Path(tmp) / f"call{suffix}"
+            sf.write(path, _stereo_44k(), 44100)
+
+            reference = decode(str(path), 16000, decoder="soundfile")
+            piped = decode(str(path), 16000, decoder="ffmpeg")
+            assert len(piped) == len(reference)
+            np.testing.assert_allclose(piped, reference, atol=1e-5)
+
+            blocks = list(iter_audio_blocks(str(path), block_seconds=0.7))
+            np.testing.assert_array_equal(np.concatenate(blocks), reference)
+            streamed = np.concatenate(list(ffmpeg.iter_blocks(str(path), 16000, 0.7)))
+            np.testing.assert_array_equal(streamed, piped)
+        print("[OK] ffmpeg PCM pipe matches soundfile + soxr")
+
+        # Containers libsndfile cannot read are decoded by ffmpeg, from a path or from memory
+        m4a = Path(tmp) / "call.m4a"
+        subprocess.run(
+            [ffmpeg.binary, "-hide_banner", "-loglevel", "error", "-i", str(Path(tmp) / "call.wav"), "-c:a", "aac", str(m4a)],
+            check=True,
+        )
+        from_path = load_audio(str(m4a)).samples
+        with AudioPayload(suffix=".m4a") as payload:
+            payload.write(m4a.read_bytes())
+            from_memory = load_audio(payload).samples
+        np.testing.assert_array_equal(from_memory, from_path)
+        assert abs(len(from_path) - len(reference)) < 0.1 * 16000
+        print("[OK] M4A decoded via ffmpeg")
+
+
+def test_undecodable_input_raises():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "garbage.mp3"
+        path.write_bytes(b"not audio at all" * 64)
+        try:
+            decode(str(path), 16000, decoder="soundfile")
+            raise AssertionError("garbage decoded")
+        except RuntimeError:
+            pass
+    print("[OK] Decode failures raise")
+
+
+if __name__ == "__main__":
+    test_auto_order()
+    test_ffmpeg_matches_soundfile()
+    test_undecodable_input_raises()
@@ -0,0 +1,98 @@
+"""Test decode-once audio sharing"""
+import base64
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import DecodedAudio, load_audio, payload_from_base64
+from features.extract import extract_features_from_wav
+
+
+def _synthetic_voice(seconds=4.0, sr=16000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 140 + 15 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 8))
+    y *= 0.5 + 0.5 * np.sin(2 * np.pi * 0.7 * t) ** 2
+    y += 0.01 * rng.standard_normal(len(t))
+    return (0.3 * y / np.max(np.abs(y))).astype(np.float32)
+
+
+def test_decode_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "voice.wav"
+        sf.write(wav_path, _synthetic_voice(), 16000, subtype="FLOAT")
+
+        audio = load_audio(wav_path)
+        assert isinstance(audio, DecodedAudio)
+        assert audio.sr == 16000
+        assert audio.samples.dtype == np.float32
+        print("[OK] Decoded: " + repr(audio))
+
+        # Already-decoded audio is passed through untouched
+        assert load_audio(audio) is audio
+
+        from_path = extract_features_from_wav(str(wav_path))
+        from_audio = extract_features_from_wav(audio)
+        assert from_path is not None and from_path.shape == (92,)
+        assert np.array_equal(from_path, from_audio)
+        print("[OK] Features identical from path and decoded audio")
+
+
+
+def test_base64_ingestion():
+    buf = io.BytesIO()
+    sf.write(buf, _synthetic_voice(), 16000, format="WAV", subtype="FLOAT")
+    encoded = "data:audio/wav;base64," + base64.b64encode(buf.getvalue()).decode()
+
+    # Small payload stays in memory
+    with payload_from_base64(encoded, suffix=".wav") as payload:
+        assert not payload.spilled
+        assert payload.size == len(buf.getvalue())
+        in_memory = load_audio(payload)
+    print("[OK] In-memory decode: " + repr(in_memory))
+
+    # Large payload spills to disk and the spill file is removed on close
+    with tempfile.TemporaryDirectory() as tmp:
+        with payload_from_base64(encoded, suffix=".wav", spill_threshold=1024, spill_dir=tmp) as payload:
+            assert payload.spilled
+            spill_path = payload.path
+            assert spill_path.exists()
+            spilled = load_audio(payload)
+        assert not spill_path.exists()
+        assert list(Path(tmp).iterdir()) == []
+    print("[OK] Spill file cleaned up")
+
+    assert np.array_equal(in_memory.samples, spilled.samples)
+
+
+def test_wrapped_base64():
+    # Long enough to span several decode slices
+    buf = io.BytesIO()
+    sf.write(buf, _synthetic_voice(seconds=4.0), 16000, format="WAV", subtype="FLOAT")
+    raw = buf.getvalue()
+
+    mime = base64.encodebytes(raw).decode()  # 76-column lines, "\n"-separated
+    crlf = mime.replace("\n", "\r\n")
+    noisy = "*".join(base64.b64encode(raw).decode()[i:i + 61] for i in range(0, len(raw) * 4 // 3, 61))
+    with payload_from_base64(base64.b64encode(raw).decode(), suffix=".wav") as payload:
+        reference = load_audio(payload).samples
+    for encoded in (mime, crlf, noisy):
+        with payload_from_base64(encoded, suffix=".wav") as payload:
+            assert payload.size == len(raw)
+            assert np.array_equal(load_audio(payload).samples, reference)
+    print("[OK] MIME-wrapped base64 decodes like the unwrapped string")
+
+
+if __name__ == "__main__":
+    test_decode_once()
+    test_base64_ingestion()
+    test_wrapped_base64()
@@ -0,0 +1,63 @@
+"""Test the two-stage cascade classifier"""
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import RandomForestClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from inference.cascade import CascadeModel, cascade_report, train_fast_model
+from inference.compiled_forest import CompiledForest
+from inference.predict import _check_cascade_band
+
+
+def _data(n, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 92)).astype(np.float32)
+    y = (2 * X[:, 0] + X[:, 3] * X[:, 4] + 0.5 * rng.normal(size=n) > 0).astype(int)
+    return X, y
+
+
+def test_cascade_escalates_only_the_band():
+    X, y = _data(1200, 0)
+    X_test, y_test = _data(400, 1)
+    full = CalibratedClassifierCV(RandomForestClassifier(n_estimators=60, random_state=0), method="sigmoid", cv=5).fit(X, y)
+    fast = CompiledForest.from_sklearn(train_fast_model(X, y))
+
+    cascade = CascadeModel(fast, full, band=(0.3, 0.9))
+    proba = cascade.predict_proba(X_test)
+    fast_proba, full_proba = fast.predict_proba(X_test), full.predict_proba(X_test)
+    escalated = (fast_proba[:, 1] >= 0.3) & (fast_proba[:, 1] < 0.9)
+
+    np.testing.assert_array_equal(proba[escalated], full_proba[escalated])
+    np.testing.assert_array_equal(proba[~escalated], fast_proba[~escalated])
+    assert cascade.escalation_rate == escalated.mean() < 1.0
+    print(f"[OK] {escalated.mean():.0%} of clips escalated to the full model")
+
+    # Band covering everything = the full model
+    np.testing.assert_array_equal(CascadeModel(fast, full, band=(0.0, 1.0)).predict_proba(X_test), full_proba)
+
+    rows = cascade_report(fast, full, X_test, y_test, bands=((0.3, 0.9), (0.1, 0.95)), ai_threshold=0.6)
+    assert rows[0]["escalation_rate"] <= rows[1]["escalation_rate"]
+    for row in rows:
+        assert abs(row["accuracy_delta"] - (row["cascade_accuracy"] - row["full_accuracy"])) < 1e-12
+        print(f"[OK] band {row['band']}: escalated {row['escalation_rate']:.0%}, accuracy delta {row['accuracy_delta']:+.3f}")
+
+
+def test_band_must_cover_ai_likely():
+    _check_cascade_band((0.3, 0.9))
+    for band in ((0.65, 0.9), (0.3, 0.75)):
+        try:
+            _check_cascade_band(band)
+            raise AssertionError(f"band {band} accepted")
+        except ValueError:
+            pass
+    print("[OK] Bands that would let the fast model decide AI_LIKELY are rejected")
+
+
+if __name__ == "__main__":
+    test_cascade_escalates_only_the_band()
+    test_band_must_cover_ai_likely()
@@ -0,0 +1,63 @@
+"""Test the compiled forest evaluator against the sklearn model it was exported from"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import RandomForestClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from inference.compiled_forest import CompiledForest, compile_model
+
+
+def _data(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 92)).astype(np.float32)
+    y = (X[:, 0] + X[:, 5] * X[:, 7] + rng.normal(size=n) > 0).astype(int)
+    return X, y
+
+
+def test_matches_calibrated_forest():
+    X, y = _data()
+    base = RandomForestClassifier(n_estimators=40, class_weight="balanced", random_state=42)
+    model = CalibratedClassifierCV(base, method="sigmoid", cv=5).fit(X, y)
+    model.feature_config_ = {"pitch_mode": "fast"}
+
+    X_test, _ = _data(200, seed=1)
+    # Training rows sit exactly next to split thresholds, exercising the <= comparison
+    for rows in (X_test, X[:200], X_test[:1]):
+        np.testing.assert_allclose(CompiledForest.from_sklearn(model).predict_proba(rows), model.predict_proba(rows), rtol=0, atol=1e-12)
+
+    bare = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+    np.testing.assert_allclose(CompiledForest.from_sklearn(bare).predict_proba(X_test), bare.predict_proba(X_test), atol=1e-12)
+    print("[OK] Compiled probabilities match sklearn (calibrated and bare forest)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl, compiled_path = Path(tmp) / "model.pkl", Path(tmp) / "model_compiled.joblib"
+        joblib.dump(model, pkl)
+        compile_model(pkl, compiled_path)
+
+        loaded = CompiledForest.load(compiled_path)
+        assert loaded.feature_config_ == {"pitch_mode": "fast"}
+        np.testing.assert_allclose(loaded.predict_proba(X_test), model.predict_proba(X_test), atol=1e-12)
+
+        # Loading and predicting must not pull in sklearn
+        code = (
+            "import sys; sys.path.insert(0, %r);"
+            "import numpy as np;"
+            "from inference.compiled_forest import CompiledForest;"
+            "m = CompiledForest.load(%r);"
+            "m.predict_proba(np.zeros((1, 92), dtype=np.float32));"
+            "assert 'sklearn' not in sys.modules, 'sklearn imported'"
+        ) % (str(PROJECT_ROOT), str(compiled_path))
+        subprocess.run([sys.executable, "-c", code], check=True)
+    print("[OK] Compiled model round-trips without sklearn")
+
+
+if __name__ == "__main__":
+    test_matches_calibrated_forest()
@@ -0,0 +1,49 @@
+"""Test the per-worker CPU budget"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import RandomForestClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from serving.cpu_budget import configure_model_threads, cpu_budget
+
+_BUDGET_ENV = ("WEB_CONCURRENCY", "WORKER_CPU_THREADS", "WHISPER_CPU_THREADS", "MODEL_N_JOBS", "BLAS_THREADS")
+
+
+def test_budget_from_environment():
+    saved = {name: os.environ.pop(name, None) for name in _BUDGET_ENV}
+    try:
+        cores = os.cpu_count() or 1
+        assert cpu_budget() == {"worker_threads": cores, "whisper_threads": cores, "model_jobs": 1, "blas_threads": 1}
+
+        os.environ["WEB_CONCURRENCY"] = str(cores * 2)
+        assert cpu_budget()["worker_threads"] == 1  # never below one thread
+
+        os.environ.update(WORKER_CPU_THREADS="6", MODEL_N_JOBS="2")
+        assert cpu_budget() == {"worker_threads": 6, "whisper_threads": 6, "model_jobs": 2, "blas_threads": 1}
+    finally:
+        for name, value in saved.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+    print("[OK] Budget follows WEB_CONCURRENCY / WORKER_CPU_THREADS overrides")
+
+
+def test_model_threads_override_training_n_jobs():
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(60, 4)), np.tile([0, 1], 30)
+    model = CalibratedClassifierCV(RandomForestClassifier(n_estimators=5, n_jobs=-1), cv=2).fit(X, y)
+
+    configure_model_threads(model, n_jobs=1)
+    assert all(c.estimator.n_jobs == 1 for c in model.calibrated_classifiers_)
+    print("[OK] Loaded forest no longer uses n_jobs=-1")
+
+
+if __name__ == "__main__":
+    test_budget_from_environment()
+    test_model_threads_override_training_n_jobs()
@@ -0,0 +1,77 @@
+"""Parity test: NumPy feature backend vs librosa backend"""
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import librosa
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import DecodedAudio
+from features import dsp
+from features.extract import extract_features_from_wav
+from test_audio_io import _synthetic_voice
+
+
+def _padded_voice(seed):
+    # Leading/trailing near-silence so trimming is exercised too
+    rng = np.random.default_rng(seed)
+    pad = (1e-4 * rng.standard_normal(8000)).astype(np.float32)
+    return np.concatenate([pad, _synthetic_voice(seconds=5.0, seed=seed), pad])
+
+
+def test_primitives_match_librosa():
+    sr = 16000
+    y = _padded_voice(11)
+
+    np.testing.assert_array_equal(dsp.trim(y, top_db=25)[1], librosa.effects.trim(y, top_db=25)[1])
+    y, _ = librosa.effects.trim(y, top_db=25)
+
+    S = dsp.stft_magnitude(y)
+    np.testing.assert_allclose(S, np.abs(librosa.stft(y)), rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(dsp.mel_filters(sr), librosa.filters.mel(sr=sr, n_fft=2048), rtol=1e-6, atol=1e-9)
+
+    mfcc = dsp.mfcc(S ** 2, sr)
+    np.testing.assert_allclose(mfcc, librosa.feature.mfcc(S=librosa.power_to_db(librosa.feature.melspectrogram(S=S ** 2, sr=sr))), rtol=1e-4, atol=1e-3)
+    np.testing.assert_allclose(dsp.delta(mfcc, order=2), librosa.feature.delta(mfcc, order=2), rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(dsp.spectral_flatness(S), librosa.feature.spectral_flatness(S=S), rtol=1e-5)
+    np.testing.assert_allclose(dsp.rms(y), librosa.feature.rms(y=y)[0], rtol=1e-5)
+    np.testing.assert_array_equal(dsp.zero_crossing_rate(y), librosa.feature.zero_crossing_rate(y)[0])
+
+    pitches, mags = dsp.piptrack(S, sr)
+    ref_pitches, ref_mags = librosa.piptrack(S=S, sr=sr)
+    np.testing.assert_allclose(pitches, ref_pitches, rtol=1e-5, atol=1e-3)
+    np.testing.assert_allclose(mags, ref_mags, rtol=1e-5, atol=1e-6)
+    print("[OK] trim, STFT, mel, MFCC, delta, flatness, RMS, ZCR, piptrack match librosa")
+
+
+def test_feature_vector_parity():
+    for seed in range(3):
+        audio = DecodedAudio(_padded_voice(seed))
+        for pitch_mode in ("piptrack", "fast"):
+            reference = extract_features_from_wav(audio, pitch_mode=pitch_mode, backend="librosa")
+            lite = extract_features_from_wav(audio, pitch_mode=pitch_mode, backend="numpy")
+            np.testing.assert_allclose(lite, reference, rtol=1e-3, atol=1e-3)
+    print("[OK] 92-dim vectors match between backends")
+
+
+def test_numpy_backend_never_imports_librosa():
+    code = (
+        "import sys, numpy as np;"
+        "sys.path.insert(0, %r);"
+        "from audio_io import DecodedAudio;"
+        "from features.extract import extract_features_from_wav;"
+        "from test_audio_io import _synthetic_voice;"
+        "assert extract_features_from_wav(DecodedAudio(_synthetic_voice()), backend='numpy') is not None;"
+        "assert 'librosa' not in sys.modules, 'librosa imported'"
+    ) % str(PROJECT_ROOT)
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=PROJECT_ROOT)
+    print("[OK] numpy backend runs without importing librosa")
+
+
+if __name__ == "__main__":
+    test_primitives_match_librosa()
+    test_feature_vector_parity()
+    test_numpy_backend_never_imports_librosa()
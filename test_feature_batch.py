@@ -0,0 +1,49 @@
+"""Test batched, multi-process feature extraction"""
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import DecodedAudio
+from features.extract import N_FEATURES, extract_features_batch, extract_features_from_wav
+from test_audio_io import _synthetic_voice
+
+
+def test_batch_order_and_mask():
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "voice.wav"
+        sf.write(wav_path, _synthetic_voice(seed=3), 16000, subtype="FLOAT")
+
+        items = [
+            str(wav_path),
+            DecodedAudio(_synthetic_voice(seed=4)),
+            _synthetic_voice(seconds=0.5),          # too short after trimming
+            str(Path(tmp) / "missing.wav"),         # cannot be decoded
+            _synthetic_voice(seed=5),
+        ]
+
+        X, valid = extract_features_batch(items, n_jobs=2)
+
+        assert X.shape == (len(items), N_FEATURES)
+        assert X.dtype == np.float32
+        assert valid.tolist() == [True, True, False, False, True]
+        assert not X[~valid].any()
+        print("[OK] Validity mask: " + str(valid.tolist()))
+
+        for item, row in zip([items[0], items[1], DecodedAudio(items[4])], X[valid]):
+            np.testing.assert_array_equal(row, extract_features_from_wav(item))
+        print("[OK] Rows match single-file extraction, input order preserved")
+
+        X_serial, valid_serial = extract_features_batch(items, n_jobs=1)
+        np.testing.assert_array_equal(X, X_serial)
+        np.testing.assert_array_equal(valid, valid_serial)
+        print("[OK] Process pool matches serial run")
+
+
+if __name__ == "__main__":
+    test_batch_order_and_mask()
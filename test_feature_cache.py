@@ -0,0 +1,69 @@
+"""Test the content-addressed feature cache"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import features.extract as extract
+from features.cache import FeatureCache
+from test_audio_io import _synthetic_voice
+
+
+def test_cache_hit_skips_extraction():
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "voice.wav"
+        sf.write(wav_path, _synthetic_voice(seed=7), 16000, subtype="FLOAT")
+        short_path = Path(tmp) / "short.wav"
+        sf.write(short_path, _synthetic_voice(seconds=0.5), 16000, subtype="FLOAT")
+
+        os.environ["FEATURE_CACHE_DIR"] = str(Path(tmp) / "cache")
+        try:
+            first = extract.extract_features_from_wav(str(wav_path))
+            assert extract.extract_features_from_wav(str(short_path)) is None
+
+            # A hit must not decode or extract again
+            original = extract._extract_uncached
+            extract._extract_uncached = lambda *a, **k: (_ for _ in ()).throw(AssertionError("cache miss"))
+            try:
+                second = extract.extract_features_from_wav(str(wav_path))
+                assert extract.extract_features_from_wav(str(short_path)) is None
+            finally:
+                extract._extract_uncached = original
+
+            np.testing.assert_array_equal(first, second)
+            print("[OK] Cache hit returns identical features without extraction")
+
+            # A different feature config is a different entry
+            fast = extract.extract_features_from_wav(str(wav_path), pitch_mode="fast")
+            assert not np.array_equal(fast, first)
+            print("[OK] Pitch mode is part of the key")
+        finally:
+            del os.environ["FEATURE_CACHE_DIR"]
+
+
+def test_cache_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FeatureCache(tmp, max_bytes=2000)
+        vector = np.arange(92, dtype=np.float32)
+        keys = [FeatureCache.key(f"hash{i}", {"version": 1}) for i in range(10)]
+        for i, key in enumerate(keys):
+            cache.put(key, vector + i)
+            os.utime(cache._path(key), (i, i))  # deterministic LRU order
+
+        total = sum(p.stat().st_size for p in Path(tmp).glob("*/*.npy"))
+        assert total <= 2000
+        hit, value = cache.get(keys[-1])
+        assert hit and np.array_equal(value, vector + 9)
+        assert cache.get(keys[0]) == (False, None)
+        print(f"[OK] Evicted down to {total} bytes, newest entry kept")
+
+
+if __name__ == "__main__":
+    test_cache_hit_skips_extraction()
+    test_cache_eviction()
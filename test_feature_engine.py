@@ -0,0 +1,90 @@
+"""Test the shared-STFT feature engine against per-feature librosa calls"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import librosa
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import DecodedAudio
+from features.extract import N_FFT, extract_features_from_wav
+from features.pitch import fast_pitch
+from test_audio_io import _synthetic_voice
+
+
+def _reference_features(y, sr=16000):
+    # Original extractor: every librosa feature computes its own STFT
+    y, _ = librosa.effects.trim(y, top_db=25)
+    features = []
+
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=20)
+    features.extend(np.mean(mfcc, axis=1))
+    features.extend(np.std(mfcc, axis=1))
+    features.extend(np.mean(librosa.feature.delta(mfcc), axis=1))
+    features.extend(np.mean(librosa.feature.delta(mfcc, order=2), axis=1))
+
+    spec_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
+    features.extend([
+        np.mean(spec_centroid),
+        np.std(spec_centroid),
+        np.mean(librosa.feature.spectral_bandwidth(y=y, sr=sr)),
+        np.mean(librosa.feature.spectral_flatness(y=y)),
+        np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)),
+    ])
+
+    pitches, mags = librosa.piptrack(y=y, sr=sr)
+    pitch_vals = pitches[mags > np.percentile(mags, 75)]
+    pitch_vals = pitch_vals[pitch_vals > 0]
+    features.extend([np.mean(pitch_vals), np.std(pitch_vals)] if len(pitch_vals) else [0.0, 0.0])
+
+    rms = librosa.feature.rms(y=y)
+    features.extend([np.mean(rms), np.std(rms), np.percentile(rms, 90) - np.percentile(rms, 10)])
+
+    zcr = librosa.feature.zero_crossing_rate(y)
+    features.extend([np.mean(zcr), np.std(zcr)])
+
+    return np.array(features, dtype=np.float32)
+
+
+def test_shared_stft_matches_reference():
+    audio = DecodedAudio(_synthetic_voice(seconds=6.0, seed=1))
+
+    t0 = time.perf_counter()
+    reference = _reference_features(audio.samples)
+    t1 = time.perf_counter()
+    engine = extract_features_from_wav(audio)
+    t2 = time.perf_counter()
+
+    assert engine.shape == reference.shape == (92,)
+    np.testing.assert_allclose(engine, reference, rtol=1e-5, atol=1e-6)
+    print("[OK] 92-dim vector matches reference")
+    print(f"[OK] reference {1000 * (t1 - t0):.1f} ms, shared STFT {1000 * (t2 - t1):.1f} ms")
+
+
+
+def test_fast_pitch_mode():
+    sr = 16000
+    t = np.arange(3 * sr) / sr
+    for f0 in (90.0, 150.0, 260.0):
+        y = np.sin(2 * np.pi * f0 * t) + 0.5 * np.sin(4 * np.pi * f0 * t)
+        power = np.abs(librosa.stft(y.astype(np.float32), n_fft=N_FFT)) ** 2
+        estimate = np.median(fast_pitch(power, sr, N_FFT))
+        assert abs(estimate - f0) < 1.0, (f0, estimate)
+        print(f"[OK] {f0:.0f} Hz tone -> {estimate:.2f} Hz")
+
+    audio = DecodedAudio(_synthetic_voice(seconds=6.0, seed=1))
+    slow = extract_features_from_wav(audio, pitch_mode="piptrack")
+    fast = extract_features_from_wav(audio, pitch_mode="fast")
+    assert fast.shape == (92,)
+    # Only the two pitch statistics differ between modes
+    np.testing.assert_array_equal(np.delete(fast, [85, 86]), np.delete(slow, [85, 86]))
+    assert abs(fast[85] - 140.0) < 5.0
+    print(f"[OK] fast pitch mean/std: {fast[85]:.1f} / {fast[86]:.1f} Hz")
+
+
+if __name__ == "__main__":
+    test_shared_stft_matches_reference()
+    test_fast_pitch_mode()
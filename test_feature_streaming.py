@@ -0,0 +1,113 @@
+"""Test bounded-memory streaming extraction against the in-memory extractor"""
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import soxr
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import features.extract as extract
+from audio_io import DecodedAudio, iter_audio_blocks, load_audio
+from features import dsp
+from features.streaming import _trim_bounds, extract_features_streaming
+from test_audio_io import _synthetic_voice
+
+
+def _long_call(seed=0):
+    # Two talk spurts separated by a pause, with quiet lead-in/out to trim
+    rng = np.random.default_rng(seed)
+    quiet = (1e-4 * rng.standard_normal(20000)).astype(np.float32)
+    return np.concatenate([
+        quiet,
+        _synthetic_voice(seconds=12.0, seed=seed),
+        0.5 * quiet,
+        _synthetic_voice(seconds=9.0, seed=seed + 1),
+        quiet,
+    ])
+
+
+def test_streaming_matches_in_memory():
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "call.wav"
+        y = _long_call()
+        # 44.1 kHz stereo so block-wise resampling and downmixing are exercised
+        stereo = np.stack([y, y], axis=1)
+        sf.write(wav_path, soxr.resample(stereo, 16000, 44100), 44100, subtype="FLOAT")
+
+        decoded = load_audio(str(wav_path)).samples
+        blocks = list(iter_audio_blocks(str(wav_path), block_seconds=3.7))
+        np.testing.assert_array_equal(np.concatenate(blocks), decoded)
+
+        # Odd block size so frames straddle block boundaries
+        start, end = _trim_bounds(iter(blocks), 25)
+        np.testing.assert_array_equal([start, end], dsp.trim(decoded, top_db=25)[1])
+
+        for pitch_mode in ("piptrack", "fast"):
+            reference = extract.extract_features_from_wav(str(wav_path), pitch_mode=pitch_mode, backend="numpy")
+            streamed = extract_features_streaming(str(wav_path), pitch_mode=pitch_mode, block_seconds=3.7)
+            np.testing.assert_allclose(streamed, reference, rtol=5e-4, atol=1e-5)
+        print("[OK] Streaming features match the in-memory extractor")
+
+
+def test_long_files_are_streamed():
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "call.wav"
+        sf.write(wav_path, _long_call(seed=3), 16000, subtype="FLOAT")
+
+        original_threshold, original_load = extract.STREAMING_MIN_SECONDS, extract.load_audio
+        extract.STREAMING_MIN_SECONDS = 10.0
+        extract.load_audio = lambda *a, **k: (_ for _ in ()).throw(AssertionError("decoded whole file"))
+        try:
+            features = extract.extract_features_from_wav(str(wav_path), backend="numpy")
+        finally:
+            extract.STREAMING_MIN_SECONDS, extract.load_audio = original_threshold, original_load
+
+        reference = extract.extract_features_from_wav(str(wav_path), backend="numpy")
+        np.testing.assert_allclose(features, reference, rtol=5e-4, atol=1e-5)
+        print("[OK] Files over FEATURE_STREAMING_SECONDS are never decoded whole")
+
+
+def test_short_last_blocks():
+    # The last block (or the resampler tail) is shorter than one frame
+    y = np.concatenate([_long_call(seed=5), _synthetic_voice(seconds=0.5, seed=7)])[:320100]
+    with tempfile.TemporaryDirectory() as tmp:
+        odd_path = Path(tmp) / "odd.wav"
+        sf.write(odd_path, y, 16000, subtype="FLOAT")
+        resampled_path = Path(tmp) / "call_44k.wav"
+        sf.write(resampled_path, soxr.resample(y, 16000, 44100), 44100, subtype="FLOAT")
+
+        for path in (odd_path, resampled_path):
+            blocks = [len(b) for b in iter_audio_blocks(str(path), block_seconds=10.0)]
+            assert min(blocks) < dsp.N_FFT, blocks
+            reference = extract.extract_features_from_wav(str(path), backend="numpy")
+            streamed = extract_features_streaming(str(path), block_seconds=10.0)
+            assert streamed is not None
+            np.testing.assert_allclose(streamed, reference, rtol=5e-4, atol=1e-5)
+    print("[OK] Short trailing blocks are buffered, not dropped as invalid audio")
+
+
+def test_long_decoded_audio_is_streamed():
+    audio = DecodedAudio(_long_call(seed=9))
+    reference = extract.extract_features_from_wav(audio, backend="numpy")
+
+    original_threshold, original_compute = extract.STREAMING_MIN_SECONDS, extract._compute_features
+    extract.STREAMING_MIN_SECONDS = 10.0
+    extract._compute_features = lambda *a, **k: (_ for _ in ()).throw(AssertionError("whole-clip STFT"))
+    try:
+        features = extract.extract_features_from_wav(audio, backend="numpy")
+    finally:
+        extract.STREAMING_MIN_SECONDS, extract._compute_features = original_threshold, original_compute
+
+    np.testing.assert_allclose(features, reference, rtol=5e-4, atol=1e-5)
+    print("[OK] Long in-memory audio goes through the block-wise extractor")
+
+
+if __name__ == "__main__":
+    test_streaming_matches_in_memory()
+    test_long_files_are_streamed()
+    test_short_last_blocks()
+    test_long_decoded_audio_is_streamed()
@@ -0,0 +1,125 @@
+"""Test caller-supplied language and per-language Whisper model routing"""
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import stt.models as models
+import stt.transcribe as transcribe
+from audio_io import DecodedAudio
+from conftest import FakeWhisper
+from test_audio_io import _synthetic_voice
+
+
+def test_routes():
+    assert models.parse_routes(" en=base.en, te=medium:int8_float16,") == {
+        "en": ("base.en", "int8"),
+        "te": ("medium", "int8_float16"),
+    }
+    try:
+        models.parse_routes("en")
+        raise AssertionError("malformed route accepted")
+    except ValueError:
+        pass
+
+    assert models.estimate_mb("base.en") == 145
+    assert models.estimate_mb("large-v3", "float16") == 6200
+    assert models.estimate_mb("Systran/faster-distil-whisper-small.en") == 480
+    print("[OK] Route table parsing and model size estimates")
+
+
+def test_pool_stays_within_budget():
+    loads = []
+    pool = models.WhisperModelPool(budget_mb=2000, loader=lambda name, ct: loads.append(name) or name)
+
+    assert pool.get("medium") == "medium" and pool.get("small") == "small"  # 1500 + 480
+    assert pool.get("medium") == "medium" and loads == ["medium", "small"]  # cached, now most recent
+    pool.get("base")  # 1980 + 145 > 2000: least recently used (small) goes
+    assert pool.loaded == [("medium", "int8"), ("base", "int8")] and pool.used_mb <= 2000
+    pool.get("small")
+    assert pool.loaded == [("base", "int8"), ("small", "int8")]
+    print("[OK] Routed models load lazily and the LRU stays within the memory budget")
+
+
+def test_routing_is_opt_in_and_bounded(monkeypatch):
+    monkeypatch.delenv("WHISPER_MODEL_ROUTES", raising=False)
+    monkeypatch.setenv("WHISPER_MODEL", "medium")
+    monkeypatch.setenv("WHISPER_MEMORY_BUDGET_MB", "2048")
+    assert models.model_route("en") == models.model_route("ta") == ("medium", "int8")
+
+    # A route the budget cannot hold falls back to the default model
+    monkeypatch.setenv("WHISPER_MODEL_ROUTES", "en=small.en,te=large-v3")
+    assert models.model_route("en") == ("small.en", "int8")
+    assert models.model_route("te") == ("medium", "int8")
+
+    pool = models.WhisperModelPool(budget_mb=1000, loader=lambda name, ct: name)
+    with pytest.raises(ValueError):
+        pool.get("medium")
+    assert pool.loaded == []
+    print("[OK] Routing is off by default and never exceeds the memory budget")
+
+
+def test_pool_loads_outside_the_lock():
+    started, release = threading.Event(), threading.Event()
+    loads = []
+
+    def loader(name, compute_type):
+        loads.append(name)
+        if name == "medium":
+            started.set()
+            release.wait(5)
+        return name
+
+    pool = models.WhisperModelPool(budget_mb=4000, loader=loader)
+    pool.get("small")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get("medium"))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    assert started.wait(5)
+
+    # A loaded model is served while another one is still loading
+    assert pool.get("small") == "small" and pool.loaded == [("small", "int8")]
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == ["medium"] * 3 and loads == ["small", "medium"]  # loaded once
+    print("[OK] Models load outside the pool lock, once per key")
+
+
+def test_caller_language_routes_model(fake_whisper, monkeypatch):
+    default = fake_whisper(segments=[(0.0, 2.0, " small")])
+    monkeypatch.setenv("WHISPER_MODEL_ROUTES", "en=base.en,te=medium")
+    monkeypatch.setenv("TRANSCRIPT_CACHE_ENTRIES", "8")
+    monkeypatch.setenv("WHISPER_MEMORY_BUDGET_MB", "4000")
+    routed = {}
+    pool = models.WhisperModelPool(4000, loader=lambda name, ct: routed.setdefault(name, FakeWhisper([(0.0, 2.0, f" {name}")])))
+    monkeypatch.setattr(models, "_POOLS", {4000.0: pool})
+    audio = DecodedAudio(_synthetic_voice(seconds=3.0, seed=21))
+
+    result = transcribe.transcribe_clip(audio, language="Telugu")
+    assert result.text == "medium" and result.language_name == "Telugu"
+    assert routed["medium"].calls[0]["language"] == "te"  # no detection
+
+    assert transcribe.transcribe_clip(audio, language="en").text == "base.en"
+    # Tamil is not routed: default model, language still fixed
+    assert transcribe.transcribe_clip(audio, language="tamil").text == "small"
+    assert default.calls[-1]["language"] == "ta"
+    # Unknown language: default model auto-detects
+    assert transcribe.transcribe_clip(audio).text == "small" and default.calls[-1]["language"] is None
+
+    # Each language has its own cache entry
+    assert transcribe.transcribe_clip(audio, language="te").text == "medium"
+    assert len(routed["medium"].calls) == 1
+
+    with pytest.raises(ValueError):
+        transcribe.transcribe_clip(audio, language="klingon")
+    print("[OK] Caller-supplied language skips detection and picks the routed model")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,60 @@
+"""Test model preloading from an absolute, configurable artifact path"""
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from inference.compiled_forest import compile_model
+
+_CHECK = """
+import sys
+sys.path.insert(0, {root!r})
+import numpy as np
+import inference.predict as predict
+model = predict.preload_models()
+print(type(model).__name__, type(getattr(model, "threshold", None)).__name__)
+"""
+
+
+def _preload(model_path, cwd, **env):
+    result = subprocess.run(
+        [sys.executable, "-c", _CHECK.format(root=str(PROJECT_ROOT))],
+        cwd=cwd, env={**os.environ, "MODEL_PATH": str(model_path), **env},
+        capture_output=True, text=True, check=True,
+    )
+    return result.stdout.split()
+
+
+def test_preload_from_model_path():
+    rng = np.random.default_rng(0)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(rng.normal(size=(40, 92)), np.tile([0, 1], 20))
+
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as elsewhere:
+        model_path = Path(tmp) / "voice" / "model.pkl"
+        model_path.parent.mkdir()
+        joblib.dump(model, model_path)
+
+        # Only the pickle: loaded as-is, from any working directory
+        assert _preload(model_path, elsewhere) == ["RandomForestClassifier", "NoneType"]
+
+        # Compiled export next to it is preferred and memory-mapped
+        compile_model(model_path, model_path.with_name("model_compiled.joblib"))
+        assert _preload(model_path, elsewhere) == ["CompiledForest", "memmap"]
+        assert _preload(model_path, elsewhere, MODEL_MMAP_MODE="") == ["CompiledForest", "ndarray"]
+
+        # A pickle newer than its export wins
+        os.utime(model_path.with_name("model_compiled.joblib"), (0, 0))
+        assert _preload(model_path, elsewhere)[0] == "RandomForestClassifier"
+    print("[OK] MODEL_PATH is honoured and compiled models are memory-mapped")
+
+
+if __name__ == "__main__":
+    test_preload_from_model_path()
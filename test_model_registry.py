@@ -0,0 +1,123 @@
+"""Test the versioned model registry and hot model swapping"""
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import inference.predict as predict
+from inference import registry
+from inference.compiled_forest import compile_model
+
+
+def _forest(tmp, name, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(60, 92))
+    model = RandomForestClassifier(n_estimators=5, random_state=seed).fit(X, (X[:, 0] > 0).astype(int))
+    path = Path(tmp) / name / "model.pkl"
+    path.parent.mkdir()
+    joblib.dump(model, path)
+    compile_model(path, path.with_name("model_compiled.joblib"))
+    return [path, path.with_name("model_compiled.joblib")]
+
+
+def test_publish_activate_verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "registry"
+        files = _forest(tmp, "a", 0)
+
+        assert registry.current_version("voice", root) is None
+        v1 = registry.publish("voice", files, {"extractor_version": 2}, version="v1", registry_dir=root)
+        v2 = registry.publish("voice", files, version="v2", activate_version=False, registry_dir=root)
+        assert registry.current_version("voice", root) == "v1"
+        assert registry.list_versions("voice", root) == ["v1", "v2"]
+        assert v1.entrypoint.name == "model.pkl" and v1.feature_config == {"extractor_version": 2}
+
+        registry.activate("voice", "v2", root)
+        assert registry.resolve("voice", registry_dir=root).version == "v2"
+
+        # A tampered artifact is refused
+        (v2.path / "model_compiled.joblib").write_bytes(b"truncated")
+        try:
+            registry.resolve("voice", registry_dir=root)
+            raise AssertionError("checksum mismatch accepted")
+        except ValueError:
+            pass
+
+        try:
+            registry.publish("voice", files, version="v1", registry_dir=root)
+            raise AssertionError("version overwritten")
+        except FileExistsError:
+            pass
+        manifest = json.loads((v1.path / registry.MANIFEST).read_text())
+        assert set(manifest["files"]) == {"model.pkl", "model_compiled.joblib"}
+    print("[OK] Publish, activate and checksum verification")
+
+
+def test_hot_swap_between_requests():
+    original = (registry.REGISTRY_DIR, predict._MODEL_CACHE, predict._WATCHER.version)
+    with tempfile.TemporaryDirectory() as tmp:
+        registry.REGISTRY_DIR = Path(tmp) / "registry"
+        config = registry.default_feature_config("voice")
+        try:
+            registry.publish("voice", _forest(tmp, "a", 0), config, version="v1")
+            predict._MODEL_CACHE = None
+            served = predict.preload_models()
+            assert predict._WATCHER.version == "v1"
+            assert not predict._WATCHER.poll()
+
+            # In-flight requests keep their reference; the next request sees v2
+            registry.publish("voice", _forest(tmp, "b", 1), config, version="v2")
+            assert predict._WATCHER.poll()
+            assert predict._load_current() is not served
+            assert predict._WATCHER.version == "v2"
+
+            # Incompatible feature config: rejected, v2 keeps serving
+            live = predict._load_current()
+            registry.publish("voice", _forest(tmp, "c", 2), {**config, "extractor_version": -1}, version="v3")
+            assert not predict._WATCHER.poll()
+            assert predict._load_current() is live and predict._WATCHER.version == "v2"
+
+            # Rolling back is just moving CURRENT
+            registry.activate("voice", "v1")
+            assert predict._WATCHER.poll() and predict._WATCHER.version == "v1"
+        finally:
+            registry.REGISTRY_DIR, predict._MODEL_CACHE, predict._WATCHER.version = original
+    print("[OK] New versions are loaded off the request path and swapped atomically")
+
+
+def test_bad_current_at_startup():
+    watcher = predict._WATCHER
+    original = (registry.REGISTRY_DIR, predict._MODEL_CACHE, watcher.version, watcher._rejected, predict.MODEL_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        registry.REGISTRY_DIR = Path(tmp) / "registry"
+        config = registry.default_feature_config("voice")
+        try:
+            # CURRENT names a version built for other features: the newest good one serves
+            registry.publish("voice", _forest(tmp, "a", 0), config, version="v1")
+            registry.publish("voice", _forest(tmp, "b", 1), {**config, "extractor_version": -1}, version="v2")
+            predict._MODEL_CACHE = None
+            model = predict.preload_models()
+            assert model is not None and predict._WATCHER.version == "v1"
+            assert not predict._WATCHER.poll()  # v2 is not retried until CURRENT moves
+
+            # No version loads: MODEL_PATH serves
+            (registry.REGISTRY_DIR / "voice" / "v1" / "model.pkl").write_bytes(b"corrupt")
+            predict.MODEL_PATH = str(_forest(tmp, "fallback", 2)[0])
+            predict._MODEL_CACHE = None
+            assert predict.preload_models() is not None
+        finally:
+            registry.REGISTRY_DIR, predict._MODEL_CACHE, watcher.version, watcher._rejected, predict.MODEL_PATH = original
+    print("[OK] A bad CURRENT at startup falls back to a loadable model")
+
+
+if __name__ == "__main__":
+    test_publish_activate_verify()
+    test_hot_swap_between_requests()
+    test_bad_current_at_startup()
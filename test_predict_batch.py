@@ -0,0 +1,72 @@
+"""Test batched voice classification against per-file predict_audio"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import RandomForestClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import inference.predict as predict
+from audio_io import DecodedAudio
+from features.extract import extract_features_batch
+from test_audio_io import _synthetic_voice
+
+
+def _toy_model(clips):
+    # Calibrated forest fitted on the clips' own features, so predictions span all labels
+    X, _ = extract_features_batch(clips)
+    rng = np.random.default_rng(0)
+    X = np.repeat(X, 10, axis=0) + rng.normal(scale=0.05, size=(len(X) * 10, X.shape[1])).astype(np.float32)
+    y = rng.integers(0, 2, len(X))
+    model = CalibratedClassifierCV(RandomForestClassifier(n_estimators=20, random_state=0), method="sigmoid", cv=3)
+    return model.fit(X, y)
+
+
+def test_batch_matches_single():
+    clips = [DecodedAudio(_synthetic_voice(seconds=3.0, seed=seed)) for seed in range(6)]
+    items = clips + [DecodedAudio(_synthetic_voice(seconds=0.5)), _synthetic_voice(seconds=3.0, seed=9)]
+
+    original = predict._MODEL_CACHE
+    predict._MODEL_CACHE = _toy_model(clips)
+    try:
+        start = time.perf_counter()
+        single = [predict.predict_audio(item if not isinstance(item, np.ndarray) else DecodedAudio(item)) for item in items]
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = predict.predict_audio_batch(items, n_jobs=2)
+        batch_time = time.perf_counter() - start
+    finally:
+        predict._MODEL_CACHE = original
+
+    assert batch == single
+    assert batch[6] == {"result": "INVALID_AUDIO", "confidence": 0.0}
+    print(f"[OK] Batch labels match predict_audio ({single_time:.2f}s single vs {batch_time:.2f}s batch)")
+
+
+def test_batch_matches_single_in_segments_mode():
+    clips = [DecodedAudio(_synthetic_voice(seconds=3.0, seed=seed)) for seed in range(4)]
+    long_call = DecodedAudio(np.concatenate([_synthetic_voice(seconds=5.0, seed=seed) for seed in range(3)]))
+    items = clips + [long_call]
+
+    original = predict._MODEL_CACHE, predict.SCORING_MODE
+    predict._MODEL_CACHE = _toy_model(clips)
+    predict.SCORING_MODE = "segments"
+    try:
+        single = [predict.predict_audio(item) for item in items]
+        batch = predict.predict_audio_batch(items, n_jobs=1)
+    finally:
+        predict._MODEL_CACHE, predict.SCORING_MODE = original
+
+    assert batch == single
+    assert "segments" in batch[-1] and all("segments" not in result for result in batch[:-1])
+    print("[OK] Batch scores long clips window by window in segments mode")
+
+
+if __name__ == "__main__":
+    test_batch_matches_single()
+    test_batch_matches_single_in_segments_mode()
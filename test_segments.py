@@ -0,0 +1,110 @@
+"""Test windowed segment scoring"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import inference.predict as predict
+from audio_io import DecodedAudio
+from inference.segments import predict_audio_segments, split_segments
+from test_audio_io import _synthetic_voice
+from test_predict_batch import _toy_model
+
+
+class _ConstantModel:
+    """Scores every clip the same and counts how many rows it saw."""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, ai_proba):
+        self.ai_proba = ai_proba
+        self.rows = 0
+
+    def predict_proba(self, X):
+        self.rows += len(X)
+        return np.tile([1.0 - self.ai_proba, self.ai_proba], (len(X), 1))
+
+
+def _call(seconds_per_part=5.0, parts=6):
+    return DecodedAudio(np.concatenate([_synthetic_voice(seconds=seconds_per_part, seed=seed) for seed in range(parts)]))
+
+
+def test_split_segments():
+    audio = DecodedAudio(np.zeros(16000 * 12, dtype=np.float32))
+    assert [(s, e) for s, e, _ in split_segments(audio, 5)] == [(0.0, 5.0), (5.0, 12.0)]  # 2 s tail merged
+    audio = DecodedAudio(np.zeros(16000 * 13, dtype=np.float32))
+    assert [(s, e) for s, e, _ in split_segments(audio, 5)] == [(0.0, 5.0), (5.0, 10.0), (10.0, 13.0)]
+    print("[OK] Fixed windows, short tail merged")
+
+
+def test_segments_match_per_window_predictions():
+    audio = _call()
+    windows = split_segments(audio, 5.0)
+
+    original = predict._MODEL_CACHE
+    predict._MODEL_CACHE = _toy_model([DecodedAudio(samples) for _, _, samples in windows])
+    try:
+        result = predict_audio_segments(audio, segment_seconds=5.0, early_stop=False)
+        expected = [predict.predict_audio(DecodedAudio(samples)) for _, _, samples in windows]
+    finally:
+        predict._MODEL_CACHE = original
+
+    assert result["segments_scored"] == len(windows) and not result["early_stopped"]
+    for segment, single in zip(result["segments"], expected):
+        assert (segment["result"], segment["confidence"]) == (single["result"], single["confidence"])
+
+    mean_ai = np.mean([s["ai_probability"] for s in result["segments"]])
+    assert abs(mean_ai - (result["confidence"] if result["result"] != "HUMAN" else 1 - result["confidence"])) < 5e-3
+    print("[OK] Per-window evidence matches predict_audio on each window")
+
+
+def test_early_stop():
+    original = predict._MODEL_CACHE
+    predict._MODEL_CACHE = _ConstantModel(0.1)
+    try:
+        result = predict_audio_segments(_call(parts=12), segment_seconds=5.0, n_jobs=1)
+        full = predict_audio_segments(_call(parts=12), segment_seconds=5.0, early_stop=False, aggregate="vote")
+    finally:
+        predict._MODEL_CACHE = original
+
+    assert result["early_stopped"] and result["segments_scored"] < 12
+    assert result["result"] == "HUMAN" and result["confidence"] == 0.9
+    assert full["segments_scored"] == 12 and full["result"] == "HUMAN" and full["confidence"] == 1.0
+    print(f"[OK] Stopped after {result['segments_scored']} of 12 agreeing windows")
+
+
+def test_parallel_waves_share_one_pool():
+    import inference.segments as segments
+
+    pools = []
+    original_pool = segments.ThreadPoolExecutor
+
+    def counting_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return original_pool(*args, **kwargs)
+
+    audio = _call(parts=12)
+    original = predict._MODEL_CACHE
+    predict._MODEL_CACHE = _toy_model([DecodedAudio(samples) for _, _, samples in split_segments(audio, 5.0)])
+    segments.ThreadPoolExecutor = counting_pool
+    try:
+        serial = predict_audio_segments(audio, segment_seconds=5.0, early_stop=False, n_jobs=1)
+        parallel = predict_audio_segments(audio, segment_seconds=5.0, early_stop=False, n_jobs=2)
+    finally:
+        predict._MODEL_CACHE = original
+        segments.ThreadPoolExecutor = original_pool
+
+    # 12 windows in waves of 4: three waves, one pool
+    assert pools == [{"max_workers": 2}]
+    assert parallel["segments"] == serial["segments"]
+    print("[OK] Windows are scored in parallel, one thread pool for all waves")
+
+
+if __name__ == "__main__":
+    test_split_segments()
+    test_segments_match_per_window_predictions()
+    test_early_stop()
+    test_parallel_waves_share_one_pool()
@@ -0,0 +1,84 @@
+"""Test that VAD runs once per clip and feeds both Whisper and the voice features"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import stt.transcribe as transcribe
+from audio_io import DecodedAudio, vad
+from features.extract import _compute_features, extract_features_from_wav
+from test_audio_io import _synthetic_voice
+
+SR = 16000
+
+
+def _call_with_hold(speech_seconds=4.0, hold_seconds=20.0):
+    # speech, 20 s of silence (hold), speech
+    speech = _synthetic_voice(seconds=speech_seconds)
+    return DecodedAudio(np.concatenate([speech, np.zeros(int(hold_seconds * SR), np.float32), speech]))
+
+
+@pytest.fixture
+def vad_calls(monkeypatch):
+    calls = []
+
+    def loud_regions(samples):
+        calls.append(len(samples))
+        loud = np.abs(samples) > 0.05
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], loud.astype(int), [0]])))
+        # Bridge the gaps inside the synthetic "speech" (< 0.5 s), as min_silence_duration_ms does
+        regions = []
+        for start, end in zip(edges[::2], edges[1::2]):
+            if regions and start - regions[-1][1] < SR // 2:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+        return [{"start": int(s), "end": int(e)} for s, e in regions]
+
+    monkeypatch.setattr(vad, "_speech_timestamps", loud_regions)
+    return calls
+
+
+@pytest.fixture
+def fake(fake_whisper, vad_calls):
+    return fake_whisper(segments=[(0.0, 4.0, " Hello")], language="en")
+
+
+def test_regions_shared_between_stt_and_features(fake, vad_calls):
+    audio = _call_with_hold()
+
+    transcribe.transcribe_clip(audio).text
+    features = extract_features_from_wav(audio, backend="numpy", speech_mode="vad")
+    assert len(vad_calls) == 1  # one VAD pass for both stages
+
+    # Whisper skips the hold: two clips, timestamps on the original timeline
+    (start1, end1), (start2, end2) = audio.speech
+    clips = fake.calls[0]["clip_timestamps"]
+    assert clips == [start1 / SR, end1 / SR, start2 / SR, end2 / SR]
+    assert start2 >= 24 * SR
+
+    # Features see the speech only, not the 20 s of silence between
+    speech = np.concatenate([audio.samples[start1:end1], audio.samples[start2:end2]])
+    np.testing.assert_allclose(features, _compute_features(speech, SR))
+    trimmed = extract_features_from_wav(audio, backend="numpy", speech_mode="trim")
+    assert not np.allclose(features, trimmed)
+    print("[OK] One VAD pass feeds Whisper clip timestamps and speech-only features")
+
+
+def test_no_speech_skips_whisper(fake, vad_calls):
+    audio = DecodedAudio(np.zeros(5 * SR, np.float32))
+
+    result = transcribe.transcribe_clip(audio)
+    assert result.text == "" and result.duration == 5.0
+    assert fake.calls == []
+    assert extract_features_from_wav(audio, backend="numpy", speech_mode="vad") is None
+    assert len(vad_calls) == 1
+    print("[OK] Clips without speech never reach Whisper")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,86 @@
+"""Test streaming transcription with incremental spam scoring and early stop"""
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from audio_io import DecodedAudio
+from decision_engine import is_conclusive_spam
+from run_pipeline import transcribe_and_score
+from spam_intent.incremental import IncrementalSpamScorer
+from test_audio_io import _synthetic_voice
+
+_CALL = [
+    " Hello sir, this is your bank.",
+    " Your account has been locked",
+    " due to suspicious activity.",
+    " Please share the OTP you received.",
+    " Thank you for banking with us.",
+    " Have a nice day.",
+]
+
+
+class _KeywordEngine:
+    """SpamIntentEngine stand-in: fixed weights per keyword, same result shape."""
+
+    _WEIGHTS = {"locked": ("ACCOUNT_THREAT", 0.3), "otp": ("OTP_REQUEST", 0.35), "bank": ("INSTRUCTION", 0.1)}
+
+    def __init__(self):
+        self.calls = 0
+
+    def score(self, text):
+        self.calls += 1
+        matched = {intent for word, (intent, _) in self._WEIGHTS.items() if word in text.lower()}
+        score = min(1.0, sum(weight for word, (_, weight) in self._WEIGHTS.items() if word in text.lower()))
+        return {"spam_score": round(score, 2), "label": "", "matched_intents": sorted(matched)}
+
+
+@pytest.fixture
+def fake(fake_whisper):
+    return fake_whisper(segments=[(5.0 * i, 5.0 * (i + 1), text) for i, text in enumerate(_CALL)], language="en")
+
+
+def test_conclusive_spam_rule():
+    assert is_conclusive_spam(0.65, ["ACCOUNT_THREAT", "OTP_REQUEST"])
+    assert not is_conclusive_spam(0.4, ["ACCOUNT_THREAT"])  # high risk but only SUSPICIOUS so far
+    assert not is_conclusive_spam(0.9, ["INSTRUCTION", "URGENCY"])  # SPAM, but no high-risk intent
+    assert is_conclusive_spam(0.35, ["DELIVERY_SCAM"])
+    print("[OK] Early-stop rule follows the final verdict")
+
+
+def test_incremental_matches_full_score():
+    engine = _KeywordEngine()
+    scorer = IncrementalSpamScorer(engine)
+    for text in _CALL:
+        scorer.add(text)
+    assert scorer.text == " ".join(_CALL).lower().strip()
+    assert scorer.result == engine.score(" ".join(_CALL))
+    print("[OK] Incremental score equals scoring the whole transcript")
+
+
+def test_early_stop(fake):
+    audio = DecodedAudio(_synthetic_voice(seconds=3.0))
+
+    transcription, spam = transcribe_and_score(audio, _KeywordEngine())
+    # "locked" (segment 2) is high risk but only SUSPICIOUS; the OTP request (segment 4) makes it SPAM
+    assert fake.decoded_segments == 4 and transcription.stopped_early
+    assert transcription.segments[-1]["end"] == 20.0
+    assert transcription.text.endswith("please share the otp you received.")
+    assert spam["matched_intents"] == ["ACCOUNT_THREAT", "INSTRUCTION", "OTP_REQUEST"]
+    print("[OK] Decoding stops at the first conclusive scam segment")
+
+
+def test_full_decode_without_early_stop(fake):
+    audio = DecodedAudio(_synthetic_voice(seconds=3.0))
+
+    transcription, spam = transcribe_and_score(audio, _KeywordEngine(), stop_early=False)
+    assert fake.decoded_segments == len(_CALL) and not transcription.stopped_early
+    assert len(transcription.segments) == len(_CALL)
+    print("[OK] stop_early=False decodes the whole call")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
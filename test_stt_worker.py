@@ -0,0 +1,141 @@
+"""Test the batched Whisper worker with a stand-in model"""
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from faster_whisper.feature_extractor import FeatureExtractor
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import stt.worker as worker
+from audio_io import DecodedAudio, vad
+
+_WORDS = ["hello", "vanakkam"]
+_SPECIALS = [
+    "<|endoftext|>", "<|startoftranscript|>", "<|en|>", "<|ta|>", "<|translate|>",
+    "<|transcribe|>", "<|startoflm|>", "<|startofprev|>", "<|notimestamps|>",
+]
+
+
+class _FakeCT2:
+    is_multilingual = True
+
+    def __init__(self, vocab, fail=False):
+        self.vocab = vocab
+        self.fail = fail
+        self.encode_batches = []
+
+    def encode(self, features, to_cpu=False):
+        self.encode_batches.append(np.array(features).shape[0])
+        return np.array(features)
+
+    def detect_language(self, encoded):
+        return [[("<|ta|>", 0.9), ("<|en|>", 0.1)] for _ in encoded]
+
+    def generate(self, encoded, prompts, **kwargs):
+        if self.fail:
+            raise RuntimeError("decoder exploded")
+        word = {self.vocab["<|ta|>"]: "vanakkam", self.vocab["<|en|>"]: "hello"}
+        return [
+            SimpleNamespace(sequences_ids=[[self.vocab[word[prompt[1]]], self.vocab["<|endoftext|>"]]], scores=[-0.2], no_speech_prob=0.01)
+            for prompt in prompts
+        ]
+
+
+class _FakeWhisper:
+    max_length = 448
+
+    def __init__(self, fail=False):
+        vocab = {token: i for i, token in enumerate(_WORDS + _SPECIALS)}
+        self.hf_tokenizer = Tokenizer(WordLevel(vocab, unk_token="<|endoftext|>"))
+        self.feature_extractor = FeatureExtractor()
+        self.model = _FakeCT2(vocab, fail)
+
+    def get_prompt(self, tokenizer, previous_tokens, without_timestamps=False):
+        return tokenizer.sot_sequence + [tokenizer.no_timestamps]
+
+
+def _loud_regions(samples):
+    # VAD stand-in: 1 s bursts separated by silence
+    loud = np.abs(samples) > 0.01
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], loud.astype(int), [0]])))
+    return [{"start": int(s), "end": int(e)} for s, e in zip(edges[::2], edges[1::2])]
+
+
+def _clip(seconds, every=20):
+    sr = 16000
+    samples = np.zeros(int(seconds * sr), dtype=np.float32)
+    for start in range(0, len(samples), every * sr):
+        samples[start:start + sr] = 0.3
+    return DecodedAudio(samples)
+
+
+@pytest.fixture(autouse=True)
+def loud_vad(monkeypatch):
+    monkeypatch.setattr(vad, "_speech_timestamps", _loud_regions)
+
+
+def test_chunking():
+    # Bursts every 2 s (1 s pauses): merged up to 30 s per chunk
+    chunks = vad.speech_chunks(_clip(70, every=2))
+    assert chunks == [(0, 29 * 16000), (30 * 16000, 59 * 16000), (60 * 16000, 69 * 16000)]
+    # Bursts every 20 s: the 19 s silences are never part of a chunk
+    chunks = vad.speech_chunks(_clip(50))
+    assert chunks == [(0, 16000), (20 * 16000, 21 * 16000), (40 * 16000, 41 * 16000)]
+    assert vad.speech_chunks(DecodedAudio(np.zeros(16000, np.float32))) == []
+    print("[OK] VAD regions merged into <= 30 s chunks across short pauses only")
+
+
+def test_concurrent_requests_share_batches():
+    fake = _FakeWhisper()
+    stt = worker.WhisperBatchWorker(fake, max_batch_size=4, max_wait_ms=200)
+    results = [None] * 6
+    barrier = threading.Barrier(6)
+
+    def request(i):
+        barrier.wait()
+        results[i] = stt.transcribe(_clip(50), language="en" if i == 0 else None, timeout=30)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stt.close()
+
+    # 6 clips x 3 chunks ran in batches of up to 4 chunks
+    assert sum(stt.batch_sizes) == 18 and max(stt.batch_sizes) <= 4
+    assert len(stt.batch_sizes) < 18
+    assert fake.model.encode_batches == stt.batch_sizes
+
+    assert results[0].language == "en" and results[0].text == "hello hello hello"
+    for result in results[1:]:
+        assert (result.language_name, result.language_probability) == ("Tamil", 0.9)
+        assert [s["start"] for s in result.segments] == [0.0, 20.0, 40.0]
+        assert result.text == "vanakkam vanakkam vanakkam"
+
+    silent = worker.WhisperBatchWorker(fake).transcribe(DecodedAudio(np.zeros(16000, np.float32)))
+    assert silent.text == "" and silent.segments == []
+    print(f"  batch sizes: {stt.batch_sizes}")
+    print("[OK] Concurrent requests are transcribed in shared batches")
+
+
+def test_errors_reach_callers():
+    stt = worker.WhisperBatchWorker(_FakeWhisper(fail=True), max_wait_ms=0)
+    try:
+        stt.transcribe(_clip(10), timeout=30)
+        raise AssertionError("error swallowed")
+    except RuntimeError as e:
+        assert "decoder exploded" in str(e)
+    stt.close()
+    print("[OK] Batch failures are raised from the callers' futures")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,76 @@
+"""Test the two-tier transcript cache in front of Whisper"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+import soundfile as sf
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import stt.transcribe as transcribe
+from audio_io import DecodedAudio
+from serving.disk_cache import DiskLRU
+from stt.cache import TranscriptCache
+from test_audio_io import _synthetic_voice
+
+
+@pytest.fixture
+def fake(fake_whisper):
+    return fake_whisper(segments=[(0.0, 2.0, " Share the OTP"), (2.0, 3.5, " now")], language="en", language_probability=0.97)
+
+
+def test_memory_tier(fake, monkeypatch):
+    monkeypatch.setenv("TRANSCRIPT_CACHE_ENTRIES", "8")
+    audio = DecodedAudio(_synthetic_voice(seconds=3.5, seed=11))
+
+    first = transcribe.transcribe_clip(audio)
+    assert first.text == "share the otp  now" and len(fake.calls) == 1
+    again = transcribe.transcribe_clip(DecodedAudio(audio.samples.copy()))
+    assert len(fake.calls) == 1
+    assert again.to_dict() == first.to_dict() and again.language_name == "English"
+
+    # Different decode settings are a different entry
+    transcribe.transcribe_clip(audio, chunk_sec=20)
+    assert len(fake.calls) == 2
+
+    # A transcript cut short is not cached
+    partial = transcribe.transcribe_clip(DecodedAudio(_synthetic_voice(seconds=3.5, seed=12)))
+    next(partial.iter_segments())
+    partial.stop()
+    transcribe.transcribe_clip(DecodedAudio(_synthetic_voice(seconds=3.5, seed=12))).text
+    assert len(fake.calls) == 4
+    print("[OK] Repeated audio is served from the memory tier")
+
+
+def test_disk_tier_and_eviction(fake, monkeypatch, tmp_path):
+    path = tmp_path / "robocall.wav"
+    sf.write(path, _synthetic_voice(seconds=3.5, seed=13), 16000)
+    root = tmp_path / "transcripts"
+    monkeypatch.setenv("TRANSCRIPT_CACHE_DIR", str(root))
+
+    transcribe.transcribe_clip(str(path)).text
+    assert len(fake.calls) == 1 and len(list(root.glob("*/*.json"))) == 1
+    # A fresh process (empty memory tier) still hits the shared disk tier
+    cache = TranscriptCache(max_entries=0, root=root)
+    key = cache.key(transcribe._audio_hash(str(path)), transcribe._transcript_config(30))
+    assert cache.get(key)["segments"][0]["text"] == " Share the OTP"
+
+    small = TranscriptCache(max_entries=2, root=tmp_path / "small", max_bytes=600)
+    value = {"language": "en", "language_probability": 1.0, "duration": 1.0, "segments": [{"start": 0, "end": 1, "text": "x" * 100}]}
+    for i in range(10):
+        small.put(f"{i:064x}", value)
+    assert sum(p.stat().st_size for p in (tmp_path / "small").glob("*/*.json")) <= 600
+    assert len(small._memory) == 2 and small.get(f"{9:064x}") == value
+
+    # Rewriting a key replaces its file: the size is not counted twice
+    store = DiskLRU(tmp_path / "rewrite", ".json", max_bytes=10_000)
+    for _ in range(5):
+        store.write("ab" * 32, lambda f: json.dump(value, f), mode="w")
+    assert store._size == store.path("ab" * 32).stat().st_size
+    print("[OK] Disk tier is shared and bounded")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
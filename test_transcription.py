@@ -0,0 +1,112 @@
+"""Test that language, text and segments come from a single Whisper pass"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import stt.transcribe as transcribe
+from audio_io import DecodedAudio, iter_audio_blocks
+from test_audio_io import _synthetic_voice
+
+
+@pytest.fixture
+def fake(fake_whisper):
+    return fake_whisper(
+        segments=[(0.0, 2.5, " Your account"), (2.5, 5.0, " is BLOCKED")],
+        language="ta",
+        language_probability=0.93,
+        detected=[("ta", 0.8712), ("ml", 0.1)],
+    )
+
+
+def test_single_pass_result(fake):
+    audio = DecodedAudio(_synthetic_voice(seconds=5.0))
+
+    result = transcribe.transcribe_clip(audio)
+    assert (result.language, result.language_name, result.language_probability) == ("ta", "Tamil", 0.93)
+    assert fake.decoded_segments == 0  # language is known before decoding
+
+    assert result.text == "your account  is blocked"
+    assert result.segments == [
+        {"start": 0.0, "end": 2.5, "text": " Your account"},
+        {"start": 2.5, "end": 5.0, "text": " is BLOCKED"},
+    ]
+    assert len(fake.calls) == 1 and fake.decoded_segments == 2
+    print("[OK] One Whisper pass yields language, text and segments")
+
+
+def test_views(fake):
+    audio = DecodedAudio(_synthetic_voice(seconds=5.0))
+
+    assert transcribe.detect_language(audio) == "Tamil"
+    assert fake.calls == []
+    assert transcribe.transcribe_audio(audio) == "your account  is blocked"
+    print("[OK] transcribe_audio is a view over the result, detect_language skips decoding")
+
+
+def test_language_id_window(fake, monkeypatch):
+    # 20 s of silence, then 10 min of "speech" (VAD stand-in: loud samples)
+    sr = 16000
+    rng = np.random.default_rng(0)
+    samples = np.concatenate([np.zeros(20 * sr), 0.3 * rng.standard_normal(600 * sr)]).astype(np.float32)
+    vad_calls = []
+
+    def loud_regions(chunk):
+        vad_calls.append(len(chunk))
+        loud = np.flatnonzero(np.abs(chunk) > 0.01)
+        return [{"start": int(loud[0]), "end": len(chunk)}] if len(loud) else []
+
+    monkeypatch.setattr(transcribe, "_speech_timestamps", loud_regions)
+    start = time.perf_counter()
+    guess = transcribe.identify_language(DecodedAudio(samples), speech_seconds=10)
+    elapsed = time.perf_counter() - start
+
+    assert guess == {"language": "Tamil", "code": "ta", "probability": 0.871}
+    assert fake.calls == [] and fake.encoded == [(80, 3000)]
+    # Only the opening 40 s were scanned (two 20 s VAD blocks), not the 10 minutes
+    assert vad_calls == [20 * sr, 20 * sr]
+    print(f"  language ID on a 10 min clip: {elapsed * 1000:.0f} ms (excluding the encoder)")
+    print("[OK] Language ID looks at the first seconds of speech only")
+
+
+def test_language_id_streams_files(fake, monkeypatch, tmp_path):
+    # 5 min call: 20 s of silence, then "speech"; and 5 min of silence only
+    sr = 16000
+    rng = np.random.default_rng(1)
+    call = tmp_path / "call.wav"
+    sf.write(call, np.concatenate([np.zeros(20 * sr), 0.3 * rng.standard_normal(280 * sr)]), sr)
+    silent = tmp_path / "silent.wav"
+    sf.write(silent, np.zeros(300 * sr), sr)
+
+    consumed = []
+
+    def counting_blocks(*args, **kwargs):
+        for block in iter_audio_blocks(*args, **kwargs):
+            consumed.append(len(block))
+            yield block
+
+    def loud_regions(chunk):
+        loud = np.flatnonzero(np.abs(chunk) > 0.01)
+        return [{"start": int(loud[0]), "end": len(chunk)}] if len(loud) else []
+
+    monkeypatch.setattr(transcribe, "iter_audio_blocks", counting_blocks)
+    monkeypatch.setattr(transcribe, "_speech_timestamps", loud_regions)
+    monkeypatch.setattr(transcribe, "LANGUAGE_ID_MAX_SCAN_SECONDS", 120.0)
+
+    assert transcribe.identify_language(str(call), speech_seconds=10)["code"] == "ta"
+    assert consumed == [20 * sr, 20 * sr]  # 40 of 300 s decoded
+
+    consumed.clear()
+    assert transcribe.identify_language(str(silent), speech_seconds=10)["code"] == "ta"
+    assert sum(consumed) == 120 * sr  # no speech: decoding stops at the scan limit
+    print("[OK] Language ID decodes files only as far as it scans")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -1,4 +1,5 @@
 import os
+import argparse
 import numpy as np
 import joblib
 
@@ -7,29 +8,72 @@ from sklearn.metrics import classification_report
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.model_selection import GroupShuffleSplit
 
-from features.extract import extract_features_from_wav
+from features.extract import PITCH_MODES, SPEECH_MODES, extract_features_batch
+from inference.cascade import cascade_report, train_fast_model
+from inference import registry
+from inference.compiled_forest import CompiledForest
+from inference.predict import AI_LIKELY_THRESHOLD, MODEL_PATH
 
 # 🔒 FINAL DATA DIRECTORIES (LOCK THESE)
 AI_DIR = "data/ai_processed_v2"
 HUMAN_DIR = "data/human_processed_v2"
 
+parser = argparse.ArgumentParser(description="Train the AI vs Human voice model")
+parser.add_argument(
+    "--pitch-mode",
+    choices=PITCH_MODES,
+    default="piptrack",
+    help="Pitch estimator used for the pitch features (inference follows the saved model)",
+)
+parser.add_argument(
+    "--speech-mode",
+    choices=SPEECH_MODES,
+    default="trim",
+    help="Frames the features are computed on: energy trim or VAD speech only (inference follows the saved model)",
+)
+parser.add_argument("--jobs", type=int, default=-1, help="Feature extraction processes (-1 = all cores)")
+parser.add_argument(
+    "--cache-dir",
+    default=os.environ.get("FEATURE_CACHE_DIR", ".cache/features"),
+    help="Feature cache directory (reused across runs; empty string disables it)",
+)
+parser.add_argument("--output", default=MODEL_PATH, help="Where to save the model (default: MODEL_PATH)")
+parser.add_argument(
+    "--cascade",
+    action="store_true",
+    help="Also train the small first-stage model for VOICE_CASCADE=1 and report escalation rates",
+)
+parser.add_argument(
+    "--publish",
+    action="store_true",
+    help="Publish the saved artifacts as a new voice version in the model registry (hot-reloaded by serving)",
+)
+args = parser.parse_args()
+
+# Worker processes inherit the environment, so this enables the cache everywhere
+if args.cache_dir:
+    os.environ["FEATURE_CACHE_DIR"] = args.cache_dir
+else:
+    os.environ.pop("FEATURE_CACHE_DIR", None)
+
 X = []
 y = []
 groups = []  # group = original file (prevents leakage)
 
 
 def load_folder(folder, label):
-    for file in os.listdir(folder):
-        if not file.endswith(".wav"):
-            continue
+    files = sorted(f for f in os.listdir(folder) if f.endswith(".wav"))
+    paths = [os.path.join(folder, f) for f in files]
 
-        path = os.path.join(folder, file)
-        feats = extract_features_from_wav(path)
+    feats, valid = extract_features_batch(
+        paths, n_jobs=args.jobs, pitch_mode=args.pitch_mode, speech_mode=args.speech_mode
+    )
 
-        if feats is None:
+    for file, row, ok in zip(files, feats, valid):
+        if not ok:
             continue
 
-        X.append(feats)
+        X.append(row)
         y.append(label)
 
         # 🔑 GROUP ID = original audio source
@@ -81,13 +125,48 @@ model = CalibratedClassifierCV(
 
 model.fit(X_train, y_train)
 
+# Inference reads this to extract features the same way
+model.feature_config_ = {"pitch_mode": args.pitch_mode, "speech_mode": args.speech_mode}
+
 y_pred = model.predict(X_test)
 
 print("\nClassification Report:\n")
 print(classification_report(y_test, y_pred))
 
 # Save final calibrated + leakage-safe model
-os.makedirs("artifacts", exist_ok=True)
-joblib.dump(model, "artifacts/model.pkl")
-
-print("\n✅ Final calibrated, group-safe model saved at artifacts/model.pkl")
+os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+joblib.dump(model, args.output)
+
+# Flat-array export used by inference (written after the pickle so it is never older)
+compiled_output = os.path.splitext(args.output)[0] + "_compiled.joblib"
+CompiledForest.from_sklearn(model).save(compiled_output)
+
+print(f"\n✅ Final calibrated, group-safe model saved at {args.output} (pitch mode: {args.pitch_mode}, speech mode: {args.speech_mode})")
+print(f"✅ Compiled evaluator saved at {compiled_output}")
+
+# ⚡ OPTIONAL CASCADE FIRST STAGE
+if args.cascade:
+    fast_model = train_fast_model(X_train, y_train)
+    fast_model.feature_config_ = model.feature_config_
+
+    print("\nCascade (fast model first, full model inside the band):\n")
+    print(f"{'band':<14} {'escalated':>10} {'full acc':>9} {'cascade acc':>12} {'delta':>8} {'agreement':>10}")
+    for row in cascade_report(fast_model, model, X_test, y_test, ai_threshold=AI_LIKELY_THRESHOLD):
+        low, high = row["band"]
+        print(
+            f"[{low:.2f}, {high:.2f})   {row['escalation_rate']:10.1%} {row['full_accuracy']:9.3f} "
+            f"{row['cascade_accuracy']:12.3f} {row['accuracy_delta']:+8.3f} {row['agreement']:10.1%}"
+        )
+
+    fast_output = os.path.splitext(args.output)[0] + "_fast.pkl"
+    joblib.dump(fast_model, fast_output)
+    CompiledForest.from_sklearn(fast_model).save(os.path.splitext(fast_output)[0] + "_compiled.joblib")
+    print(f"\n✅ Cascade fast model saved at {fast_output} (+ _compiled.joblib); enable with VOICE_CASCADE=1")
+
+# 📦 OPTIONAL REGISTRY RELEASE
+if args.publish:
+    artifacts = [args.output, compiled_output]
+    if args.cascade:
+        artifacts += [fast_output, os.path.splitext(fast_output)[0] + "_compiled.joblib"]
+    published = registry.publish("voice", artifacts, registry.default_feature_config("voice"))
+    print(f"\n✅ Published voice model {published.version}; serving processes pick it up within MODEL_RELOAD_SECONDS")
@@ -1,7 +1,5 @@
 import sys
 import os
-import base64
-import uuid
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify
 
@@ -11,6 +9,7 @@ from flask import Flask, render_template, request, jsonify
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from audio_io import AudioPayload, load_audio, payload_from_base64
 from run_pipeline import run_pipeline
 from inference.predict import predict_audio
 from stt.transcribe import detect_language
@@ -18,6 +17,8 @@ from stt.transcribe import detect_language
 app = Flask(__name__)
 API_KEY = os.getenv("API_KEY")
 SUPPORTED_LANGUAGES = {"tamil", "english", "hindi", "malayalam", "telugu"}
+RAW_AUDIO_MIMETYPES = {"audio/mpeg", "audio/mp3", "application/octet-stream"}
+RAW_READ_CHUNK_BYTES = 64 * 1024
 
 
 
@@ -41,6 +42,11 @@ def detect():
     if audio_file.filename == "":
         return jsonify({"error": "Empty filename"}), 400
 
+    # A language picked in the form skips detection in STT
+    language = _normalize_language(request.form.get("language"))
+    if language is not None and language not in SUPPORTED_LANGUAGES:
+        return jsonify({"error": "Unsupported language"}), 400
+
     # Save temp file
     temp_dir = PROJECT_ROOT / "temp_audio"
     temp_dir.mkdir(exist_ok=True)
@@ -50,7 +56,7 @@ def detect():
 
     # Run pipeline
     try:
-        result = run_pipeline(str(temp_path), verbose=False)
+        result = run_pipeline(str(temp_path), verbose=False, language=language)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -70,18 +76,66 @@ def _safe_ext_from_format(audio_format: str) -> str:
     return audio_format
 
 
+def _decode_base64_audio(audio_base64):
+    """
+    Base64 -> in-memory payload -> decoded samples, without temp files.
+    Returns (audio, None) or (None, error_response).
+    """
+    try:
+        payload = payload_from_base64(audio_base64, suffix=".mp3")
+    except Exception as e:
+        return None, (jsonify({"status": "error", "message": f"Invalid base64 audio: {e}"}), 400)
+
+    # Any spill file is removed as soon as decoding finishes
+    with payload:
+        try:
+            return load_audio(payload), None
+        except Exception:
+            return None, (jsonify({"status": "error", "message": "Invalid audio"}), 400)
+
+
 def _normalize_language(lang_value):
     if not lang_value:
         return None
     return str(lang_value).strip().lower()
 
 
+def _voice_detection_response(audio, language):
+    voice_result = predict_audio(audio)
+    voice_type = voice_result["result"]
+    if voice_type == "INVALID_AUDIO":
+        return jsonify({"status": "error", "message": "Invalid audio"}), 400
+    confidence = float(voice_result["confidence"])
+
+    classification = "AI_GENERATED" if voice_type in {"AI", "AI_LIKELY"} else "HUMAN"
+    confidence = max(0.0, min(1.0, confidence))
+
+    if classification == "AI_GENERATED":
+        explanation = "Unnatural pitch consistency and synthetic speech patterns detected"
+    else:
+        explanation = "Natural pitch variation and human speech patterns detected"
+
+    return jsonify(
+        {
+            "status": "success",
+            "language": language,
+            "classification": classification,
+            "confidenceScore": round(confidence, 2),
+            "explanation": explanation,
+        }
+    )
+
+
 @app.route("/api/voice-detection", methods=["POST"])
 def api_voice_detection():
     # API key check (required by guidelines)
     if not _require_api_key(request):
         return jsonify({"status": "error", "message": "Unauthorized"}), 401
 
+    # Raw MP3 body: no JSON, no base64 inflation
+    if request.mimetype in RAW_AUDIO_MIMETYPES:
+        return _api_voice_detection_raw()
+
     data = request.get_json(silent=True) or {}
     language = data.get("language")
     audio_format = data.get("audioFormat")
@@ -97,44 +151,46 @@ def api_voice_detection():
     if not audio_base64:
         return jsonify({"status": "error", "message": "audioBase64 is required"}), 400
 
-    temp_dir = PROJECT_ROOT / "temp_audio"
-    temp_dir.mkdir(exist_ok=True)
-    temp_path = temp_dir / f"api_{uuid.uuid4().hex}.mp3"
+    audio, error = _decode_base64_audio(audio_base64)
+    if error is not None:
+        return error
 
     try:
-        # Support data URI prefix if provided
-        if isinstance(audio_base64, str) and "base64," in audio_base64:
-            audio_base64 = audio_base64.split("base64,", 1)[1]
-        audio_bytes = base64.b64decode(audio_base64)
-        with open(temp_path, "wb") as f:
-            f.write(audio_bytes)
+        return _voice_detection_response(audio, language)
     except Exception as e:
-        return jsonify({"status": "error", "message": f"Invalid base64 audio: {e}"}), 400
+        return jsonify({"status": "error", "message": str(e)}), 500
 
-    try:
-        voice_result = predict_audio(str(temp_path))
-        voice_type = voice_result["result"]
-        if voice_type == "INVALID_AUDIO":
+
+def _api_voice_detection_raw():
+    """
+    /api/voice-detection with an `audio/mpeg` or `application/octet-stream`
+    body. Language comes from the `language` query parameter or the
+    `x-language` header; the response schema is unchanged.
+    """
+    language = request.args.get("language") or request.headers.get("x-language")
+
+    language_norm = _normalize_language(language)
+    if language_norm not in SUPPORTED_LANGUAGES:
+        return jsonify({"status": "error", "message": "Unsupported language"}), 400
+
+    # Stream the body straight into the payload (spills to disk only if large)
+    with AudioPayload(suffix=".mp3") as payload:
+        while True:
+            chunk = request.stream.read(RAW_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            payload.write(chunk)
+
+        if payload.size == 0:
+            return jsonify({"status": "error", "message": "Audio body is required"}), 400
+
+        try:
+            audio = load_audio(payload)
+        except Exception:
             return jsonify({"status": "error", "message": "Invalid audio"}), 400
-        confidence = float(voice_result["confidence"])
-
-        classification = "AI_GENERATED" if voice_type in {"AI", "AI_LIKELY"} else "HUMAN"
-        confidence = max(0.0, min(1.0, confidence))
-
-        if classification == "AI_GENERATED":
-            explanation = "Unnatural pitch consistency and synthetic speech patterns detected"
-        else:
-            explanation = "Natural pitch variation and human speech patterns detected"
-
-        return jsonify(
-            {
-                "status": "success",
-                "language": language,
-                "classification": classification,
-                "confidenceScore": round(confidence, 2),
-                "explanation": explanation,
-            }
-        )
+
+    try:
+        return _voice_detection_response(audio, language)
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -145,53 +201,30 @@ def ui_voice_detection():
         return jsonify({"status": "error", "message": "Unauthorized"}), 401
 
     data = request.get_json(silent=True) or {}
+    language = data.get("language")
     audio_format = data.get("audioFormat")
     audio_base64 = data.get("audioBase64")
 
+    # Optional: a language picked in the form replaces language ID
+    language_norm = _normalize_language(language)
+    if language_norm is not None and language_norm not in SUPPORTED_LANGUAGES:
+        return jsonify({"status": "error", "message": "Unsupported language"}), 400
+
     if not audio_format or str(audio_format).strip().lower() != "mp3":
         return jsonify({"status": "error", "message": "audioFormat must be mp3"}), 400
 
     if not audio_base64:
         return jsonify({"status": "error", "message": "audioBase64 is required"}), 400
 
-    temp_dir = PROJECT_ROOT / "temp_audio"
-    temp_dir.mkdir(exist_ok=True)
-    temp_path = temp_dir / f"ui_{uuid.uuid4().hex}.mp3"
+    # Decode once; language ID and voice detection share the samples
+    audio, error = _decode_base64_audio(audio_base64)
+    if error is not None:
+        return error
 
     try:
-        if isinstance(audio_base64, str) and "base64," in audio_base64:
-            audio_base64 = audio_base64.split("base64,", 1)[1]
-        audio_bytes = base64.b64decode(audio_base64)
-        with open(temp_path, "wb") as f:
-            f.write(audio_bytes)
-    except Exception as e:
-        return jsonify({"status": "error", "message": f"Invalid base64 audio: {e}"}), 400
-
-    try:
-        detected_language = detect_language(str(temp_path))
-        voice_result = predict_audio(str(temp_path))
-        voice_type = voice_result["result"]
-        if voice_type == "INVALID_AUDIO":
-            return jsonify({"status": "error", "message": "Invalid audio"}), 400
-        confidence = float(voice_result["confidence"])
-
-        classification = "AI_GENERATED" if voice_type in {"AI", "AI_LIKELY"} else "HUMAN"
-        confidence = max(0.0, min(1.0, confidence))
-
-        if classification == "AI_GENERATED":
-            explanation = "Unnatural pitch consistency and synthetic speech patterns detected"
-        else:
-            explanation = "Natural pitch variation and human speech patterns detected"
-
-        return jsonify(
-            {
-                "status": "success",
-                "language": detected_language,
-                "classification": classification,
-                "confidenceScore": round(confidence, 2),
-                "explanation": explanation,
-            }
-        )
+        if language_norm is None:
+            language = detect_language(audio)
+        return _voice_detection_response(audio, language)
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 